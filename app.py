@@ -5,9 +5,20 @@ import os
 
 from connectors.excel_connector import ExcelConnector
 from connectors.supabase_connector import SupabaseConnector
+from connectors.sqlite_connector import SqliteConnector
+from connectors.delta_sync import DeltaSync
+from connectors.change_feed import SupabaseChangeFeed
+from connectors.resilience import is_transient
+from connectors.schema import DROPDOWN_TABLES
+from connectors.write_queue import WriteQueue
 from ui.new_shifts_tab import NewShiftsTab
 from ui.view_shifts_tab import ViewShiftsTab
 from ui.project_data_tab import ProjectDataTab
+from utils.io_executor import IOExecutor
+from utils.live_updates import LiveUpdates
+
+# Milliseconds between attempts to replay the offline write queue
+REPLAY_INTERVAL = 60000
 
 class SchichtplanerApp:
     def __init__(self, root):
@@ -22,6 +33,10 @@ class SchichtplanerApp:
         # Load environment variables
         load_dotenv()
         
+        # Runs database calls off the Tk thread
+        self.io = IOExecutor(root)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         # Main tab control
         self.tab_control = ttk.Notebook(root)
         
@@ -38,9 +53,18 @@ class SchichtplanerApp:
         # Initialize connectors
         self.excel_connector = ExcelConnector()
         
+        # Writes made while Supabase is unreachable, replayed on reconnect
         try:
-            self.supabase_connector = SupabaseConnector()
-            self.is_supabase_connected = True
+            self.write_queue = WriteQueue()
+        except Exception as e:
+            print(f"Offline write queue not available: {str(e)}")
+            self.write_queue = None
+        self.replay_task = None
+        self.replay_scheduled = False
+        self.live_updates = None
+        
+        try:
+            self.connect_supabase()
         except Exception as e:
             self.is_supabase_connected = False
             messagebox.showwarning(
@@ -57,6 +81,50 @@ class SchichtplanerApp:
             "personal": ["Mitarbeiter 1", "Mitarbeiter 2", "Mitarbeiter 3"],
         }
         
+        if self.is_supabase_connected:
+            # Render the data cached on disk by the last session right away,
+            # then reconcile with Supabase once the window is shown. The
+            # cached reads run inline, so the tabs are filled before showing.
+            with self.supabase_connector.serve_stale(), self.io.inline():
+                self.create_tabs()
+            if self.supabase_connector.stale_results_served:
+                self.root.after(100, self.reconcile_with_supabase)
+        else:
+            self.create_tabs()
+        
+        # Create menu bar with Excel import
+        self.create_menu()
+        
+        # Send the writes queued offline in an earlier session
+        self.update_offline_status()
+        if self.is_supabase_connected and self.write_queue and self.write_queue.count():
+            self.root.after(100, self.replay_offline_writes)
+        
+        # Follow the changes made by others
+        if self.is_supabase_connected:
+            self.start_live_updates()
+    
+    def connect_supabase(self):
+        """Create the database connector and the delta sync engine
+        
+        SCHICHTPLANER_BACKEND=sqlite selects the local SQLite database
+        instead of Supabase; it offers the same methods, so the rest of the
+        application uses it as supabase_connector as well.
+        
+        Raises:
+            Exception: If the connector cannot be created
+        """
+        if os.environ.get("SCHICHTPLANER_BACKEND", "supabase").lower() == "sqlite":
+            self.supabase_connector = SqliteConnector()
+        else:
+            self.supabase_connector = SupabaseConnector()
+        self.is_supabase_connected = True
+        
+        # Tracks the loaded rows so refreshes only fetch changes
+        self.delta_sync = DeltaSync(self.supabase_connector)
+    
+    def create_tabs(self):
+        """Load the dropdown data and initialize the tab UI components"""
         # Try to load dropdown data from Supabase
         self.load_dropdown_data()
         
@@ -65,9 +133,6 @@ class SchichtplanerApp:
         self.view_shifts_ui = ViewShiftsTab(self.view_shifts_tab, self)
         self.project_data_ui = ProjectDataTab(self.project_data_tab, self)
         
-        # Create menu bar with Excel import
-        self.create_menu()
-        
     def configure_styles(self):
         """Configure ttk styles for consistent theming"""
         style = ttk.Style()
@@ -97,14 +162,27 @@ class SchichtplanerApp:
         style.configure("TNotebook.Tab",
                        padding=[10, 2])
         
-    def load_dropdown_data(self):
-        """Load dropdown data from Supabase if connected"""
-        if self.is_supabase_connected:
-            try:
-                self.dropdown_data = self.supabase_connector.get_dropdown_data()
-                print("Dropdown data loaded from Supabase")
-            except Exception as e:
-                print(f"Error loading dropdown data from Supabase: {str(e)}")
+    def load_dropdown_data(self, on_loaded=None):
+        """Load dropdown data from Supabase in the background if connected
+        
+        Args:
+            on_loaded (function, optional): Called without arguments once the
+                dropdown data was replaced
+        """
+        if not self.is_supabase_connected:
+            return
+        
+        def loaded(dropdown_data):
+            self.dropdown_data = dropdown_data
+            print("Dropdown data loaded from Supabase")
+            if on_loaded:
+                on_loaded()
+        
+        self.io.submit(
+            self.supabase_connector.get_dropdown_data,
+            on_success=loaded,
+            on_error=lambda e: print(f"Error loading dropdown data from Supabase: {str(e)}")
+        )
         
     def create_menu(self):
         """Create the application menu bar"""
@@ -122,7 +200,14 @@ class SchichtplanerApp:
         supabase_menu = tk.Menu(menubar, tearoff=0, relief='flat', background='#f0f0f0', activebackground='#e0e0e0')
         menubar.add_cascade(label="Datenbank", menu=supabase_menu)
         supabase_menu.add_command(label="Daten von Supabase aktualisieren", 
+                                 command=self.sync_changes_from_supabase)
+        supabase_menu.add_command(label="Alle Daten neu laden", 
                                  command=self.refresh_data_from_supabase)
+        supabase_menu.add_command(label="Offline-Änderungen übertragen", 
+                                 command=lambda: self.replay_offline_writes(interactive=True))
+        supabase_menu.add_separator()
+        supabase_menu.add_command(label="Verbindungsstatistik", 
+                                 command=self.show_connection_stats)
     
     def load_excel_file(self):
         """Open file dialog to select and load Excel file"""
@@ -162,21 +247,289 @@ class SchichtplanerApp:
             messagebox.showwarning("Keine Verbindung", "Keine Verbindung zu Supabase.")
             return
         
+        # An explicit refresh must not be served from the cache
+        self.supabase_connector.invalidate_cache()
+        
+        self.reload_all_data(on_done=lambda: messagebox.showinfo(
+            "Daten aktualisiert", "Daten wurden von Supabase aktualisiert."))
+    
+    def sync_changes_from_supabase(self):
+        """Fetch only the rows changed since the last load from Supabase"""
+        if not self.is_supabase_connected:
+            messagebox.showwarning("Keine Verbindung", "Keine Verbindung zu Supabase.")
+            return
+        
+        self.sync_changes(on_done=lambda changed: messagebox.showinfo(
+            "Daten aktualisiert", f"{changed} geänderte Einträge von Supabase übernommen."))
+    
+    def table_views(self):
+        """Get the views showing a database table, see apply_row_changes"""
+        return list(self.project_data_ui.sections.values()) + [self.view_shifts_ui]
+    
+    def start_live_updates(self):
+        """Apply the changes made by others as they happen
+        
+        With Supabase the changes are received through Realtime unless
+        SUPABASE_REALTIME=0; otherwise, and while Realtime is unavailable,
+        the tables are delta synced periodically.
+        """
+        if self.live_updates is not None:
+            return
+        
+        feed = None
+        if (isinstance(self.supabase_connector, SupabaseConnector)
+                and os.environ.get("SUPABASE_REALTIME", "1") != "0"):
+            feed = SupabaseChangeFeed([view.TABLE for view in self.table_views()])
+        
+        self.live_updates = LiveUpdates(self, feed)
         try:
-            # Refresh dropdown data
-            self.load_dropdown_data()
-            
-            # Update dropdowns in UI
-            self.update_dropdown_values()
+            self.live_updates.start()
+        except Exception as e:
+            # E.g. the realtime package is missing; polling keeps running
+            print(f"Change feed not available: {str(e)}")
+    
+    def sync_changes(self, on_done=None, on_error=None):
+        """Apply the rows changed in Supabase to all tables
+        
+        The changes are fetched in the background and applied on the Tk
+        thread. Tables that were never fully loaded are loaded completely
+        instead.
+        
+        Args:
+            on_done (function, optional): Called with the number of new,
+                changed and deleted rows once the changes were applied
+            on_error (function, optional): Called with the exception if
+                fetching failed, instead of showing an error message
+        """
+        if on_error is None:
+            on_error = lambda e: messagebox.showerror(
+                "Fehler", f"Fehler beim Aktualisieren der Daten: {str(e)}")
+        
+        tracked = []
+        for view in self.table_views():
+            if self.delta_sync.is_tracked(view.TABLE):
+                tracked.append(view)
+            else:
+                view.refresh_data()
+        
+        def fetch_changes():
+            return [self.delta_sync.sync(view.TABLE) for view in tracked]
+        
+        def apply_changes(all_changes):
+            changed = 0
+            changed_tables = set()
+            for view, changes in zip(tracked, all_changes):
+                if changes["upserted"] or changes["deleted"]:
+                    view.apply_row_changes(changes["upserted"], changes["deleted"])
+                    changed += len(changes["upserted"]) + len(changes["deleted"])
+                    changed_tables.add(view.TABLE)
             
-            # Refresh project data tab
-            self.project_data_ui.refresh_all_project_data()
+            # Dropdowns are derived from the master data tables
+            if changed_tables & set(DROPDOWN_TABLES):
+                self.load_dropdown_data(on_loaded=self.update_dropdown_values)
             
-            # Refresh shifts view using the view_shifts_ui instance
-            self.view_shifts_ui.refresh_data()
+            if on_done:
+                on_done(changed)
+        
+        self.io.submit(
+            fetch_changes,
+            on_success=apply_changes,
+            on_error=on_error
+        )
+    
+    def reload_all_data(self, on_done=None):
+        """Reload dropdowns, project data and shifts from Supabase
+        
+        All loads run in the background. The dropdowns are derived from the
+        project data rows, so they need no requests of their own.
+        
+        Args:
+            on_done (function, optional): Called without arguments once
+                every table was loaded, or loading failed
+        """
+        pending = [2]
+        
+        def part_done():
+            pending[0] -= 1
+            if pending[0] == 0 and on_done:
+                on_done()
+        
+        def project_data_loaded(tables):
+            # Refresh dropdown data and update dropdowns in UI
+            if all(table in tables for table in DROPDOWN_TABLES):
+                self.dropdown_data = SupabaseConnector.build_dropdown_data(tables)
+                self.update_dropdown_values()
+            else:
+                self.load_dropdown_data(on_loaded=self.update_dropdown_values)
+            part_done()
+        
+        # Refresh project data and shifts concurrently
+        self.project_data_ui.refresh_all_project_data(on_done=project_data_loaded)
+        self.view_shifts_ui.refresh_data(on_done=part_done)
+    
+    def reconcile_with_supabase(self):
+        """Replace the data rendered from the disk cache with current data"""
+        self.reload_all_data()
+    
+    def show_connection_stats(self):
+        """Show how many requests of this session reused a connection"""
+        if not self.is_supabase_connected:
+            messagebox.showwarning("Keine Verbindung", "Keine Verbindung zu Supabase.")
+            return
+        
+        stats = self.supabase_connector.connection_stats.snapshot()
+        messagebox.showinfo(
+            "Verbindungsstatistik",
+            f"Anfragen: {stats['requests']}\n"
+            f"Neue TCP-Verbindungen: {stats['tcp_handshakes']}\n"
+            f"TLS-Handshakes: {stats['tls_handshakes']}\n"
+            f"Wiederverwendete Verbindungen: {stats['reused_connections']}\n"
+            f"Über HTTP/2: {stats['http2_requests']}"
+        )
+    
+    def queue_writes(self, table, op, records, base_versions=None):
+        """Keep writes in the offline queue until Supabase is reachable again
+        
+        The versions the writes are based on are stored with them, so the
+        replay can detect rows changed by others in the meantime.
+        
+        Args:
+            table (str): Table name
+            op (str): INSERT, UPDATE or DELETE from connectors.write_queue
+            records (list): Row dicts including "id"
+            base_versions (dict, optional): Row ID -> version the edits were
+                made on; defaults to the versions as last loaded, which is
+                only right for writes not based on an edit session
             
-            messagebox.showinfo("Daten aktualisiert", "Daten wurden erfolgreich von Supabase aktualisiert.")
+        Returns:
+            bool: True if the writes were queued
+        """
+        if self.write_queue is None:
+            return False
+        
+        if base_versions is None:
+            delta_sync = getattr(self, "delta_sync", None)
+            base_versions = delta_sync.versions(table, [record["id"] for record in records]) if delta_sync else {}
+        try:
+            self.write_queue.enqueue(table, op, records, base_versions)
         except Exception as e:
-            messagebox.showerror("Fehler", f"Fehler beim Aktualisieren der Daten: {str(e)}")
-            # Re-raise the exception for debugging
-            raise 
\ No newline at end of file
+            print(f"Error queueing offline writes: {str(e)}")
+            return False
+        
+        self.update_offline_status()
+        self.schedule_replay()
+        return True
+    
+    def queue_if_offline(self, error, table, op, records, base_versions=None):
+        """Queue writes that failed because Supabase is unreachable
+        
+        Args:
+            error (Exception): Error raised by the connector
+            table (str): Table name
+            op (str): INSERT, UPDATE or DELETE from connectors.write_queue
+            records (list): Row dicts including "id"
+            base_versions (dict, optional): See queue_writes
+            
+        Returns:
+            bool: True if the writes were queued; other errors must be
+                reported by the caller
+        """
+        return is_transient(error) and self.queue_writes(table, op, records, base_versions)
+    
+    def update_offline_status(self):
+        """Show the number of queued offline writes in the window title"""
+        count = self.write_queue.count() if self.write_queue else 0
+        if count:
+            self.root.title(f"Schichtplaner - {count} Änderungen nicht übertragen")
+        else:
+            self.root.title("Schichtplaner")
+    
+    def schedule_replay(self):
+        """Try to replay the offline write queue again after REPLAY_INTERVAL"""
+        if self.replay_scheduled:
+            return
+        self.replay_scheduled = True
+        
+        def replay():
+            self.replay_scheduled = False
+            self.replay_offline_writes()
+        
+        self.root.after(REPLAY_INTERVAL, replay)
+    
+    def replay_offline_writes(self, interactive=False):
+        """Send the writes queued offline to Supabase in the background
+        
+        Without a connector, connecting is tried first. Writes conflicting
+        with remote changes are not sent and are listed to the user; the
+        tables are then synced, so they show the state in Supabase.
+        
+        Args:
+            interactive (bool): Report the outcome even if nothing happened,
+                for the menu command
+        """
+        if self.write_queue is None or self.replay_task is not None:
+            return
+        
+        connected_now = not self.is_supabase_connected
+        if connected_now:
+            try:
+                self.connect_supabase()
+            except Exception as e:
+                if interactive:
+                    messagebox.showwarning("Keine Verbindung", f"Keine Verbindung zu Supabase.\nFehler: {str(e)}")
+                return
+        
+        def replayed(report):
+            self.replay_task = None
+            self.update_offline_status()
+            
+            # Show the rows as stored in Supabase now
+            if connected_now:
+                self.reload_all_data()
+                self.start_live_updates()
+            elif report["applied"] or report["conflicts"]:
+                self.sync_changes()
+            
+            if report["conflicts"]:
+                lines = [f"{write['table']} {write['id']}: {write['reason']}" for write in report["conflicts"][:10]]
+                if len(report["conflicts"]) > 10:
+                    lines.append(f"... und {len(report['conflicts']) - 10} weitere")
+                messagebox.showwarning(
+                    "Konflikte",
+                    f"{len(report['conflicts'])} Offline-Änderungen wurden nicht übertragen, "
+                    f"weil die Einträge inzwischen geändert oder gelöscht wurden:\n" + "\n".join(lines)
+                )
+            
+            if report["pending"]:
+                self.schedule_replay()
+                if interactive:
+                    messagebox.showwarning(
+                        "Keine Verbindung",
+                        f"{report['pending']} Offline-Änderungen konnten noch nicht übertragen werden.")
+            elif interactive:
+                messagebox.showinfo(
+                    "Offline-Änderungen übertragen",
+                    f"{report['applied']} Offline-Änderungen wurden übertragen.")
+        
+        def failed(error):
+            self.replay_task = None
+            self.schedule_replay()
+            if interactive:
+                messagebox.showerror("Fehler", f"Fehler beim Übertragen der Offline-Änderungen: {str(error)}")
+            else:
+                print(f"Error replaying offline writes: {str(error)}")
+        
+        self.replay_task = self.io.submit(
+            self.write_queue.replay, self.supabase_connector,
+            on_success=replayed,
+            on_error=failed
+        )
+    
+    def on_close(self):
+        """Stop the background workers and close the window"""
+        if self.live_updates is not None:
+            self.live_updates.stop()
+        self.io.shutdown()
+        if self.is_supabase_connected:
+            print(f"Supabase connections: {self.supabase_connector.connection_report()}")
+        self.root.destroy()
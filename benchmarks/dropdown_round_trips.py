@@ -0,0 +1,135 @@
+"""Count the Supabase round trips needed to load the dropdown data
+
+Runs against an in-memory fake client, so no network access or credentials
+are needed. A simulated latency per request shows what the round trips cost
+over a slow connection (e.g. VPN to the site).
+
+Usage:
+    python benchmarks/dropdown_round_trips.py [latency_ms]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from connectors.supabase_connector import SupabaseConnector, DROPDOWN_TABLES
+
+SAMPLE_ROWS = {
+    "abschnitte": [{"abschnitt": f"Abschnitt {i}"} for i in range(10)],
+    "baufuhrer": [{"name": f"Bauführer {i}"} for i in range(5)],
+    "arbeitsleiter": [{"name": f"Arbeitsleiter {i}"} for i in range(5)],
+    "schichtzeiten": [{"schicht": name} for name in ("Tag", "Nacht", "Spät")],
+    "personal": [{"name": f"Mitarbeiter {i}", "funktion": f}
+                 for i, f in enumerate(["Bauarbeiter", "AKO", "SC", "SIWA", "Logistik"] * 20)],
+    "inventar": [{"maschine": f"Maschine {i}", "type": t}
+                 for i, t in enumerate(["GBM", "ZW-Fahrzeug", "Diverses"] * 10)],
+}
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """Minimal stand-in for a PostgREST request builder"""
+    
+    def __init__(self, client, rows):
+        self.client = client
+        self.rows = rows
+        self.fields = None
+    
+    def select(self, columns):
+        self.fields = columns.split(",")
+        return self
+    
+    def eq(self, column, value):
+        self.rows = [row for row in self.rows if row.get(column) == value]
+        return self
+    
+    def execute(self):
+        time.sleep(self.client.latency)
+        if self.fields:
+            return FakeResponse([{f: row.get(f) for f in self.fields} for row in self.rows])
+        return FakeResponse(self.rows)
+
+
+class FakeClient:
+    """Fake Supabase client serving SAMPLE_ROWS"""
+    
+    def __init__(self, latency):
+        self.latency = latency
+    
+    def table(self, name):
+        return FakeQuery(self, list(SAMPLE_ROWS[name]))
+    
+    def rpc(self, name, params):
+        query = FakeQuery(self, None)
+        query.rows = {table: SAMPLE_ROWS[table] for table in DROPDOWN_TABLES}
+        return query
+
+
+def legacy_get_dropdown_data(connector):
+    """The previous loader: one query per dropdown list (11 round trips)"""
+    def names(table, column, **filters):
+        query = connector.supabase.table(table).select(column)
+        for key, value in filters.items():
+            query = query.eq(key, value)
+        return [item[column] for item in connector._execute(query).data]
+    
+    return {
+        "abschnitt": names("abschnitte", "abschnitt"),
+        "baufuhrer": names("baufuhrer", "name"),
+        "arbeitsleiter": names("arbeitsleiter", "name"),
+        "zeit": names("schichtzeiten", "schicht"),
+        "personal": names("personal", "name"),
+        "logistik_personal": names("personal", "name", funktion="Logistik"),
+        "ako_personal": names("personal", "name", funktion="AKO"),
+        "sc_personal": names("personal", "name", funktion="SC"),
+        "siwa_personal": names("personal", "name", funktion="SIWA"),
+        "inventar": names("inventar", "maschine"),
+        "gbm_machines": names("inventar", "maschine", type="GBM"),
+    }
+
+
+def make_connector(latency, rpc=None):
+    """Create a connector wired to the fake client"""
+    connector = SupabaseConnector(FakeClient(latency))
+    connector.dropdown_rpc = rpc
+    # Keep the fake rows out of the user's disk cache
+    connector.disk_cache = None
+    return connector
+
+
+def run(label, connector, loader):
+    """Run one loader and print round trips and elapsed time"""
+    start = time.perf_counter()
+    data = loader(connector)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {connector.round_trips:>3} round trips  {elapsed * 1000:>8.1f} ms")
+    return data
+
+
+def main():
+    latency = (float(sys.argv[1]) if len(sys.argv) > 1 else 150.0) / 1000
+    print(f"Simulated latency per request: {latency * 1000:.0f} ms")
+    
+    before = run("before (per list)", make_connector(latency), legacy_get_dropdown_data)
+    after = run("after (per table)", make_connector(latency), SupabaseConnector.get_dropdown_data)
+    rpc = run("after (single RPC)", make_connector(latency, rpc="get_dropdown_data"),
+              SupabaseConnector.get_dropdown_data)
+    
+    # A second load within the cache TTL needs no requests at all
+    cached = make_connector(latency)
+    cached.get_dropdown_data()
+    cached.round_trips = 0
+    run("after (cached)", cached, SupabaseConnector.get_dropdown_data)
+    
+    # The consolidated loaders must produce the same lists
+    for key, values in before.items():
+        assert after[key] == values == rpc[key], key
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,643 @@
+import asyncio
+from supabase import acreate_client, AsyncClient, AsyncClientOptions
+
+from connectors.cache import MISSING
+from connectors.http_pool import ConnectionStats, create_async_http_client
+from connectors.resilience import AsyncRequestCoalescer, is_transient
+from connectors.schema import DROPDOWN_COLUMNS, DROPDOWN_TABLES, VERSION_COLUMNS
+from connectors.supabase_connector import (
+    BaseSupabaseConnector, PAGE_SIZE, SHIFT_WINDOW_KEY, INSERT_CHUNK_SIZE, UPSERT_CHUNK_SIZE,
+    DELETE_CHUNK_SIZE, select_clause, shift_filters, apply_filters, keyset_condition,
+    make_record, supabase_credentials,
+)
+
+class AsyncSupabaseConnector(BaseSupabaseConnector):
+    """Asyncio variant of SupabaseConnector
+    
+    Offers the same methods as SupabaseConnector as coroutines, so headless
+    tools can overlap many requests. The async client sends them over a
+    pooled HTTP/2 connection (see connectors/http_pool.py). Caches, query building and row processing are
+    shared with the sync connector.
+    
+    Create instances with the create() coroutine:
+    
+        connector = await AsyncSupabaseConnector.create()
+    """
+    
+    def __init__(self, client: AsyncClient, connection_stats=None):
+        """Initialize the connector with an async Supabase client
+        
+        Args:
+            client (AsyncClient): Client created with acreate_client
+            connection_stats (ConnectionStats, optional): Counters updated by
+                the HTTP client of the Supabase client
+        """
+        super().__init__(client, connection_stats)
+        
+        # Identical concurrent reads share one request
+        self.coalescer = AsyncRequestCoalescer()
+    
+    @classmethod
+    async def create(cls):
+        """Create a connector from the SUPABASE_URL and SUPABASE_KEY environment variables
+        
+        Returns:
+            AsyncSupabaseConnector: The connector
+        """
+        url, key = supabase_credentials()
+        stats = ConnectionStats()
+        options = AsyncClientOptions(httpx_client=create_async_http_client(stats=stats))
+        return cls(await acreate_client(url, key, options), stats)
+    
+    async def close(self):
+        """Close the pooled HTTP connections of the client"""
+        await self.supabase.postgrest.aclose()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+    
+    async def _execute(self, query):
+        """Execute a query builder and count the round trip
+        
+        Args:
+            query: PostgREST request builder
+        
+        Returns:
+            APIResponse: The response of the request
+        """
+        self.round_trips += 1
+        return await query.execute()
+    
+    async def _read(self, query):
+        """Execute an idempotent query, retrying transient errors with backoff
+        
+        Args:
+            query: PostgREST request builder
+            
+        Returns:
+            APIResponse: The response of the request
+        """
+        return await self.retry_policy.call_async(lambda: self._execute(query))
+    
+    async def _select(self, table, columns=None):
+        """Select all rows of a table, served from the cache when possible
+        
+        Args:
+            table (str): Table name
+            columns (list, optional): Columns to select, all if not given
+        
+        Returns:
+            list: The rows
+        """
+        select = select_clause(columns)
+        key = (table, select)
+        
+        if self.stale_reads:
+            rows = self._read_persisted(key)
+            if rows is not None:
+                return rows
+        
+        rows = self.cache.get((table,), key)
+        if rows is MISSING:
+            async def load():
+                generation = self.cache.generation((table,))
+                rows = self._persist(key, (await self._read(self.supabase.table(table).select(select))).data)
+                self.cache.set((table,), key, rows, generation)
+                return rows
+            rows = await self.coalescer.run(key, load)
+        return rows
+    
+    async def _write(self, table, query, retry=False):
+        """Execute a write query and invalidate the cached results of the table
+        
+        Args:
+            table (str): Table the query writes to
+            query: PostgREST request builder
+            retry (bool): Retry transient errors; only for idempotent writes
+            
+        Returns:
+            APIResponse: The response of the request
+        """
+        try:
+            if retry:
+                return await self._read(query)
+            return await self._execute(query)
+        finally:
+            self.cache.invalidate(table)
+    
+    # --- DROPDOWN DATA METHODS ---
+    
+    async def get_dropdown_data(self):
+        """Get all dropdown data from Supabase
+        
+        See SupabaseConnector.get_dropdown_data; without the RPC, the base
+        tables are fetched concurrently.
+        
+        Returns:
+            dict: Dictionary with all dropdown data
+        """
+        tables = None
+        if self.dropdown_rpc:
+            try:
+                tables = await self._get_dropdown_tables_rpc()
+            except Exception as e:
+                print(f"Dropdown RPC '{self.dropdown_rpc}' failed, falling back to table queries: {str(e)}")
+        
+        if tables is None:
+            tables = await self._get_dropdown_tables()
+        
+        return self.build_dropdown_data(tables)
+    
+    async def _get_dropdown_tables(self):
+        """Fetch the base tables needed for the dropdowns, all queries at once"""
+        rows = await asyncio.gather(*(
+            self._select(table, columns) for table, columns in DROPDOWN_COLUMNS.items()
+        ))
+        return dict(zip(DROPDOWN_COLUMNS, rows))
+    
+    async def _get_dropdown_tables_rpc(self):
+        """Fetch all dropdown base tables in one call to the configured RPC"""
+        key = ("rpc", self.dropdown_rpc)
+        result = self._read_persisted(key) if self.stale_reads else None
+        if result is None:
+            result = self.cache.get(DROPDOWN_TABLES, key)
+        if result is MISSING:
+            async def load():
+                generation = self.cache.generation(DROPDOWN_TABLES)
+                result = self._persist(key, (await self._read(self.supabase.rpc(self.dropdown_rpc, {}))).data)
+                self.cache.set(DROPDOWN_TABLES, key, result, generation)
+                return result
+            result = await self.coalescer.run(key, load)
+        return self._rpc_tables(result)
+    
+    # --- GENERIC READ METHODS ---
+    
+    async def get_rows(self, table, columns=None):
+        """Get all rows of a table, cached for master tables
+        
+        Args:
+            table (str): Table name
+            columns (list, optional): Columns to select, all if not given
+        
+        Returns:
+            list: The rows
+        """
+        return await self._select(table, columns)
+    
+    async def get_changed_rows(self, table, version_column, since=None, columns=None, filters=None,
+                               batch_size=PAGE_SIZE):
+        """Get the rows modified at or after a version
+        
+        See SupabaseConnector.get_changed_rows.
+        
+        Returns:
+            list: The changed rows, ordered by version
+        """
+        select = select_clause(columns, required=("id", version_column))
+        filters = list(filters or [])
+        if since:
+            filters.append(("gte", version_column, since))
+        
+        rows = []
+        async for batch in self._iter_keyset_pages(table, select, version_column, filters,
+                                                   not since, batch_size):
+            rows.extend(batch)
+        return rows
+    
+    async def get_ids(self, table, filters=None, batch_size=PAGE_SIZE):
+        """Get the IDs of all rows of a table
+        
+        Args:
+            table (str): Table name
+            filters (list, optional): Filter tuples
+            batch_size (int): IDs per request
+        
+        Returns:
+            set: The IDs
+        """
+        ids = set()
+        last_id = None
+        while True:
+            query = apply_filters(self.supabase.table(table).select("id"), filters or [])
+            if last_id:
+                query = query.gt("id", last_id)
+            rows = (await self._read(query.order("id").limit(batch_size))).data
+            ids.update(row["id"] for row in rows)
+            if len(rows) < batch_size:
+                return ids
+            last_id = rows[-1]["id"]
+    
+    async def get_by_ids(self, table, ids, columns=None, chunk_size=DELETE_CHUNK_SIZE):
+        """Get the rows with the given IDs
+        
+        See SupabaseConnector.get_by_ids; the chunks are fetched concurrently.
+        
+        Returns:
+            list: The rows found
+        """
+        select = select_clause(columns, required=("id",))
+        queries = [
+            self.supabase.table(table).select(select).in_("id", list(ids[start:start + chunk_size]))
+            for start in range(0, len(ids), chunk_size)
+        ]
+        results = await asyncio.gather(*(self._read(query) for query in queries))
+        return [row for result in results for row in result.data]
+    
+    # --- BULK METHODS ---
+    
+    async def upsert_many(self, table, rows, chunk_size=UPSERT_CHUNK_SIZE):
+        """Insert or update several rows of a table in bulk
+        
+        See SupabaseConnector.upsert_many; the chunks are sent concurrently.
+        
+        Returns:
+            list: The upserted rows
+        """
+        queries = [
+            self.supabase.table(table).upsert(rows[start:start + chunk_size], on_conflict="id")
+            for start in range(0, len(rows), chunk_size)
+        ]
+        results = await asyncio.gather(*(self._write(table, query, retry=True) for query in queries))
+        return [row for result in results for row in result.data]
+    
+    async def delete_many(self, table, ids, chunk_size=DELETE_CHUNK_SIZE):
+        """Delete several rows of a table by ID
+        
+        See SupabaseConnector.delete_many; the chunks are sent concurrently.
+        """
+        queries = [
+            self.supabase.table(table).delete().in_("id", list(ids[start:start + chunk_size]))
+            for start in range(0, len(ids), chunk_size)
+        ]
+        await asyncio.gather(*(self._write(table, query, retry=True) for query in queries))
+    
+    async def update_if_unchanged(self, table, rows, base_versions, chunk_size=UPSERT_CHUNK_SIZE):
+        """Update rows unless others changed them since they were loaded
+        
+        See SupabaseConnector.update_if_unchanged; the requests are sent
+        concurrently. If a request fails, the rows of the other requests
+        may still have been written; they are reported as failed as well.
+        
+        Returns:
+            dict: "updated", "conflicts", "failed", "error" and "transient"
+        """
+        version_column = VERSION_COLUMNS[table]
+        
+        async def update_chunk(chunk):
+            result = (await self._write(table, self.supabase.rpc(self.update_rpc, {
+                "table_name": table,
+                "version_column": version_column,
+                "updates": [{"row": row, "base_version": base_versions[row["id"]]} for row in chunk],
+            }))).data
+            return result["updated"], result["conflicts"]
+        
+        async def update_row(row):
+            result = (await self._write(table, self._update_query(table, row, base_versions))).data
+            return result, [] if result else [row["id"]]
+        
+        conditional = []
+        if self.update_rpc:
+            conditional = [row for row in rows if row["id"] in base_versions]
+        sent = {row["id"] for row in conditional}
+        try:
+            results = await asyncio.gather(
+                *(update_chunk(conditional[start:start + chunk_size])
+                  for start in range(0, len(conditional), chunk_size)),
+                *(update_row(row) for row in rows if row["id"] not in sent)
+            )
+            conflicting = [row_id for _, ids in results for row_id in ids]
+            updated = [row for result, _ in results for row in result]
+            current_rows = await self.get_by_ids(table, conflicting) if conflicting else []
+        except Exception as e:
+            return self._update_report(rows, [], [], [], rows, e)
+        
+        return self._update_report(rows, updated, conflicting, current_rows)
+    
+    # --- AGGREGATE METHODS ---
+    
+    async def get_shift_counts(self, date_from=None, date_to=None):
+        """Get the aggregates of the shifts in a date window without loading them
+        
+        See SupabaseConnector.get_shift_counts.
+        
+        Returns:
+            dict: "shifts", "shifts_per_day", "headcount_per_schichtzeit" and
+                "machine_days_per_type"
+        """
+        if self.counts_rpc:
+            try:
+                query = self.supabase.rpc(self.counts_rpc, self._counts_params(date_from, date_to))
+                return self._shift_counts((await self._read(query)).data)
+            except Exception as e:
+                print(f"Counts RPC '{self.counts_rpc}' failed, falling back to counting shifts: {str(e)}")
+        
+        query = self.supabase.table("schichtplanung").select("id", count="exact", head=True)
+        query = apply_filters(query, shift_filters(date_from, date_to))
+        return {
+            "shifts": (await self._read(query)).count,
+            "shifts_per_day": None,
+            "headcount_per_schichtzeit": None,
+            "machine_days_per_type": None,
+        }
+    
+    # --- SHIFTS METHODS ---
+    
+    async def get_schichtplanung(self, date_from=None, date_to=None, abschnitt=None, columns=None,
+                                 contains=None):
+        """Get shift planning data from Supabase
+        
+        See SupabaseConnector.get_schichtplanung.
+        
+        Returns:
+            list: The matching shift rows
+        """
+        rows = []
+        async for batch in self.iter_schichtplanung(date_from, date_to, abschnitt, columns, contains):
+            rows.extend(batch)
+        return rows
+    
+    async def iter_schichtplanung(self, date_from=None, date_to=None, abschnitt=None, columns=None,
+                                  contains=None, batch_size=PAGE_SIZE):
+        """Iterate over the shift planning data in batches
+        
+        See SupabaseConnector.iter_schichtplanung.
+        
+        Yields:
+            list: The next batch of shift rows
+        """
+        select = select_clause(columns, required=("id", "datum_von"))
+        filters = shift_filters(date_from, date_to, abschnitt, contains)
+        
+        windowed = bool(date_from or date_to)
+        
+        # The last loaded date window is kept on disk for the next start
+        window = self._shift_window(select, filters)
+        if self.stale_reads:
+            rows = self._read_persisted_window(window)
+            if rows is not None:
+                for start in range(0, len(rows), batch_size):
+                    yield rows[start:start + batch_size]
+                return
+        
+        loaded = []
+        # Shifts without a date can never match a date window
+        pages = self._iter_keyset_pages("schichtplanung", select, "datum_von", filters,
+                                        not windowed, batch_size)
+        async for batch in pages:
+            loaded.extend(batch)
+            yield batch
+        
+        # The full history is not persisted, only date windows
+        if windowed:
+            self._persist(SHIFT_WINDOW_KEY, {"window": window, "rows": loaded})
+    
+    async def _iter_keyset_pages(self, table, select, order_column, filters, include_nulls, batch_size):
+        """Fetch the pages of a query with keyset pagination on (order_column, id)
+        
+        See SupabaseConnector._iter_keyset_pages.
+        
+        Yields:
+            list: The next batch of rows
+        """
+        # Rows with a value, ordered by (order_column, id)
+        last = None
+        while True:
+            query = self.supabase.table(table).select(select).not_.is_(order_column, "null")
+            query = apply_filters(query, filters)
+            if last:
+                query = query.or_(keyset_condition(order_column, last))
+            rows = (await self._read(query.order(order_column).order("id").limit(batch_size))).data
+            if rows:
+                yield rows
+            if len(rows) < batch_size:
+                break
+            last = rows[-1]
+        
+        if not include_nulls:
+            return
+        
+        # Rows without a value, ordered by id
+        last_id = None
+        while True:
+            query = self.supabase.table(table).select(select).is_(order_column, "null")
+            query = apply_filters(query, filters)
+            if last_id:
+                query = query.gt("id", last_id)
+            rows = (await self._read(query.order("id").limit(batch_size))).data
+            if rows:
+                yield rows
+            if len(rows) < batch_size:
+                break
+            last_id = rows[-1]["id"]
+    
+    async def add_schichtplanung(self, data):
+        """Add new shift planning to Supabase
+        
+        Args:
+            data (dict): Shift planning data
+        
+        Returns:
+            list: The inserted data
+        """
+        result = await self._write("schichtplanung", self.supabase.table("schichtplanung").insert(data))
+        return result.data
+    
+    async def add_schichtplanung_many(self, rows, chunk_size=INSERT_CHUNK_SIZE):
+        """Add several shifts to Supabase in bulk
+        
+        See SupabaseConnector.add_schichtplanung_many. The chunks are sent
+        one after another, so a failed chunk stops the remaining ones.
+        
+        Returns:
+            list: One outcome dict per row, in input order
+        """
+        outcomes = [{"status": "skipped", "data": None, "error": None} for _ in rows]
+        inserted = []  # Indexes of rows inserted so far
+        
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                result = (await self._write("schichtplanung",
+                                            self.supabase.table("schichtplanung").insert(chunk))).data
+            except Exception as e:
+                for index in range(start, start + len(chunk)):
+                    outcomes[index] = {"status": "failed", "data": None, "error": str(e),
+                                       "transient": is_transient(e)}
+                await self._rollback_inserts(outcomes, inserted)
+                return outcomes
+            
+            # PostgREST returns the inserted rows in request order
+            for offset, row in enumerate(result):
+                outcomes[start + offset] = {"status": "inserted", "data": row, "error": None}
+                inserted.append(start + offset)
+        
+        return outcomes
+    
+    async def _rollback_inserts(self, outcomes, inserted):
+        """Delete the shifts inserted by an aborted bulk insert
+        
+        Args:
+            outcomes (list): Outcomes of the bulk insert, updated in place
+            inserted (list): Indexes of the rows that were inserted
+        """
+        ids = [outcomes[index]["data"]["id"] for index in inserted]
+        try:
+            await self.delete_many("schichtplanung", ids)
+        except Exception as e:
+            # The rows stay in the database; report them as inserted
+            print(f"Error rolling back inserted shifts: {str(e)}")
+            for index in inserted:
+                outcomes[index]["rollback_error"] = str(e)
+            return
+        
+        for index in inserted:
+            outcomes[index] = {"status": "rolled_back", "data": None, "error": None}
+    
+    async def update_schichtplanung(self, id, data, base_version=None):
+        """Update shift planning in Supabase
+        
+        See SupabaseConnector.update_schichtplanung.
+        
+        Returns:
+            list: The updated data, empty if the shift was changed or
+                deleted by others
+        """
+        query = self.supabase.table("schichtplanung").update(data).eq("id", id)
+        if base_version is not None:
+            query = query.eq(VERSION_COLUMNS["schichtplanung"], base_version)
+        return (await self._write("schichtplanung", query)).data
+    
+    async def delete_schichtplanung(self, id):
+        """Delete shift planning from Supabase
+        
+        Args:
+            id (str): ID of the shift to delete
+        """
+        return await self._write("schichtplanung", self.supabase.table("schichtplanung").delete().eq("id", id))
+    
+    # --- MASTER DATA METHODS ---
+    
+    async def _add(self, table, *values):
+        """Insert one master data row built from EDITABLE_COLUMNS"""
+        data = make_record(table, *values)
+        return (await self._write(table, self.supabase.table(table).insert(data))).data
+    
+    async def _update(self, table, id, *values):
+        """Update one master data row built from EDITABLE_COLUMNS"""
+        data = make_record(table, *values)
+        return (await self._write(table, self.supabase.table(table).update(data).eq("id", id))).data
+    
+    async def _delete(self, table, id):
+        """Delete one master data row"""
+        return await self._write(table, self.supabase.table(table).delete().eq("id", id))
+    
+    # --- ABSCHNITTE METHODS ---
+    
+    async def get_abschnitte(self, columns=None):
+        """Get all abschnitte from Supabase"""
+        return await self._select("abschnitte", columns)
+    
+    async def add_abschnitt(self, abschnitt, beschreibung=""):
+        """Add new abschnitt to Supabase"""
+        return await self._add("abschnitte", abschnitt, beschreibung)
+    
+    async def update_abschnitt(self, id, abschnitt, beschreibung=""):
+        """Update an abschnitt in Supabase"""
+        return await self._update("abschnitte", id, abschnitt, beschreibung)
+    
+    async def delete_abschnitt(self, id):
+        """Delete an abschnitt from Supabase"""
+        return await self._delete("abschnitte", id)
+    
+    # --- SCHICHTZEITEN METHODS ---
+    
+    async def get_schichtzeiten(self, columns=None):
+        """Get all schichtzeiten from Supabase"""
+        return await self._select("schichtzeiten", columns)
+    
+    async def add_schichtzeit(self, schicht, zeit_von, zeit_bis):
+        """Add new schichtzeit to Supabase"""
+        return await self._add("schichtzeiten", schicht, zeit_von, zeit_bis)
+    
+    async def update_schichtzeit(self, id, schicht, zeit_von, zeit_bis):
+        """Update a schichtzeit in Supabase"""
+        return await self._update("schichtzeiten", id, schicht, zeit_von, zeit_bis)
+    
+    async def delete_schichtzeit(self, id):
+        """Delete a schichtzeit from Supabase"""
+        return await self._delete("schichtzeiten", id)
+    
+    # --- ARBEITSLEITER METHODS ---
+    
+    async def get_arbeitsleiter(self, columns=None):
+        """Get all arbeitsleiter from Supabase"""
+        return await self._select("arbeitsleiter", columns)
+    
+    async def add_arbeitsleiter(self, name, telefonnummer="", email=""):
+        """Add new arbeitsleiter to Supabase"""
+        return await self._add("arbeitsleiter", name, telefonnummer, email)
+    
+    async def update_arbeitsleiter(self, id, name, telefonnummer="", email=""):
+        """Update an arbeitsleiter in Supabase"""
+        return await self._update("arbeitsleiter", id, name, telefonnummer, email)
+    
+    async def delete_arbeitsleiter(self, id):
+        """Delete an arbeitsleiter from Supabase"""
+        return await self._delete("arbeitsleiter", id)
+    
+    # --- BAUFÜHRER METHODS ---
+    
+    async def get_baufuhrer(self, columns=None):
+        """Get all bauführer from Supabase"""
+        return await self._select("baufuhrer", columns)
+    
+    async def add_baufuhrer(self, name, telefonnummer="", email=""):
+        """Add new bauführer to Supabase"""
+        return await self._add("baufuhrer", name, telefonnummer, email)
+    
+    async def update_baufuhrer(self, id, name, telefonnummer="", email=""):
+        """Update a bauführer in Supabase"""
+        return await self._update("baufuhrer", id, name, telefonnummer, email)
+    
+    async def delete_baufuhrer(self, id):
+        """Delete a bauführer from Supabase"""
+        return await self._delete("baufuhrer", id)
+    
+    # --- PERSONAL METHODS ---
+    
+    async def get_personal(self, columns=None):
+        """Get all personnel from Supabase"""
+        return await self._select("personal", columns)
+    
+    async def add_personal(self, name, funktion="", telefonnummer="", email=""):
+        """Add new personnel to Supabase"""
+        return await self._add("personal", name, funktion, telefonnummer, email)
+    
+    async def update_personal(self, id, name, funktion="", telefonnummer="", email=""):
+        """Update personnel in Supabase"""
+        return await self._update("personal", id, name, funktion, telefonnummer, email)
+    
+    async def delete_personal(self, id):
+        """Delete personnel from Supabase"""
+        return await self._delete("personal", id)
+    
+    # --- INVENTAR METHODS ---
+    
+    async def get_inventar(self, columns=None):
+        """Get all inventar from Supabase"""
+        return await self._select("inventar", columns)
+    
+    async def add_inventar(self, maschine, firma="", type=""):
+        """Add new inventar to Supabase"""
+        return await self._add("inventar", maschine, firma, type)
+    
+    async def update_inventar(self, id, maschine, firma="", type=""):
+        """Update inventar in Supabase"""
+        return await self._update("inventar", id, maschine, firma, type)
+    
+    async def delete_inventar(self, id):
+        """Delete inventar from Supabase"""
+        return await self._delete("inventar", id)
@@ -0,0 +1,145 @@
+import threading
+import time
+
+# Seconds a cached result stays valid, per table; tables not listed are not cached
+DEFAULT_TTLS = {
+    "abschnitte": 600,
+    "schichtzeiten": 600,
+    "arbeitsleiter": 600,
+    "baufuhrer": 600,
+    "personal": 600,
+    "inventar": 600,
+}
+
+# Returned by TableCache.get when there is no valid entry
+MISSING = object()
+
+class TableCache:
+    """Read-through cache for query results with per-table TTLs
+    
+    Each entry records the tables it was read from, so a write to any of
+    them invalidates the entry. Invalidating also bumps a generation per
+    table, so a load that was in flight during a write does not store the
+    rows it read before the write.
+    """
+    
+    def __init__(self, ttls=None):
+        """Initialize the cache
+        
+        Args:
+            ttls (dict, optional): Seconds to keep results per table
+        """
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._entries = {}  # key -> (tables, expires_at, value)
+        self._generations = {}  # table -> number of invalidations
+        self._generation = 0  # number of invalidations of all tables
+        self._lock = threading.Lock()
+        
+        # Statistics, used for diagnostics
+        self.hits = 0
+        self.misses = 0
+    
+    def is_cached(self, tables):
+        """Check whether results read from these tables are cached at all
+        
+        Args:
+            tables (tuple): Table names
+        """
+        return all(self.ttls.get(table, 0) > 0 for table in tables)
+    
+    def get_or_load(self, tables, key, loader):
+        """Return the cached value for key, or load and cache it
+        
+        Args:
+            tables (tuple): Tables the value is read from
+            key: Hashable cache key, unique for the query
+            loader (callable): Loads the value on a cache miss
+            
+        Returns:
+            The cached or freshly loaded value
+        """
+        if not self.is_cached(tables):
+            return loader()
+        
+        value = self.get(tables, key)
+        if value is MISSING:
+            generation = self.generation(tables)
+            value = loader()
+            self.set(tables, key, value, generation)
+        return value
+    
+    def get(self, tables, key):
+        """Return the cached value for key without loading it
+        
+        Used by callers whose loader cannot be called here, e.g. coroutines.
+        
+        Args:
+            tables (tuple): Tables the value is read from
+            key: Hashable cache key, unique for the query
+            
+        Returns:
+            The cached value, or MISSING
+        """
+        if not self.is_cached(tables):
+            return MISSING
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > time.monotonic():
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+        return MISSING
+    
+    def generation(self, tables):
+        """Get the generation of tables, to be passed to set after a load
+        
+        Args:
+            tables (tuple): Table names
+            
+        Returns:
+            tuple: Changes whenever one of the tables is invalidated
+        """
+        with self._lock:
+            return self._current_generation(tables)
+    
+    def _current_generation(self, tables):
+        """Get the generation of tables; the lock must be held"""
+        return (self._generation,) + tuple(self._generations.get(table, 0) for table in tables)
+    
+    def set(self, tables, key, value, generation=None):
+        """Store a value read from the given tables
+        
+        Args:
+            tables (tuple): Tables the value is read from
+            key: Hashable cache key
+            value: Value to cache
+            generation (tuple, optional): Generation of the tables taken
+                before the value was loaded; if a table was invalidated
+                since, the value may predate a write and is not stored
+        """
+        if not self.is_cached(tables):
+            return
+        ttl = min(self.ttls[table] for table in tables)
+        with self._lock:
+            if generation is not None and generation != self._current_generation(tables):
+                return
+            self._entries[key] = (tuple(tables), time.monotonic() + ttl, value)
+    
+    def invalidate(self, table=None):
+        """Drop cached results
+        
+        Args:
+            table (str, optional): Only drop results read from this table;
+                all results if not given
+        """
+        with self._lock:
+            if table is None:
+                self._generation += 1
+                self._entries.clear()
+                return
+            self._generations[table] = self._generations.get(table, 0) + 1
+            self._entries = {
+                key: entry for key, entry in self._entries.items()
+                if table not in entry[0]
+            }
@@ -0,0 +1,137 @@
+import asyncio
+import threading
+
+from connectors.supabase_connector import supabase_credentials
+
+# Status reported once the subscription is active; any other status means
+# changes may be missed
+SUBSCRIBED = "SUBSCRIBED"
+
+# Status reported when the subscription failed or was lost
+CHANNEL_ERROR = "CHANNEL_ERROR"
+
+def change_event(table, type, record=None, old_record=None):
+    """Build a row change event as delivered by the change feeds
+    
+    Args:
+        table (str): Table name
+        type (str): "INSERT", "UPDATE" or "DELETE"
+        record (dict, optional): New row, for inserts and updates
+        old_record (dict, optional): Old row, at least its "id", for deletes
+    
+    Returns:
+        dict: The event
+    """
+    return {"table": table, "type": type, "record": record or {}, "old_record": old_record or {}}
+
+class SupabaseChangeFeed:
+    """Subscribes to the row changes of tables through Supabase Realtime
+    
+    The realtime client is asyncio based, so it runs on an event loop in a
+    background thread. Callbacks are called on that thread.
+    """
+    
+    def __init__(self, tables, url=None, key=None):
+        """Initialize the feed
+        
+        Args:
+            tables (list): Tables to subscribe to
+            url (str, optional): Supabase URL, defaults to SUPABASE_URL
+            key (str, optional): Supabase key, defaults to SUPABASE_KEY
+        """
+        if url is None or key is None:
+            url, key = supabase_credentials()
+        self.tables = list(tables)
+        self.url = f"{url.rstrip('/')}/realtime/v1"
+        self.key = key
+        self.loop = None
+        self.client = None
+    
+    def start(self, on_change, on_status):
+        """Start the subscription in the background
+        
+        Args:
+            on_change (function): Called with each change event, see change_event
+            on_status (function): Called with the subscription status and
+                the error, if any
+        """
+        from realtime import AsyncRealtimeClient
+        
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, name="realtime", daemon=True).start()
+        
+        def on_payload(payload):
+            data = payload["data"]
+            on_change(change_event(
+                data["table"], str(getattr(data["type"], "value", data["type"])),
+                data.get("record"), data.get("old_record")
+            ))
+        
+        def on_subscribe(state, error=None):
+            on_status(str(getattr(state, "value", state)), error)
+        
+        async def subscribe():
+            try:
+                self.client = AsyncRealtimeClient(self.url, self.key, auto_reconnect=True)
+                await self.client.connect()
+                channel = self.client.channel("schichtplaner-changes")
+                for table in self.tables:
+                    channel.on_postgres_changes("*", callback=on_payload, table=table)
+                await channel.subscribe(on_subscribe)
+            except Exception as e:
+                on_status(CHANNEL_ERROR, e)
+        
+        asyncio.run_coroutine_threadsafe(subscribe(), self.loop)
+    
+    def stop(self):
+        """Close the subscription and stop the background thread"""
+        if self.loop is None:
+            return
+        
+        async def close():
+            if self.client is not None:
+                await self.client.close()
+            self.loop.stop()
+        
+        asyncio.run_coroutine_threadsafe(close(), self.loop)
+        self.loop = None
+
+class LocalChangeFeed:
+    """Change feed fed by the application itself, e.g. in tests
+    
+    Events passed to publish are delivered like those of
+    SupabaseChangeFeed, on the calling thread.
+    """
+    
+    def __init__(self):
+        """Initialize the feed"""
+        self.on_change = None
+        self.on_status = None
+    
+    def start(self, on_change, on_status):
+        """Start delivering events, see SupabaseChangeFeed.start"""
+        self.on_change = on_change
+        self.on_status = on_status
+        on_status(SUBSCRIBED, None)
+    
+    def stop(self):
+        """Stop delivering events"""
+        self.on_change = None
+        self.on_status = None
+    
+    def publish(self, table, type, record=None, old_record=None):
+        """Deliver a row change event
+        
+        Args:
+            table (str): Table name
+            type (str): "INSERT", "UPDATE" or "DELETE"
+            record (dict, optional): New row, for inserts and updates
+            old_record (dict, optional): Old row, at least its "id", for deletes
+        """
+        if self.on_change:
+            self.on_change(change_event(table, type, record, old_record))
+    
+    def set_status(self, status, error=None):
+        """Report a subscription status, e.g. CHANNEL_ERROR to simulate an outage"""
+        if self.on_status:
+            self.on_status(status, error)
@@ -0,0 +1,232 @@
+import datetime
+
+from connectors.schema import VERSION_COLUMNS
+from connectors.supabase_connector import matches_filters
+
+# Number of delta syncs after which the ID set is reconciled to detect deletes
+RECONCILE_EVERY = 10
+
+# Versions are stamped when a row is written, not when its transaction
+# commits, so a row can become visible with a version below the high-water
+# mark of a sync that ran in between. Syncs re-fetch this far below the
+# mark; rows fetched again unchanged are ignored by the merge.
+HIGH_WATER_OVERLAP = datetime.timedelta(minutes=5)
+
+class TrackedTable:
+    """In-memory copy of a table (or a filtered part of it) kept in sync"""
+    
+    def __init__(self, table, rows, columns=None, filters=None):
+        """Initialize the tracked table
+        
+        Args:
+            table (str): Table name
+            rows (list): Rows of the last full load
+            columns (list, optional): Columns the rows were loaded with
+            filters (list, optional): Filter tuples the rows were loaded with
+        """
+        self.table = table
+        self.columns = columns
+        self.filters = list(filters or [])
+        self.version_column = VERSION_COLUMNS.get(table)
+        self.model = {row["id"]: row for row in rows}
+        self.high_water = None
+        self.syncs_since_reconcile = 0
+        self.advance(rows)
+    
+    def advance(self, rows):
+        """Move the high-water mark past the versions of these rows"""
+        if not self.version_column:
+            return
+        versions = [row.get(self.version_column) for row in rows if row.get(self.version_column)]
+        if versions:
+            self.high_water = max([self.high_water or ""] + versions)
+    
+    def since(self, overlap):
+        """Get the version from which the next sync fetches changes
+        
+        Args:
+            overlap (datetime.timedelta): How far to reach below the
+                high-water mark, see HIGH_WATER_OVERLAP
+        
+        Returns:
+            str: The high-water mark minus overlap, as a fixed-width UTC
+                timestamp like the version triggers write; the mark itself
+                if it is no timestamp; None before the first sync
+        """
+        if not self.high_water or not overlap:
+            return self.high_water
+        try:
+            version = datetime.datetime.fromisoformat(self.high_water)
+        except ValueError:
+            return self.high_water
+        if version.tzinfo is None:
+            version = version.replace(tzinfo=datetime.timezone.utc)
+        since = (version - overlap).astimezone(datetime.timezone.utc)
+        return since.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+class DeltaSync:
+    """Fetches only the rows changed since the last sync
+    
+    Tables with a version column (see VERSION_COLUMNS) are synced with a
+    high-water mark: only rows modified at or after it, less
+    HIGH_WATER_OVERLAP, are fetched. Every
+    RECONCILE_EVERY syncs the ID set is compared to detect deleted rows.
+    Tables without a version column are re-fetched and diffed.
+    """
+    
+    def __init__(self, connector, reconcile_every=RECONCILE_EVERY, overlap=HIGH_WATER_OVERLAP):
+        """Initialize the delta sync engine
+        
+        Args:
+            connector: Connector providing get_rows, get_changed_rows and get_ids
+            reconcile_every (int): Syncs between ID set reconciliations
+            overlap (datetime.timedelta): How far below the high-water mark
+                syncs fetch, for rows committed after they were stamped
+        """
+        self.connector = connector
+        self.reconcile_every = reconcile_every
+        self.overlap = overlap
+        self.tables = {}
+    
+    def track(self, table, rows, columns=None, filters=None):
+        """Start tracking a table from the rows of a full load
+        
+        Args:
+            table (str): Table name
+            rows (list): Rows of the full load
+            columns (list, optional): Columns the rows were loaded with
+            filters (list, optional): Filter tuples the rows were loaded with
+        """
+        self.tables[table] = TrackedTable(table, rows, columns, filters)
+    
+    def is_tracked(self, table):
+        """Check whether a table is tracked"""
+        return table in self.tables
+    
+    def versions(self, table, ids):
+        """Get the versions of tracked rows as last loaded from Supabase
+        
+        Args:
+            table (str): Table name
+            ids (list): Row IDs
+        
+        Returns:
+            dict: Row ID -> version, for the tracked rows with a version
+        """
+        state = self.tables.get(table)
+        if state is None or not state.version_column:
+            return {}
+        versions = {}
+        for row_id in ids:
+            row = state.model.get(row_id)
+            if row and row.get(state.version_column):
+                versions[row_id] = row[state.version_column]
+        return versions
+    
+    def sync(self, table, reconcile_ids=False):
+        """Fetch the changes of a tracked table and merge them into its model
+        
+        Args:
+            table (str): Table name
+            reconcile_ids (bool): Check for deleted rows even if the
+                reconciliation interval has not passed
+            
+        Returns:
+            dict: "upserted" (new or changed rows) and "deleted" (IDs)
+        """
+        # Syncs run on worker threads while full loads replace the tracked
+        # state on the Tk thread; a sync keeps working on the state it started
+        # with, and the reloaded state starts over from its own rows
+        state = self.tables[table]
+        
+        if state.version_column:
+            # Changes are fetched for the whole table, so rows moved out of
+            # the tracked part are noticed; without a high-water mark yet,
+            # stay within the tracked part
+            rows = self.connector.get_changed_rows(
+                table, state.version_column, state.since(self.overlap), state.columns,
+                None if state.high_water else state.filters
+            )
+            state.syncs_since_reconcile += 1
+            ids = None
+            if reconcile_ids or state.syncs_since_reconcile >= self.reconcile_every:
+                ids = self.connector.get_ids(table, state.filters)
+                state.syncs_since_reconcile = 0
+        else:
+            # No version column: fetch everything and diff
+            self.connector.invalidate_cache(table)
+            rows = self.connector.get_rows(table, state.columns)
+            ids = {row["id"] for row in rows}
+        
+        upserted, deleted = self._merge(state, rows)
+        state.advance(rows)
+        
+        if ids is not None:
+            for row_id in [row_id for row_id in state.model if row_id not in ids]:
+                del state.model[row_id]
+                deleted.append(row_id)
+        
+        # Cached reads of the table are outdated now
+        if upserted or deleted:
+            self.connector.invalidate_cache(table)
+        
+        return {"upserted": upserted, "deleted": deleted}
+    
+    def apply_changes(self, table, rows, deleted_ids):
+        """Merge row changes received from a change feed into a tracked table
+        
+        The high-water mark is left alone, so the next sync still fetches
+        these rows; it cannot miss a change the feed did not deliver.
+        
+        Args:
+            table (str): Table name
+            rows (list): Inserted or updated rows, with all columns
+            deleted_ids (list): IDs of deleted rows
+            
+        Returns:
+            dict: "upserted" (new or changed rows) and "deleted" (IDs) that
+                differ from the tracked state
+        """
+        state = self.tables[table]
+        
+        upserted, deleted = self._merge(state, rows)
+        for row_id in deleted_ids:
+            if state.model.pop(row_id, None) is not None:
+                deleted.append(row_id)
+        
+        if upserted or deleted:
+            self.connector.invalidate_cache(table)
+        
+        return {"upserted": upserted, "deleted": deleted}
+    
+    @staticmethod
+    def _merge(state, rows):
+        """Merge fetched or received rows into the model of a tracked table
+        
+        Args:
+            state (TrackedTable): The tracked table
+            rows (list): Rows as returned by Supabase
+            
+        Returns:
+            tuple: (rows that are new or changed, IDs of rows moved out of
+                the tracked part of the table)
+        """
+        upserted = []
+        deleted = []
+        for row in rows:
+            row_id = row["id"]
+            if not matches_filters(row, state.filters):
+                # The row was moved out of the tracked part of the table
+                if state.model.pop(row_id, None) is not None:
+                    deleted.append(row_id)
+                continue
+            
+            # Keep only the columns a sync selects; change feeds deliver all
+            if state.columns:
+                selected = set(state.columns) | {"id", state.version_column}
+                row = {column: value for column, value in row.items() if column in selected}
+            
+            if state.model.get(row_id) != row:
+                state.model[row_id] = row
+                upserted.append(row)
+        return upserted, deleted
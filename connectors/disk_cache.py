@@ -0,0 +1,111 @@
+import contextlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+def default_cache_dir():
+    """Get the per-user cache directory of the application
+    
+    The SCHICHTPLANER_CACHE_DIR environment variable overrides the
+    platform default.
+    
+    Returns:
+        str: Path of the cache directory
+    """
+    if os.environ.get("SCHICHTPLANER_CACHE_DIR"):
+        return os.environ["SCHICHTPLANER_CACHE_DIR"]
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+        return os.path.join(base, "Schichtplaner", "Cache")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/Schichtplaner")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "schichtplaner")
+
+class DiskCache:
+    """Persistent store for the last fetched query results
+    
+    Results are kept as JSON in a SQLite file, so the application can render
+    them immediately on the next start before fresh data has arrived.
+    """
+    
+    def __init__(self, path=None):
+        """Initialize the disk cache
+        
+        Args:
+            path (str, optional): SQLite file, defaults to cache.sqlite3 in
+                the user's cache directory
+        """
+        if path is None:
+            cache_dir = default_cache_dir()
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, "cache.sqlite3")
+        
+        self.path = path
+        self._lock = threading.Lock()
+        
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " stored_at REAL NOT NULL)"
+            )
+    
+    @contextlib.contextmanager
+    def _connect(self):
+        """Open a connection to the cache file, committing on success"""
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _key(key):
+        """Serialize a cache key"""
+        return json.dumps(key, default=str)
+    
+    def get(self, key):
+        """Get a stored value
+        
+        Args:
+            key: Cache key (tuple of JSON-serializable values)
+            
+        Returns:
+            The stored value, or None if nothing is stored
+        """
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value FROM entries WHERE key = ?", (self._key(key),)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error reading disk cache: {str(e)}")
+            return None
+        return json.loads(row[0]) if row else None
+    
+    def set(self, key, value):
+        """Store a value, replacing any previous value for the key
+        
+        Args:
+            key: Cache key (tuple of JSON-serializable values)
+            value: JSON-serializable value
+        """
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, stored_at) VALUES (?, ?, ?)",
+                    (self._key(key), json.dumps(value, default=str), time.time())
+                )
+        except sqlite3.Error as e:
+            print(f"Error writing disk cache: {str(e)}")
+    
+    def clear(self):
+        """Remove all stored values"""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM entries")
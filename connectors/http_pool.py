@@ -0,0 +1,229 @@
+import importlib.util
+import os
+import threading
+import httpx
+
+# Maximum number of open connections to Supabase
+DEFAULT_POOL_SIZE = 10
+
+# Seconds an idle connection is kept open for reuse
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+
+# Seconds to wait for a response, and for a new connection
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_CONNECT_TIMEOUT = 10.0
+
+class HttpSettings:
+    """Connection pool, keep-alive and timeout settings of the HTTP client"""
+    
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, keepalive_connections=None,
+                 keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY, timeout=DEFAULT_TIMEOUT,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, http2=True):
+        """Initialize the settings
+        
+        Args:
+            pool_size (int): Maximum number of open connections
+            keepalive_connections (int, optional): Maximum number of idle
+                connections kept open, defaults to pool_size
+            keepalive_expiry (float): Seconds an idle connection is kept open;
+                0 disables keep-alive
+            timeout (float): Seconds to wait for reading, writing and a free
+                connection from the pool
+            connect_timeout (float): Seconds to wait for a new connection
+            http2 (bool): Use HTTP/2 when the h2 package is installed
+        """
+        self.pool_size = pool_size
+        self.keepalive_connections = pool_size if keepalive_connections is None else keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+    
+    @classmethod
+    def from_env(cls):
+        """Read the settings from environment variables
+        
+        SUPABASE_POOL_SIZE, SUPABASE_KEEPALIVE_CONNECTIONS,
+        SUPABASE_KEEPALIVE_EXPIRY, SUPABASE_TIMEOUT,
+        SUPABASE_CONNECT_TIMEOUT and SUPABASE_HTTP2 (0 to disable) override
+        the defaults.
+        
+        Returns:
+            HttpSettings: The settings
+        """
+        def number(name, default, convert=float):
+            value = os.environ.get(name)
+            return convert(value) if value else default
+        
+        keepalive_connections = os.environ.get("SUPABASE_KEEPALIVE_CONNECTIONS")
+        return cls(
+            pool_size=number("SUPABASE_POOL_SIZE", DEFAULT_POOL_SIZE, int),
+            keepalive_connections=int(keepalive_connections) if keepalive_connections else None,
+            keepalive_expiry=number("SUPABASE_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY),
+            timeout=number("SUPABASE_TIMEOUT", DEFAULT_TIMEOUT),
+            connect_timeout=number("SUPABASE_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT),
+            http2=os.environ.get("SUPABASE_HTTP2", "1") != "0",
+        )
+    
+    def limits(self):
+        """Get the httpx connection pool limits"""
+        return httpx.Limits(
+            max_connections=self.pool_size,
+            max_keepalive_connections=self.keepalive_connections if self.keepalive_expiry else 0,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+    
+    def timeouts(self):
+        """Get the httpx timeouts"""
+        return httpx.Timeout(self.timeout, connect=self.connect_timeout)
+
+class ConnectionStats:
+    """Counts new and reused connections of the requests sent in a session"""
+    
+    def __init__(self):
+        """Initialize the counters"""
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Set all counters to zero"""
+        with self._lock:
+            self.requests = 0
+            self.tcp_handshakes = 0
+            self.tls_handshakes = 0
+            self.reused_connections = 0
+            self.http2_requests = 0
+    
+    def record(self, trace):
+        """Count a finished request
+        
+        Args:
+            trace (RequestTrace): Events seen while sending the request
+        """
+        with self._lock:
+            self.requests += 1
+            self.http2_requests += trace.http2
+            if trace.tcp_handshake:
+                self.tcp_handshakes += 1
+            else:
+                self.reused_connections += 1
+            if trace.tls_handshake:
+                self.tls_handshakes += 1
+    
+    def snapshot(self):
+        """Get the current counters
+        
+        Returns:
+            dict: Counter name -> value
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "tcp_handshakes": self.tcp_handshakes,
+                "tls_handshakes": self.tls_handshakes,
+                "reused_connections": self.reused_connections,
+                "http2_requests": self.http2_requests,
+            }
+    
+    def summary(self):
+        """Describe the counters in one line, e.g. for logging"""
+        stats = self.snapshot()
+        reuse = stats["reused_connections"] / stats["requests"] if stats["requests"] else 0
+        return (
+            f"{stats['requests']} requests, {stats['tcp_handshakes']} new TCP connections, "
+            f"{stats['tls_handshakes']} TLS handshakes, {stats['reused_connections']} reused "
+            f"connections ({reuse:.0%}), {stats['http2_requests']} over HTTP/2"
+        )
+
+class RequestTrace:
+    """httpx trace extension recording the connection events of one request"""
+    
+    def __init__(self):
+        self.tcp_handshake = False
+        self.tls_handshake = False
+        self.http2 = False
+    
+    def __call__(self, event, info):
+        """Record a trace event, see the httpx "trace" request extension"""
+        if event == "connection.connect_tcp.complete":
+            self.tcp_handshake = True
+        elif event == "connection.start_tls.complete":
+            self.tls_handshake = True
+        elif event.startswith("http2.send_request_headers"):
+            self.http2 = True
+
+class AsyncRequestTrace(RequestTrace):
+    """RequestTrace for async clients, which await the trace callback"""
+    
+    async def __call__(self, event, info):
+        RequestTrace.__call__(self, event, info)
+
+class TracingTransport(httpx.HTTPTransport):
+    """HTTP transport counting new and reused connections in ConnectionStats"""
+    
+    def __init__(self, stats, **kwargs):
+        """Initialize the transport
+        
+        Args:
+            stats (ConnectionStats): Counters to update
+            **kwargs: Arguments for httpx.HTTPTransport
+        """
+        super().__init__(**kwargs)
+        self.stats = stats
+    
+    def handle_request(self, request):
+        trace = RequestTrace()
+        request.extensions["trace"] = trace
+        try:
+            return super().handle_request(request)
+        finally:
+            self.stats.record(trace)
+
+class AsyncTracingTransport(httpx.AsyncHTTPTransport):
+    """Async HTTP transport counting new and reused connections in ConnectionStats"""
+    
+    def __init__(self, stats, **kwargs):
+        """Initialize the transport
+        
+        Args:
+            stats (ConnectionStats): Counters to update
+            **kwargs: Arguments for httpx.AsyncHTTPTransport
+        """
+        super().__init__(**kwargs)
+        self.stats = stats
+    
+    async def handle_async_request(self, request):
+        trace = AsyncRequestTrace()
+        request.extensions["trace"] = trace
+        try:
+            return await super().handle_async_request(request)
+        finally:
+            self.stats.record(trace)
+
+def create_http_client(settings=None, stats=None):
+    """Create the pooled HTTP client used for all Supabase requests
+    
+    Args:
+        settings (HttpSettings, optional): Defaults to HttpSettings.from_env()
+        stats (ConnectionStats, optional): Counters updated by every request
+    
+    Returns:
+        httpx.Client: The client
+    """
+    settings = settings or HttpSettings.from_env()
+    transport = TracingTransport(stats or ConnectionStats(), limits=settings.limits(), http2=settings.http2)
+    return httpx.Client(transport=transport, timeout=settings.timeouts(), follow_redirects=True)
+
+def create_async_http_client(settings=None, stats=None):
+    """Create the pooled async HTTP client used for all Supabase requests
+    
+    Args:
+        settings (HttpSettings, optional): Defaults to HttpSettings.from_env()
+        stats (ConnectionStats, optional): Counters updated by every request
+    
+    Returns:
+        httpx.AsyncClient: The client
+    """
+    settings = settings or HttpSettings.from_env()
+    transport = AsyncTracingTransport(stats or ConnectionStats(), limits=settings.limits(), http2=settings.http2)
+    return httpx.AsyncClient(transport=transport, timeout=settings.timeouts(), follow_redirects=True)
@@ -0,0 +1,183 @@
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import Future
+import httpx
+from postgrest.exceptions import APIError
+
+# Attempts per request, including the first one
+DEFAULT_ATTEMPTS = 4
+
+# Seconds of the first backoff; each retry doubles it, up to the maximum
+DEFAULT_BASE_DELAY = 0.25
+DEFAULT_MAX_DELAY = 4.0
+
+# HTTP status codes and Postgres error codes worth retrying: gateway and
+# overload errors, serialization failures and deadlocks
+TRANSIENT_CODES = {"408", "429", "500", "502", "503", "504", "520", "40001", "40P01"}
+
+def is_transient(error):
+    """Check whether a failed request may succeed when sent again
+    
+    Args:
+        error (Exception): Error raised by a request
+    
+    Returns:
+        bool: True for network errors, timeouts and transient server errors
+    """
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, APIError):
+        return str(error.code) in TRANSIENT_CODES
+    return False
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for idempotent requests"""
+    
+    def __init__(self, attempts=DEFAULT_ATTEMPTS, base_delay=DEFAULT_BASE_DELAY,
+                 max_delay=DEFAULT_MAX_DELAY):
+        """Initialize the policy
+        
+        Args:
+            attempts (int): Attempts per request, including the first one
+            base_delay (float): Upper bound of the first backoff in seconds
+            max_delay (float): Upper bound of any backoff in seconds
+        """
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+    
+    def delay(self, retry):
+        """Get the backoff before a retry
+        
+        The delay is drawn uniformly up to the exponential bound, so clients
+        failing together do not retry in lockstep.
+        
+        Args:
+            retry (int): Number of the retry, starting at 0
+        
+        Returns:
+            float: Seconds to wait
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry))
+    
+    def call(self, func, is_retryable=is_transient, sleep=time.sleep):
+        """Call a function, retrying it on transient errors
+        
+        Only use this for idempotent requests: reads, and writes keyed by ID.
+        
+        Args:
+            func (function): Function sending the request
+            is_retryable (function): Decides whether an error is retried
+            sleep (function): Waits between attempts
+        
+        Returns:
+            The result of func
+        
+        Raises:
+            Exception: The last error, if every attempt failed or the error
+                is not retryable
+        """
+        for retry in range(self.attempts):
+            try:
+                return func()
+            except Exception as e:
+                if retry == self.attempts - 1 or not is_retryable(e):
+                    raise
+                print(f"Request failed, retrying: {str(e)}")
+                sleep(self.delay(retry))
+    
+    async def call_async(self, func, is_retryable=is_transient):
+        """Await a coroutine function, retrying it on transient errors
+        
+        Args:
+            func (function): Coroutine function sending the request
+            is_retryable (function): Decides whether an error is retried
+        
+        Returns:
+            The result of func
+        """
+        for retry in range(self.attempts):
+            try:
+                return await func()
+            except Exception as e:
+                if retry == self.attempts - 1 or not is_retryable(e):
+                    raise
+                print(f"Request failed, retrying: {str(e)}")
+                await asyncio.sleep(self.delay(retry))
+
+class RequestCoalescer:
+    """Shares one in-flight request between identical concurrent reads
+    
+    A caller asking for a key that is already being loaded waits for that
+    load instead of sending the same request again.
+    """
+    
+    def __init__(self):
+        """Initialize the coalescer"""
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        
+        # Number of reads served by another caller's request
+        self.coalesced = 0
+    
+    def run(self, key, loader):
+        """Load a value, or wait for the identical load already in flight
+        
+        Args:
+            key: Hashable identity of the read
+            loader (function): Sends the request
+        
+        Returns:
+            The loaded value
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+            else:
+                self.coalesced += 1
+        
+        if not owner:
+            return future.result()
+        
+        try:
+            future.set_result(loader())
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return future.result()
+
+class AsyncRequestCoalescer:
+    """RequestCoalescer for coroutines running on one event loop"""
+    
+    def __init__(self):
+        """Initialize the coalescer"""
+        self._in_flight = {}
+        self.coalesced = 0
+    
+    async def run(self, key, loader):
+        """Load a value, or wait for the identical load already in flight
+        
+        Args:
+            key: Hashable identity of the read
+            loader (function): Coroutine function sending the request
+        
+        Returns:
+            The loaded value
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+        
+        task = self._in_flight[key] = asyncio.ensure_future(loader())
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self._in_flight.get(key) is task:
+                del self._in_flight[key]
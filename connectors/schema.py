@@ -0,0 +1,77 @@
+"""Table and column definitions shared by the connectors
+
+Mirrors the Supabase schema in supabase.json. Views declare the columns they
+display so that the connectors only request those fields.
+"""
+
+# Columns of each table
+TABLE_COLUMNS = {
+    "abschnitte": (
+        "id", "updated_by_at", "abschnitt", "beschreibung", "uploaded", "created_at", "updated_at",
+    ),
+    "schichtzeiten": (
+        "id", "updated_by_at", "schicht", "zeit_von", "zeit_bis", "uploaded", "created_at", "updated_at",
+    ),
+    "arbeitsleiter": ("id", "name", "telefonnummer", "email"),
+    "baufuhrer": ("id", "name", "telefonnummer", "email"),
+    "personal": ("id", "name", "funktion", "telefonnummer", "firma", "email"),
+    "inventar": ("id", "maschine", "firma", "type"),
+    "schichtplanung": (
+        "id", "updated_by_at", "datum_von", "datum_bis", "schichtzeit", "abschnitt", "tatigkeit",
+        "baufuhrer", "arbeitsleiter", "baugruppe", "ako", "sc_1", "siwa_1", "siwa_2",
+        "logistikpersonal", "maschinisten", "personal_gbm", "gleisbaumaschine", "bagger",
+        "diverse_maschinen", "subunternehmer", "kommentare", "dateien", "dateien_link", "uploaded",
+        "titel",
+    ),
+}
+
+# Array-valued columns of each table
+ARRAY_COLUMNS = {
+    "schichtplanung": (
+        "baufuhrer", "arbeitsleiter", "baugruppe", "ako", "sc_1", "siwa_1", "siwa_2",
+        "logistikpersonal", "maschinisten", "personal_gbm", "gleisbaumaschine", "bagger",
+        "diverse_maschinen", "subunternehmer",
+    ),
+}
+
+# Array columns of schichtplanung naming the people working a shift; their
+# lengths add up to the headcount
+PERSONNEL_COLUMNS = (
+    "baufuhrer", "arbeitsleiter", "ako", "sc_1", "siwa_1", "siwa_2", "logistikpersonal",
+    "maschinisten", "personal_gbm",
+)
+
+# Array columns of schichtplanung naming the machines (inventar.maschine) of a shift
+MACHINE_COLUMNS = ("gleisbaumaschine", "bagger", "diverse_maschinen")
+
+# Columns needed to build the dropdown lists, per base table
+DROPDOWN_COLUMNS = {
+    "abschnitte": ("abschnitt",),
+    "baufuhrer": ("name",),
+    "arbeitsleiter": ("name",),
+    "schichtzeiten": ("schicht",),
+    "personal": ("name", "funktion"),
+    "inventar": ("maschine", "type"),
+}
+
+# Base tables the dropdown data is derived from
+DROPDOWN_TABLES = tuple(DROPDOWN_COLUMNS)
+
+# Columns written by the add and update methods of the connectors, in the
+# order of their arguments
+EDITABLE_COLUMNS = {
+    "abschnitte": ("abschnitt", "beschreibung"),
+    "schichtzeiten": ("schicht", "zeit_von", "zeit_bis"),
+    "arbeitsleiter": ("name", "telefonnummer", "email"),
+    "baufuhrer": ("name", "telefonnummer", "email"),
+    "personal": ("name", "funktion", "telefonnummer", "email"),
+    "inventar": ("maschine", "firma", "type"),
+}
+
+# Column holding the last modification time of each row, set by the
+# database triggers in sql/version_triggers.sql
+VERSION_COLUMNS = {
+    "abschnitte": "updated_at",
+    "schichtzeiten": "updated_at",
+    "schichtplanung": "updated_by_at",
+}
@@ -0,0 +1,692 @@
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import uuid
+
+from connectors.disk_cache import default_cache_dir
+from connectors.schema import (
+    ARRAY_COLUMNS, DROPDOWN_COLUMNS, MACHINE_COLUMNS, PERSONNEL_COLUMNS, TABLE_COLUMNS, VERSION_COLUMNS,
+)
+from connectors.supabase_connector import (
+    BaseSupabaseConnector, PAGE_SIZE, INSERT_CHUNK_SIZE, UPSERT_CHUNK_SIZE, DELETE_CHUNK_SIZE,
+    shift_filters, make_record,
+)
+
+# Schema exported from Supabase, used to create the local tables
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "supabase.json")
+
+# SQLite column types for the Postgres types in supabase.json; arrays are
+# stored as JSON text
+SQLITE_TYPES = {
+    "uuid": "TEXT",
+    "text": "TEXT",
+    "character varying": "TEXT",
+    "boolean": "INTEGER",
+    "timestamp with time zone": "TEXT",
+    "time without time zone": "TEXT",
+    "ARRAY": "TEXT",
+}
+
+# Indexes for the shift queries: date windows with keyset pagination, and
+# the Abschnitt filter
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS schichtplanung_datum_von ON schichtplanung (datum_von, id)",
+    "CREATE INDEX IF NOT EXISTS schichtplanung_abschnitt ON schichtplanung (abschnitt)",
+)
+
+# SQL operators of the filter tuples built by shift_filters
+OPERATORS = {"eq": "=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+def load_schema(path=SCHEMA_FILE):
+    """Read the table definitions from the exported Supabase schema
+    
+    Tables and columns the application uses but the export lacks (see
+    TABLE_COLUMNS) are added as text columns.
+    
+    Args:
+        path (str): Path of supabase.json
+    
+    Returns:
+        dict: Table name -> list of (column name, SQLite type)
+    """
+    with open(path, encoding="utf-8") as f:
+        exported = json.load(f)[0]["schema_info"]
+    
+    tables = {
+        table["table_name"]: [
+            (column["column_name"], SQLITE_TYPES.get(column["data_type"], "TEXT"))
+            for column in table["columns"]
+        ]
+        for table in exported
+    }
+    for table, columns in TABLE_COLUMNS.items():
+        known = {name for name, _ in tables.setdefault(table, [])}
+        tables[table].extend((name, "TEXT") for name in columns if name not in known)
+    return tables
+
+def version_stamp():
+    """Get the current time as written by the triggers in sql/version_triggers.sql"""
+    return datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+class SqliteConnector(BaseSupabaseConnector):
+    """Connector storing all tables in a local SQLite file
+    
+    Offers the same methods as SupabaseConnector, for sites without network
+    access, for testing and for benchmarking the UI without network
+    latency. Array columns are stored as JSON, and the version columns are
+    stamped on every write like the Supabase triggers do.
+    """
+    
+    def __init__(self, path=None, schema_path=SCHEMA_FILE):
+        """Initialize the connector and create missing tables
+        
+        Args:
+            path (str, optional): SQLite file, defaults to the
+                SCHICHTPLANER_SQLITE_PATH environment variable or
+                schichtplaner.sqlite3 in the user's cache directory
+            schema_path (str): Path of supabase.json
+        """
+        super().__init__(None)
+        
+        # Reads are local, so there is nothing to serve from the disk cache
+        self.disk_cache = None
+        
+        if path is None:
+            path = os.environ.get("SCHICHTPLANER_SQLITE_PATH")
+        if path is None:
+            cache_dir = default_cache_dir()
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, "schichtplaner.sqlite3")
+        self.path = path
+        
+        # One connection per worker thread
+        self._local = threading.local()
+        
+        schema = load_schema(schema_path)
+        self.column_types = {table: dict(columns) for table, columns in schema.items()}
+        
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for table, columns in schema.items():
+                definitions = ", ".join(
+                    f"{name} {sql_type} PRIMARY KEY" if name == "id" else f"{name} {sql_type}"
+                    for name, sql_type in columns
+                )
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({definitions})")
+                
+                # Add columns missing in a file created by an older version
+                existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                for name, sql_type in columns:
+                    if name not in existing:
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {sql_type}")
+            for statement in INDEXES:
+                conn.execute(statement)
+    
+    def _connection(self):
+        """Get the connection of the calling thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+        return conn
+    
+    def _query(self, table, sql, params=()):
+        """Run a query and convert the rows like PostgREST returns them
+        
+        Args:
+            table (str): Table the query reads from
+            sql (str): SQL statement
+            params (tuple): Parameters of the statement
+        
+        Returns:
+            list: Row dicts with decoded arrays and booleans
+        """
+        self.round_trips += 1
+        rows = self._connection().execute(sql, params).fetchall()
+        return [self._decode(table, dict(row)) for row in rows]
+    
+    def _decode(self, table, row):
+        """Decode the values stored for array and boolean columns of a row"""
+        types = self.column_types[table]
+        for column, value in row.items():
+            if value is None:
+                continue
+            if column in ARRAY_COLUMNS.get(table, ()):
+                row[column] = json.loads(value)
+            elif types.get(column) == "INTEGER":
+                row[column] = bool(value)
+        return row
+    
+    def _encode(self, table, record):
+        """Convert a record into column values for SQLite
+        
+        Unknown columns are rejected like PostgREST does, arrays are
+        encoded as JSON and date-only timestamps get a time.
+        
+        Args:
+            table (str): Table name
+            record (dict): Column -> value
+        
+        Returns:
+            dict: Column -> SQLite value
+        """
+        encoded = {}
+        for column, value in record.items():
+            if column not in self.column_types[table]:
+                raise ValueError(f"Column '{column}' of table '{table}' does not exist")
+            if column in ARRAY_COLUMNS.get(table, ()) and value is not None:
+                value = json.dumps(value if isinstance(value, list) else [value])
+            elif column in ("datum_von", "datum_bis") and isinstance(value, str) and len(value) == 10:
+                value = f"{value}T00:00:00+00:00"
+            elif isinstance(value, bool):
+                value = int(value)
+            encoded[column] = value
+        
+        version_column = VERSION_COLUMNS.get(table)
+        if version_column:
+            encoded[version_column] = version_stamp()
+        return encoded
+    
+    @staticmethod
+    def _select_clause(columns, required=()):
+        """Build the column list of a SELECT, like select_clause"""
+        if not columns:
+            return "*"
+        return ", ".join(list(columns) + [c for c in required if c not in columns])
+    
+    @staticmethod
+    def _where(filters):
+        """Build the WHERE condition for (operator, column, value) filter tuples
+        
+        Returns:
+            tuple: (SQL condition, parameters)
+        """
+        conditions = []
+        params = []
+        for operator, column, value in filters:
+            if operator == "cs":
+                # The JSON array must contain every value
+                for element in value:
+                    conditions.append(f"EXISTS (SELECT 1 FROM json_each({column}) WHERE value = ?)")
+                    params.append(element)
+            else:
+                conditions.append(f"{column} {OPERATORS[operator]} ?")
+                params.append(value)
+        return " AND ".join(conditions) or "1", params
+    
+    def _insert(self, table, records, upsert=False):
+        """Insert or upsert records in one transaction
+        
+        Args:
+            table (str): Table name
+            records (list): Row dicts, all with the same keys
+            upsert (bool): Merge into existing rows with the same id
+        
+        Returns:
+            list: The written rows
+        """
+        if not records:
+            return []
+        
+        encoded = [self._encode(table, dict(record)) for record in records]
+        for record in encoded:
+            record.setdefault("id", str(uuid.uuid4()))
+        names = list(encoded[0])
+        
+        sql = f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+        if upsert:
+            updates = ", ".join(f"{name} = excluded.{name}" for name in names if name != "id")
+            sql += f" ON CONFLICT (id) DO UPDATE SET {updates}" if updates else " ON CONFLICT (id) DO NOTHING"
+        
+        conn = self._connection()
+        try:
+            with conn:
+                self.round_trips += 1
+                conn.executemany(sql, [tuple(record[name] for name in names) for record in encoded])
+        finally:
+            self.cache.invalidate(table)
+        return self.get_by_ids(table, [record["id"] for record in encoded])
+    
+    def _update(self, table, id, record):
+        """Update one row by id
+        
+        Returns:
+            list: The updated row, empty if the id does not exist
+        """
+        encoded = self._encode(table, record)
+        assignments = ", ".join(f"{name} = ?" for name in encoded)
+        conn = self._connection()
+        try:
+            with conn:
+                self.round_trips += 1
+                conn.execute(f"UPDATE {table} SET {assignments} WHERE id = ?", (*encoded.values(), id))
+        finally:
+            self.cache.invalidate(table)
+        return self.get_by_ids(table, [id])
+    
+    def _update_if_unchanged(self, table, rows, base_versions):
+        """Update rows whose version column still holds the base version
+        
+        All rows are updated in one transaction; rows without a base
+        version are updated by ID only. Missing rows are conflicts.
+        
+        Returns:
+            tuple: (IDs of the updated rows, IDs of the conflicting rows)
+        """
+        version_column = VERSION_COLUMNS[table]
+        updated = []
+        conflicting = []
+        conn = self._connection()
+        try:
+            with conn:
+                for row in rows:
+                    encoded = self._encode(table, row)
+                    assignments = ", ".join(f"{name} = ?" for name in encoded)
+                    if row["id"] not in base_versions:
+                        cursor = conn.execute(
+                            f"UPDATE {table} SET {assignments} WHERE id = ?", (*encoded.values(), row["id"])
+                        )
+                    else:
+                        cursor = conn.execute(
+                            f"UPDATE {table} SET {assignments} WHERE id = ? AND {version_column} IS ?",
+                            (*encoded.values(), row["id"], base_versions[row["id"]])
+                        )
+                    (updated if cursor.rowcount else conflicting).append(row["id"])
+                self.round_trips += 1
+        finally:
+            self.cache.invalidate(table)
+        return updated, conflicting
+    
+    def _delete(self, table, ids):
+        """Delete rows by id in one transaction"""
+        conn = self._connection()
+        try:
+            with conn:
+                for start in range(0, len(ids), DELETE_CHUNK_SIZE):
+                    chunk = list(ids[start:start + DELETE_CHUNK_SIZE])
+                    self.round_trips += 1
+                    conn.execute(f"DELETE FROM {table} WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+        finally:
+            self.cache.invalidate(table)
+    
+    def _select(self, table, columns=None):
+        """Select all rows of a table, served from the cache when possible"""
+        select = self._select_clause(columns)
+        return self.cache.get_or_load(
+            (table,), (table, select),
+            lambda: self._query(table, f"SELECT {select} FROM {table}")
+        )
+    
+    # --- DROPDOWN DATA METHODS ---
+    
+    def get_dropdown_data(self):
+        """Get all dropdown data from the local tables
+        
+        Returns:
+            dict: Dictionary with all dropdown data
+        """
+        return self.build_dropdown_data({
+            table: self._select(table, columns)
+            for table, columns in DROPDOWN_COLUMNS.items()
+        })
+    
+    # --- GENERIC READ METHODS ---
+    
+    def get_rows(self, table, columns=None):
+        """Get all rows of a table
+        
+        Args:
+            table (str): Table name
+            columns (list, optional): Columns to select, all if not given
+        
+        Returns:
+            list: The rows
+        """
+        return self._select(table, columns)
+    
+    def get_changed_rows(self, table, version_column, since=None, columns=None, filters=None,
+                         batch_size=PAGE_SIZE):
+        """Get the rows modified at or after a version
+        
+        See SupabaseConnector.get_changed_rows.
+        
+        Returns:
+            list: The changed rows, ordered by version
+        """
+        select = self._select_clause(columns, required=("id", version_column))
+        where, params = self._where(list(filters or []))
+        if since:
+            where += f" AND {version_column} >= ?"
+            params.append(since)
+        return self._query(
+            table,
+            f"SELECT {select} FROM {table} WHERE {where}"
+            f" ORDER BY {version_column} IS NULL, {version_column}, id",
+            params
+        )
+    
+    def get_ids(self, table, filters=None, batch_size=PAGE_SIZE):
+        """Get the IDs of all rows of a table
+        
+        Args:
+            table (str): Table name
+            filters (list, optional): Filter tuples
+            batch_size (int): Unused, for compatibility with SupabaseConnector
+        
+        Returns:
+            set: The IDs
+        """
+        where, params = self._where(filters or [])
+        return {row["id"] for row in self._query(table, f"SELECT id FROM {table} WHERE {where}", params)}
+    
+    def get_by_ids(self, table, ids, columns=None, chunk_size=DELETE_CHUNK_SIZE):
+        """Get the rows with the given IDs
+        
+        See SupabaseConnector.get_by_ids.
+        
+        Returns:
+            list: The rows found
+        """
+        select = self._select_clause(columns, required=("id",))
+        rows = []
+        for start in range(0, len(ids), chunk_size):
+            chunk = list(ids[start:start + chunk_size])
+            rows.extend(self._query(
+                table, f"SELECT {select} FROM {table} WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+        return rows
+    
+    # --- BULK METHODS ---
+    
+    def upsert_many(self, table, rows, chunk_size=UPSERT_CHUNK_SIZE):
+        """Insert or update several rows of a table in one transaction
+        
+        See SupabaseConnector.upsert_many.
+        
+        Returns:
+            list: The upserted rows
+        """
+        return self._insert(table, rows, upsert=True)
+    
+    def delete_many(self, table, ids, chunk_size=DELETE_CHUNK_SIZE):
+        """Delete several rows of a table by ID in one transaction
+        
+        Args:
+            table (str): Table name
+            ids (list): IDs of the rows to delete
+            chunk_size (int): Unused, for compatibility with SupabaseConnector
+        """
+        self._delete(table, ids)
+    
+    def update_if_unchanged(self, table, rows, base_versions, chunk_size=UPSERT_CHUNK_SIZE):
+        """Update rows unless others changed them since they were loaded
+        
+        See SupabaseConnector.update_if_unchanged; all rows are updated in
+        one transaction.
+        
+        Returns:
+            dict: "updated", "conflicts", "failed", "error" and "transient"
+        """
+        try:
+            updated, conflicting = self._update_if_unchanged(table, rows, base_versions)
+            return self._update_report(
+                rows, self.get_by_ids(table, updated), conflicting, self.get_by_ids(table, conflicting)
+            )
+        except Exception as e:
+            return self._update_report(rows, [], [], [], rows, e)
+    
+    # --- AGGREGATE METHODS ---
+    
+    def get_shift_counts(self, date_from=None, date_to=None):
+        """Get the aggregates of the shifts in a date window
+        
+        See SupabaseConnector.get_shift_counts; computed with the same
+        queries as sql/get_shift_counts.sql.
+        
+        Returns:
+            dict: "shifts", "shifts_per_day", "headcount_per_schichtzeit" and
+                "machine_days_per_type"
+        """
+        where, params = self._where(shift_filters(date_from, date_to))
+        shifts = f"SELECT * FROM schichtplanung WHERE {where}"
+        headcount = " + ".join(f"COALESCE(json_array_length({column}), 0)" for column in PERSONNEL_COLUMNS)
+        machines = " UNION ALL ".join(
+            f"SELECT substr(s.datum_von, 1, 10) AS datum, m.value AS maschine "
+            f"FROM ({shifts}) s, json_each(COALESCE(s.{column}, '[]')) m"
+            for column in MACHINE_COLUMNS
+        )
+        
+        return {
+            "shifts": self._query("schichtplanung", f"SELECT COUNT(*) AS n FROM ({shifts})", params)[0]["n"],
+            "shifts_per_day": self._query(
+                "schichtplanung",
+                f"SELECT substr(datum_von, 1, 10) AS datum, abschnitt, COUNT(*) AS shifts FROM ({shifts}) "
+                f"GROUP BY 1, 2 ORDER BY 1, 2",
+                params
+            ),
+            "headcount_per_schichtzeit": self._query(
+                "schichtplanung",
+                f"SELECT schichtzeit, SUM({headcount}) AS headcount FROM ({shifts}) GROUP BY 1 ORDER BY 1",
+                params
+            ),
+            "machine_days_per_type": self._query(
+                "inventar",
+                f"SELECT i.type, COUNT(DISTINCT m.datum || '|' || m.maschine) AS machine_days "
+                f"FROM ({machines}) m JOIN inventar i ON i.maschine = m.maschine GROUP BY 1 ORDER BY 1",
+                params * len(MACHINE_COLUMNS)
+            ),
+        }
+    
+    # --- SHIFTS METHODS ---
+    
+    def get_schichtplanung(self, date_from=None, date_to=None, abschnitt=None, columns=None, contains=None):
+        """Get shift planning data
+        
+        See SupabaseConnector.get_schichtplanung.
+        
+        Returns:
+            list: The matching shift rows
+        """
+        rows = []
+        for batch in self.iter_schichtplanung(date_from, date_to, abschnitt, columns, contains):
+            rows.extend(batch)
+        return rows
+    
+    def iter_schichtplanung(self, date_from=None, date_to=None, abschnitt=None, columns=None,
+                            contains=None, batch_size=PAGE_SIZE):
+        """Iterate over the shift planning data in batches
+        
+        Uses the same keyset pagination on (datum_von, id) as
+        SupabaseConnector.iter_schichtplanung, served by the datum_von index.
+        
+        Yields:
+            list: The next batch of shift rows
+        """
+        select = self._select_clause(columns, required=("id", "datum_von"))
+        where, params = self._where(shift_filters(date_from, date_to, abschnitt, contains))
+        
+        # Shifts without a date can never match a date window
+        if date_from or date_to:
+            where += " AND datum_von IS NOT NULL"
+        
+        # Shifts without a date come last, ordered by id
+        last = None
+        while True:
+            keyset = ""
+            keyset_params = []
+            if last and last["datum_von"] is not None:
+                keyset = " AND (datum_von IS NULL OR datum_von > ? OR (datum_von = ? AND id > ?))"
+                keyset_params = [last["datum_von"], last["datum_von"], last["id"]]
+            elif last:
+                keyset = " AND datum_von IS NULL AND id > ?"
+                keyset_params = [last["id"]]
+            rows = self._query(
+                "schichtplanung",
+                f"SELECT {select} FROM schichtplanung WHERE {where}{keyset}"
+                f" ORDER BY datum_von IS NULL, datum_von, id LIMIT ?",
+                params + keyset_params + [batch_size]
+            )
+            if rows:
+                yield rows
+            if len(rows) < batch_size:
+                return
+            last = rows[-1]
+    
+    def add_schichtplanung(self, data):
+        """Add new shift planning
+        
+        Args:
+            data (dict): Shift planning data
+        
+        Returns:
+            list: The inserted data
+        """
+        return self._insert("schichtplanung", [data])
+    
+    def add_schichtplanung_many(self, rows, chunk_size=INSERT_CHUNK_SIZE):
+        """Add several shifts in one transaction
+        
+        See SupabaseConnector.add_schichtplanung_many; either all rows are
+        inserted or none.
+        
+        Returns:
+            list: One outcome dict per row, in input order
+        """
+        rows = [row if row.get("id") else dict(row, id=str(uuid.uuid4())) for row in rows]
+        try:
+            inserted = {row["id"]: row for row in self._insert("schichtplanung", rows)}
+        except Exception as e:
+            return [{"status": "failed", "data": None, "error": str(e), "transient": False} for _ in rows]
+        return [{"status": "inserted", "data": inserted[row["id"]], "error": None} for row in rows]
+    
+    def update_schichtplanung(self, id, data, base_version=None):
+        """Update shift planning
+        
+        See SupabaseConnector.update_schichtplanung.
+        
+        Returns:
+            list: The updated data, empty if the shift was changed or
+                deleted by others
+        """
+        if base_version is None:
+            return self._update("schichtplanung", id, data)
+        updated, _ = self._update_if_unchanged("schichtplanung", [dict(data, id=id)], {id: base_version})
+        return self.get_by_ids("schichtplanung", updated)
+    
+    def delete_schichtplanung(self, id):
+        """Delete shift planning
+        
+        Args:
+            id (str): ID of the shift to delete
+        """
+        self._delete("schichtplanung", [id])
+    
+    # --- ABSCHNITTE METHODS ---
+    
+    def get_abschnitte(self, columns=None):
+        """Get all abschnitte"""
+        return self._select("abschnitte", columns)
+    
+    def add_abschnitt(self, abschnitt, beschreibung=""):
+        """Add new abschnitt"""
+        return self._insert("abschnitte", [make_record("abschnitte", abschnitt, beschreibung)])
+    
+    def update_abschnitt(self, id, abschnitt, beschreibung=""):
+        """Update an abschnitt"""
+        return self._update("abschnitte", id, make_record("abschnitte", abschnitt, beschreibung))
+    
+    def delete_abschnitt(self, id):
+        """Delete an abschnitt"""
+        self._delete("abschnitte", [id])
+    
+    # --- SCHICHTZEITEN METHODS ---
+    
+    def get_schichtzeiten(self, columns=None):
+        """Get all schichtzeiten"""
+        return self._select("schichtzeiten", columns)
+    
+    def add_schichtzeit(self, schicht, zeit_von, zeit_bis):
+        """Add new schichtzeit"""
+        return self._insert("schichtzeiten", [make_record("schichtzeiten", schicht, zeit_von, zeit_bis)])
+    
+    def update_schichtzeit(self, id, schicht, zeit_von, zeit_bis):
+        """Update a schichtzeit"""
+        return self._update("schichtzeiten", id, make_record("schichtzeiten", schicht, zeit_von, zeit_bis))
+    
+    def delete_schichtzeit(self, id):
+        """Delete a schichtzeit"""
+        self._delete("schichtzeiten", [id])
+    
+    # --- ARBEITSLEITER METHODS ---
+    
+    def get_arbeitsleiter(self, columns=None):
+        """Get all arbeitsleiter"""
+        return self._select("arbeitsleiter", columns)
+    
+    def add_arbeitsleiter(self, name, telefonnummer="", email=""):
+        """Add new arbeitsleiter"""
+        return self._insert("arbeitsleiter", [make_record("arbeitsleiter", name, telefonnummer, email)])
+    
+    def update_arbeitsleiter(self, id, name, telefonnummer="", email=""):
+        """Update an arbeitsleiter"""
+        return self._update("arbeitsleiter", id, make_record("arbeitsleiter", name, telefonnummer, email))
+    
+    def delete_arbeitsleiter(self, id):
+        """Delete an arbeitsleiter"""
+        self._delete("arbeitsleiter", [id])
+    
+    # --- BAUFÜHRER METHODS ---
+    
+    def get_baufuhrer(self, columns=None):
+        """Get all bauführer"""
+        return self._select("baufuhrer", columns)
+    
+    def add_baufuhrer(self, name, telefonnummer="", email=""):
+        """Add new bauführer"""
+        return self._insert("baufuhrer", [make_record("baufuhrer", name, telefonnummer, email)])
+    
+    def update_baufuhrer(self, id, name, telefonnummer="", email=""):
+        """Update a bauführer"""
+        return self._update("baufuhrer", id, make_record("baufuhrer", name, telefonnummer, email))
+    
+    def delete_baufuhrer(self, id):
+        """Delete a bauführer"""
+        self._delete("baufuhrer", [id])
+    
+    # --- PERSONAL METHODS ---
+    
+    def get_personal(self, columns=None):
+        """Get all personnel"""
+        return self._select("personal", columns)
+    
+    def add_personal(self, name, funktion="", telefonnummer="", email=""):
+        """Add new personnel"""
+        return self._insert("personal", [make_record("personal", name, funktion, telefonnummer, email)])
+    
+    def update_personal(self, id, name, funktion="", telefonnummer="", email=""):
+        """Update personnel"""
+        return self._update("personal", id, make_record("personal", name, funktion, telefonnummer, email))
+    
+    def delete_personal(self, id):
+        """Delete personnel"""
+        self._delete("personal", [id])
+    
+    # --- INVENTAR METHODS ---
+    
+    def get_inventar(self, columns=None):
+        """Get all inventar"""
+        return self._select("inventar", columns)
+    
+    def add_inventar(self, maschine, firma="", type=""):
+        """Add new inventar"""
+        return self._insert("inventar", [make_record("inventar", maschine, firma, type)])
+    
+    def update_inventar(self, id, maschine, firma="", type=""):
+        """Update inventar"""
+        return self._update("inventar", id, make_record("inventar", maschine, firma, type))
+    
+    def delete_inventar(self, id):
+        """Delete inventar"""
+        self._delete("inventar", [id])
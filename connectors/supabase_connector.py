@@ -1,93 +1,887 @@
 import os
-from supabase import create_client, Client
+import contextlib
+import datetime
+import json
+from supabase import create_client, Client, ClientOptions
 
-class SupabaseConnector:
+from connectors.cache import TableCache
+from connectors.disk_cache import DiskCache
+from connectors.http_pool import ConnectionStats, create_http_client
+from connectors.resilience import RetryPolicy, RequestCoalescer, is_transient
+from connectors.schema import DROPDOWN_COLUMNS, DROPDOWN_TABLES, EDITABLE_COLUMNS, VERSION_COLUMNS
+
+# Rows per page when paginating; must stay below the PostgREST max-rows limit
+PAGE_SIZE = 500
+
+# Disk cache key of the last loaded shift window
+SHIFT_WINDOW_KEY = ("schichtplanung", "window")
+
+# Rows per bulk insert request
+INSERT_CHUNK_SIZE = 500
+
+# Rows per bulk upsert request
+UPSERT_CHUNK_SIZE = 500
+
+# IDs per bulk delete request; the IDs are sent in the URL, so keep it short
+DELETE_CHUNK_SIZE = 100
+
+
+def select_clause(columns, required=()):
+    """Build the select parameter for a list of columns
+    
+    Args:
+        columns (list): Column names, or None for all columns
+        required (tuple): Columns that must always be selected
+        
+    Returns:
+        str: The select clause
+    """
+    if not columns:
+        return "*"
+    return ",".join(list(columns) + [c for c in required if c not in columns])
+
+
+def shift_filters(date_from=None, date_to=None, abschnitt=None, contains=None):
+    """Build the filter list for a shift query
+    
+    Filters are (operator, column, value) tuples understood by apply_filters.
+    
+    Args:
+        date_from (date|str, optional): First day (inclusive) of datum_von
+        date_to (date|str, optional): Last day (inclusive) of datum_von
+        abschnitt (str, optional): Only shifts of this Abschnitt
+        contains (dict, optional): Array column -> values the array must contain
+        
+    Returns:
+        list: Filter tuples
+    """
+    filters = []
+    if date_from:
+        filters.append(("gte", "datum_von", _as_date(date_from).isoformat()))
+    if date_to:
+        # datum_von is a timestamp, so compare against the start of the next day
+        next_day = _as_date(date_to) + datetime.timedelta(days=1)
+        filters.append(("lt", "datum_von", next_day.isoformat()))
+    if abschnitt:
+        filters.append(("eq", "abschnitt", abschnitt))
+    for column, values in (contains or {}).items():
+        if values:
+            filters.append(("cs", column, list(values)))
+    return filters
+
+
+def apply_filters(query, filters):
+    """Apply (operator, column, value) filter tuples to a PostgREST query
+    
+    Args:
+        query: PostgREST request builder
+        filters (list): Filter tuples
+        
+    Returns:
+        The filtered request builder
+    """
+    for operator, column, value in filters:
+        if operator == "cs":
+            # Quote the elements so names containing commas or spaces are matched exactly
+            elements = ",".join('"' + str(v).replace('\\', '\\\\').replace('"', '\\"') + '"' for v in value)
+            query = query.filter(column, "cs", "{" + elements + "}")
+        else:
+            query = getattr(query, operator)(column, value)
+    return query
+
+
+def matches_filters(row, filters):
+    """Check whether a row satisfies (operator, column, value) filter tuples
+    
+    Evaluates the same filters as apply_filters on a row in memory.
+    
+    Args:
+        row (dict): Row as returned by Supabase
+        filters (list): Filter tuples
+        
+    Returns:
+        bool: True if the row matches all filters
+    """
+    for operator, column, value in filters:
+        cell = row.get(column)
+        if operator == "cs":
+            if not set(value) <= set(cell or []):
+                return False
+        elif operator == "eq":
+            if cell != value:
+                return False
+        elif cell is None:
+            return False
+        elif operator in ("gt", "gte", "lt", "lte"):
+            # ISO dates and timestamps compare correctly as strings
+            cell, value = str(cell), str(value)
+            if not {"gt": cell > value, "gte": cell >= value,
+                    "lt": cell < value, "lte": cell <= value}[operator]:
+                return False
+    return True
+
+
+def keyset_condition(order_column, last):
+    """Build the or-filter selecting the rows after the last row of a page
+    
+    Args:
+        order_column (str): Column the pages are ordered by, before id
+        last (dict): Last row of the previous page
+        
+    Returns:
+        str: Condition for the PostgREST or filter
+    """
+    value = last[order_column]
+    return f'{order_column}.gt."{value}",and({order_column}.eq."{value}",id.gt.{last["id"]})'
+
+
+def make_record(table, *values):
+    """Build the record written by the add and update methods of a table
+    
+    Args:
+        table (str): Table name
+        *values: Values in the order of EDITABLE_COLUMNS[table]
+        
+    Returns:
+        dict: Column -> value
+    """
+    return dict(zip(EDITABLE_COLUMNS[table], values))
+
+
+def supabase_credentials():
+    """Get the Supabase URL and key from the environment
+    
+    Returns:
+        tuple: (url, key)
+        
+    Raises:
+        ValueError: If either variable is not set
+    """
+    url = os.environ.get("SUPABASE_URL")
+    key = os.environ.get("SUPABASE_KEY")
+    
+    if not url or not key:
+        raise ValueError("SUPABASE_URL and SUPABASE_KEY environment variables must be set")
+    return url, key
+
+
+def _as_date(value):
+    """Convert an ISO string or datetime to a date"""
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value[:10])
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    return value
+
+class BaseSupabaseConnector:
+    """State and helpers shared by the sync and async Supabase connectors
+    
+    Everything here is independent of how requests are sent, so both
+    connectors use the same caches, query building and row processing.
+    """
+    
+    def __init__(self, client, connection_stats=None):
+        """Initialize the shared connector state
+        
+        Args:
+            client: Supabase client, sync or async
+            connection_stats (ConnectionStats, optional): Counters updated by
+                the HTTP client of the Supabase client
+        """
+        self.supabase = client
+        
+        # New and reused connections of this session, see connection_report
+        self.connection_stats = connection_stats or ConnectionStats()
+        
+        # Optional database function returning all dropdown tables at once
+        self.dropdown_rpc = os.environ.get("SUPABASE_DROPDOWN_RPC")
+        
+        # Optional database function applying conditional updates in bulk
+        self.update_rpc = os.environ.get("SUPABASE_UPDATE_RPC")
+        
+        # Optional database function aggregating the shifts
+        self.counts_rpc = os.environ.get("SUPABASE_COUNTS_RPC")
+        
+        # Number of requests sent to Supabase, used for benchmarking
+        self.round_trips = 0
+        
+        # Backoff for reads and ID-keyed writes failing on a flaky network
+        self.retry_policy = RetryPolicy()
+        
+        # Cache for master data; writes through this connector invalidate it
+        self.cache = TableCache()
+        
+        # Last fetched results on disk, served while stale reads are enabled
+        try:
+            self.disk_cache = DiskCache()
+        except Exception as e:
+            print(f"Disk cache not available: {str(e)}")
+            self.disk_cache = None
+        self.stale_reads = False
+        self.stale_results_served = 0
+    
+    @contextlib.contextmanager
+    def serve_stale(self):
+        """Serve reads from the disk cache while the context is active
+        
+        Used at startup to render the last fetched data immediately. Reads
+        without a persisted result still go to Supabase.
+        """
+        self.stale_reads = True
+        self.stale_results_served = 0
+        try:
+            yield
+        finally:
+            self.stale_reads = False
+    
+    def _read_persisted(self, key):
+        """Get a persisted result from the disk cache, or None"""
+        if self.disk_cache is None:
+            return None
+        value = self.disk_cache.get(key)
+        if value is not None:
+            self.stale_results_served += 1
+        return value
+    
+    def _persist(self, key, value):
+        """Store a fetched result in the disk cache and return it"""
+        if self.disk_cache is not None:
+            self.disk_cache.set(key, value)
+        return value
+    
+    def invalidate_cache(self, table=None):
+        """Drop cached master data so the next read fetches it again
+        
+        Args:
+            table (str, optional): Only drop this table; all if not given
+        """
+        self.cache.invalidate(table)
+    
+    def connection_report(self):
+        """Describe how many requests of this session needed a new connection
+        
+        Returns:
+            str: Requests, new TCP connections, TLS handshakes and reused
+                connections
+        """
+        return self.connection_stats.summary()
+    
+    def _shift_window(self, select, filters):
+        """Get the identity of a shift query as stored in the disk cache
+        
+        Compared in its stored JSON form, where tuples become lists.
+        """
+        return json.loads(json.dumps([select, filters]))
+    
+    def _read_persisted_window(self, window):
+        """Get the persisted rows of the last loaded shift window, or None
+        
+        Args:
+            window: Identity of the requested window, see _shift_window
+        """
+        persisted = self._read_persisted(SHIFT_WINDOW_KEY)
+        if persisted and persisted["window"] == window:
+            return persisted["rows"]
+        return None
+    
+    @staticmethod
+    def _rpc_tables(result):
+        """Split the result of the dropdown RPC into rows per base table"""
+        if not isinstance(result, dict):
+            raise ValueError("Unexpected response format from dropdown RPC")
+        return {table: result.get(table) or [] for table in DROPDOWN_TABLES}
+    
+    @staticmethod
+    def _shift_counts(result):
+        """Check the result of the counts RPC, see get_shift_counts"""
+        if not isinstance(result, dict) or "shifts" not in result:
+            raise ValueError("Unexpected response format from counts RPC")
+        return {
+            "shifts": result["shifts"],
+            "shifts_per_day": result.get("shifts_per_day") or [],
+            "headcount_per_schichtzeit": result.get("headcount_per_schichtzeit") or [],
+            "machine_days_per_type": result.get("machine_days_per_type") or [],
+        }
+    
+    @staticmethod
+    def _counts_params(date_from, date_to):
+        """Build the arguments of the counts RPC for a date window"""
+        return {
+            "date_from": _as_date(date_from).isoformat() if date_from else None,
+            "date_to": _as_date(date_to).isoformat() if date_to else None,
+        }
+    
+    @staticmethod
+    def build_dropdown_data(tables):
+        """Derive all dropdown lists from the base table rows
+        
+        Args:
+            tables (dict): Rows per base table
+            
+        Returns:
+            dict: Dictionary with all dropdown data
+        """
+        personal = tables["personal"]
+        inventar = tables["inventar"]
+        
+        def names_by_function(function):
+            return [item["name"] for item in personal if item.get("funktion") == function]
+        
+        return {
+            "abschnitt": [item["abschnitt"] for item in tables["abschnitte"]],
+            "baufuhrer": [item["name"] for item in tables["baufuhrer"]],
+            "arbeitsleiter": [item["name"] for item in tables["arbeitsleiter"]],
+            "zeit": [item["schicht"] for item in tables["schichtzeiten"]],
+            "personal": [item["name"] for item in personal],
+            "logistik_personal": names_by_function("Logistik"),
+            "ako_personal": names_by_function("AKO"),
+            "sc_personal": names_by_function("SC"),
+            "siwa_personal": names_by_function("SIWA"),
+            "inventar": [item["maschine"] for item in inventar],
+            "gbm_machines": [item["maschine"] for item in inventar if item.get("type") == "GBM"],
+            "function_types": ["Bauarbeiter", "AKO", "SC", "SIWA", "Logistik"],
+            "machine_types": ["GBM", "ZW-Fahrzeug", "Diverses"],
+        }
+
+    def _update_query(self, table, row, base_versions):
+        """Build the PATCH of one row by ID, conditional on its version
+        
+        The request changes nothing if the row was deleted or, if it has a
+        base version, changed since; it then returns no rows.
+        
+        Args:
+            table (str): Table name
+            row (dict): Row dict including "id"
+            base_versions (dict): Row ID -> version the row was edited from
+        """
+        query = self.supabase.table(table).update(row).eq("id", row["id"])
+        if row["id"] not in base_versions:
+            return query
+        if base_versions[row["id"]] is None:
+            return query.is_(VERSION_COLUMNS[table], "null")
+        return query.eq(VERSION_COLUMNS[table], base_versions[row["id"]])
+    
+    @staticmethod
+    def _update_report(rows, updated, conflicting, current_rows, failed=(), error=None):
+        """Build the result of update_if_unchanged
+        
+        Args:
+            rows (list): Rows passed to update_if_unchanged
+            updated (list): Rows as stored after the update
+            conflicting (list): IDs of the rows rejected because of a conflict
+            current_rows (list): Conflicting rows as stored now
+            failed (list): Rows not written because of the error
+            error (Exception, optional): Error that stopped the updates
+        
+        Returns:
+            dict: See SupabaseConnector.update_if_unchanged
+        """
+        records = {row["id"]: row for row in rows}
+        current = {row["id"]: row for row in current_rows}
+        return {
+            "updated": updated,
+            "conflicts": [
+                {"id": row_id, "record": records[row_id], "current": current.get(row_id)}
+                for row_id in conflicting
+            ],
+            "failed": list(failed),
+            "error": str(error) if error else None,
+            "transient": is_transient(error) if error else False,
+        }
+
+class SupabaseConnector(BaseSupabaseConnector):
     """Connector for handling Supabase database operations"""
     
-    def __init__(self):
-        """Initialize the Supabase connector"""
-        # Get Supabase URL and key from environment variables
-        url = os.environ.get("SUPABASE_URL")
-        key = os.environ.get("SUPABASE_KEY")
+    def __init__(self, client=None, connection_stats=None):
+        """Initialize the Supabase connector
+        
+        Args:
+            client (Client, optional): Supabase client to use; by default one
+                is created from the SUPABASE_URL and SUPABASE_KEY
+                environment variables
+            connection_stats (ConnectionStats, optional): Counters updated by
+                the HTTP client of the given client
+        """
+        if client is None:
+            # Get Supabase URL and key from environment variables
+            url, key = supabase_credentials()
+            
+            # Create Supabase client; all its requests share one connection pool
+            # configured by the SUPABASE_POOL_SIZE etc. environment variables
+            connection_stats = ConnectionStats()
+            options = ClientOptions(httpx_client=create_http_client(stats=connection_stats))
+            client = create_client(url, key, options)
+        super().__init__(client, connection_stats)
         
-        if not url or not key:
-            raise ValueError("SUPABASE_URL and SUPABASE_KEY environment variables must be set")
+        # Identical reads from several threads share one request
+        self.coalescer = RequestCoalescer()
+    
+    def _execute(self, query):
+        """Execute a query builder and count the round trip
         
-        # Create Supabase client
-        self.supabase: Client = create_client(url, key)
+        Args:
+            query: PostgREST request builder
+            
+        Returns:
+            APIResponse: The response of the request
+        """
+        self.round_trips += 1
+        return query.execute()
+    
+    def _read(self, query):
+        """Execute an idempotent query, retrying transient errors with backoff
+        
+        Args:
+            query: PostgREST request builder
+            
+        Returns:
+            APIResponse: The response of the request
+        """
+        return self.retry_policy.call(lambda: self._execute(query))
+    
+    def _select(self, table, columns=None):
+        """Select all rows of a table, served from the cache when possible
+        
+        Args:
+            table (str): Table name
+            columns (list, optional): Columns to select, all if not given
+            
+        Returns:
+            list: The rows
+        """
+        select = select_clause(columns)
+        key = (table, select)
+        
+        if self.stale_reads:
+            rows = self._read_persisted(key)
+            if rows is not None:
+                return rows
+        
+        return self.cache.get_or_load(
+            (table,), key,
+            lambda: self.coalescer.run(
+                key, lambda: self._persist(key, self._read(self.supabase.table(table).select(select)).data)
+            )
+        )
+    
+    def _write(self, table, query, retry=False):
+        """Execute a write query and invalidate the cached results of the table
         
+        Args:
+            table (str): Table the query writes to
+            query: PostgREST request builder
+            retry (bool): Retry transient errors; only for idempotent writes
+                such as upserts and deletes keyed by ID
+            
+        Returns:
+            APIResponse: The response of the request
+        """
+        try:
+            if retry:
+                return self._read(query)
+            return self._execute(query)
+        finally:
+            self.cache.invalidate(table)
+    
     # --- DROPDOWN DATA METHODS ---
     
     def get_dropdown_data(self):
         """Get all dropdown data from Supabase
         
+        Each base table is fetched once and the filtered lists (personnel by
+        function, machines by type) are derived in memory. If the
+        SUPABASE_DROPDOWN_RPC environment variable names a database function,
+        all base tables are loaded in a single round trip through that function.
+        
         Returns:
             dict: Dictionary with all dropdown data
         """
-        # Fetch data for all dropdowns
-        dropdown_data = {
-            "abschnitt": self._get_abschnitt_names(),
-            "baufuhrer": self._get_baufuhrer_names(),
-            "arbeitsleiter": self._get_arbeitsleiter_names(),
-            "zeit": self._get_schichtzeiten(),
-            "personal": self._get_personal_names(),
-            "logistik_personal": self._get_personnel_by_function("Logistik"),
-            "ako_personal": self._get_personnel_by_function("AKO"),
-            "sc_personal": self._get_personnel_by_function("SC"),
-            "siwa_personal": self._get_personnel_by_function("SIWA"),
-            "inventar": self._get_maschinen_names(),
-            "gbm_machines": self._get_maschinen_by_type("GBM"),
-            "function_types": ["Bauarbeiter", "AKO", "SC", "SIWA", "Logistik"],
-            "machine_types": ["GBM", "ZW-Fahrzeug", "Diverses"],
+        tables = None
+        if self.dropdown_rpc:
+            try:
+                tables = self._get_dropdown_tables_rpc()
+            except Exception as e:
+                print(f"Dropdown RPC '{self.dropdown_rpc}' failed, falling back to table queries: {str(e)}")
+        
+        if tables is None:
+            tables = self._get_dropdown_tables()
+        
+        return self.build_dropdown_data(tables)
+    
+    def _get_dropdown_tables(self):
+        """Fetch the base tables needed for the dropdowns, one query per table"""
+        return {
+            table: self._select(table, columns)
+            for table, columns in DROPDOWN_COLUMNS.items()
         }
+    
+    def _get_dropdown_tables_rpc(self):
+        """Fetch all dropdown base tables in one call to the configured RPC
         
-        return dropdown_data
+        The function is expected to return a JSON object with one array of
+        rows per base table (see sql/get_dropdown_data.sql).
+        """
+        key = ("rpc", self.dropdown_rpc)
+        result = self._read_persisted(key) if self.stale_reads else None
+        if result is None:
+            result = self.cache.get_or_load(
+                DROPDOWN_TABLES, key,
+                lambda: self.coalescer.run(
+                    key, lambda: self._persist(key, self._read(self.supabase.rpc(self.dropdown_rpc, {})).data)
+                )
+            )
+        return self._rpc_tables(result)
     
-    def _get_abschnitt_names(self):
-        """Get all abschnitt names from Supabase"""
-        result = self.supabase.table("abschnitte").select("abschnitt").execute()
-        return [item["abschnitt"] for item in result.data]
+    # --- GENERIC READ METHODS ---
     
-    def _get_baufuhrer_names(self):
-        """Get all bauführer names from Supabase"""
-        result = self.supabase.table("baufuhrer").select("name").execute()
-        return [item["name"] for item in result.data]
+    def get_rows(self, table, columns=None):
+        """Get all rows of a table, cached for master tables
+        
+        Args:
+            table (str): Table name
+            columns (list, optional): Columns to select, all if not given
+            
+        Returns:
+            list: The rows
+        """
+        return self._select(table, columns)
     
-    def _get_arbeitsleiter_names(self):
-        """Get all arbeitsleiter names from Supabase"""
-        result = self.supabase.table("arbeitsleiter").select("name").execute()
-        return [item["name"] for item in result.data]
+    def get_changed_rows(self, table, version_column, since=None, columns=None, filters=None,
+                         batch_size=PAGE_SIZE):
+        """Get the rows modified at or after a version
+        
+        Args:
+            table (str): Table name
+            version_column (str): Column holding the modification time
+            since (str, optional): High-water mark of the last sync; all
+                rows if not given
+            columns (list, optional): Columns to select, all if not given
+            filters (list, optional): Additional filter tuples
+            batch_size (int): Rows per request
+            
+        Returns:
+            list: The changed rows, ordered by version
+        """
+        select = select_clause(columns, required=("id", version_column))
+        filters = list(filters or [])
+        if since:
+            filters.append(("gte", version_column, since))
+        
+        rows = []
+        for batch in self._iter_keyset_pages(table, select, version_column, filters,
+                                             not since, batch_size):
+            rows.extend(batch)
+        return rows
     
-    def _get_schichtzeiten(self):
-        """Get all schichtzeiten from Supabase"""
-        result = self.supabase.table("schichtzeiten").select("schicht").execute()
-        return [item["schicht"] for item in result.data]
+    def get_ids(self, table, filters=None, batch_size=PAGE_SIZE):
+        """Get the IDs of all rows of a table
+        
+        Args:
+            table (str): Table name
+            filters (list, optional): Filter tuples
+            batch_size (int): IDs per request
+            
+        Returns:
+            set: The IDs
+        """
+        ids = set()
+        last_id = None
+        while True:
+            query = apply_filters(self.supabase.table(table).select("id"), filters or [])
+            if last_id:
+                query = query.gt("id", last_id)
+            rows = self._read(query.order("id").limit(batch_size)).data
+            ids.update(row["id"] for row in rows)
+            if len(rows) < batch_size:
+                return ids
+            last_id = rows[-1]["id"]
     
-    def _get_personal_names(self):
-        """Get all personnel names from Supabase"""
-        result = self.supabase.table("personal").select("name").execute()
-        return [item["name"] for item in result.data]
+    def get_by_ids(self, table, ids, columns=None, chunk_size=DELETE_CHUNK_SIZE):
+        """Get the rows with the given IDs
+        
+        Each chunk of IDs is fetched with one request using an in.(...)
+        filter; IDs without a row are left out of the result.
+        
+        Args:
+            table (str): Table name
+            ids (list): IDs of the rows
+            columns (list, optional): Columns to select, all if not given
+            chunk_size (int): Maximum IDs per request
+            
+        Returns:
+            list: The rows found
+        """
+        select = select_clause(columns, required=("id",))
+        rows = []
+        for start in range(0, len(ids), chunk_size):
+            chunk = list(ids[start:start + chunk_size])
+            rows.extend(self._read(self.supabase.table(table).select(select).in_("id", chunk)).data)
+        return rows
     
-    def _get_personnel_by_function(self, function):
-        """Get personnel names filtered by function"""
-        result = self.supabase.table("personal").select("name").eq("funktion", function).execute()
-        return [item["name"] for item in result.data]
+    # --- BULK METHODS ---
     
-    def _get_maschinen_names(self):
-        """Get all machine names from Supabase"""
-        result = self.supabase.table("inventar").select("maschine").execute()
-        return [item["maschine"] for item in result.data]
+    def upsert_many(self, table, rows, chunk_size=UPSERT_CHUNK_SIZE):
+        """Insert or update several rows of a table in bulk
+        
+        Rows are matched by id and merged into existing rows (PostgREST
+        "Prefer: resolution=merge-duplicates", as used by the SyncTable
+        macro), so a row only needs the columns that should be written.
+        Each chunk is sent as one request; as the rows are keyed by ID,
+        failed chunks are retried.
+        
+        Args:
+            table (str): Table name
+            rows (list): Row dicts including "id", all with the same keys
+            chunk_size (int): Maximum rows per request
+            
+        Returns:
+            list: The upserted rows
+        """
+        result = []
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            query = self.supabase.table(table).upsert(chunk, on_conflict="id")
+            result.extend(self._write(table, query, retry=True).data)
+        return result
     
-    def _get_maschinen_by_type(self, type_name):
-        """Get machine names filtered by type"""
-        result = self.supabase.table("inventar").select("maschine").eq("type", type_name).execute()
-        return [item["maschine"] for item in result.data]
+    def delete_many(self, table, ids, chunk_size=DELETE_CHUNK_SIZE):
+        """Delete several rows of a table by ID
+        
+        Each chunk of IDs is deleted with one request using an in.(...)
+        filter. Deleting by ID is idempotent, so failed chunks are retried.
+        
+        Args:
+            table (str): Table name
+            ids (list): IDs of the rows to delete
+            chunk_size (int): Maximum IDs per request
+        """
+        for start in range(0, len(ids), chunk_size):
+            chunk = list(ids[start:start + chunk_size])
+            self._write(table, self.supabase.table(table).delete().in_("id", chunk), retry=True)
+    
+    def update_if_unchanged(self, table, rows, base_versions, chunk_size=UPSERT_CHUNK_SIZE):
+        """Update rows unless others changed them since they were loaded
+        
+        Optimistic concurrency control: an update only applies while the
+        version column of the row (see VERSION_COLUMNS) still holds the
+        version it was edited from. Rows without a base version are updated
+        by ID only. Rows are never inserted, so a row deleted by others is
+        reported as a conflict instead of being recreated. The current
+        state is only fetched for conflicting rows.
+        
+        If the SUPABASE_UPDATE_RPC environment variable names the function
+        in sql/update_if_unchanged.sql, the rows with a base version are
+        checked and written in chunks, one request each. Otherwise each row
+        is sent as one conditional PATCH. Either way the check and the write
+        are atomic. Conditional updates are not retried.
+        
+        Args:
+            table (str): Table name, must have a version column
+            rows (list): Row dicts including "id"
+            base_versions (dict): Row ID -> version the row was edited from
+            chunk_size (int): Maximum rows per request of the function
+            
+        Returns:
+            dict: "updated" (the rows as stored now), "conflicts" (one dict
+                per row changed or deleted by others, with "id", "record"
+                (the rejected row) and "current" (the row as stored now,
+                None if deleted)), "failed" (rows not written because an
+                error stopped the updates), "error" (its message) and
+                "transient" (True if Supabase was unreachable)
+        """
+        version_column = VERSION_COLUMNS[table]
+        updated = []
+        conflicting = []
+        current_rows = []
+        done = set()  # IDs of the rows sent
+        
+        try:
+            if self.update_rpc:
+                conditional = [row for row in rows if row["id"] in base_versions]
+                for start in range(0, len(conditional), chunk_size):
+                    chunk = conditional[start:start + chunk_size]
+                    result = self._write(table, self.supabase.rpc(self.update_rpc, {
+                        "table_name": table,
+                        "version_column": version_column,
+                        "updates": [{"row": row, "base_version": base_versions[row["id"]]} for row in chunk],
+                    })).data
+                    updated.extend(result["updated"])
+                    conflicting.extend(result["conflicts"])
+                    done.update(row["id"] for row in chunk)
+            
+            for row in rows:
+                if row["id"] in done:
+                    continue
+                result = self._write(table, self._update_query(table, row, base_versions)).data
+                if result:
+                    updated.extend(result)
+                else:
+                    conflicting.append(row["id"])
+                done.add(row["id"])
+            
+            # Only conflicts cost another request
+            if conflicting:
+                current_rows = self.get_by_ids(table, conflicting)
+        except Exception as e:
+            failed = [row for row in rows if row["id"] not in done]
+            return self._update_report(rows, updated, conflicting, current_rows, failed, e)
+        
+        return self._update_report(rows, updated, conflicting, current_rows)
+    
+    # --- AGGREGATE METHODS ---
+    
+    def get_shift_counts(self, date_from=None, date_to=None):
+        """Get the aggregates of the shifts in a date window without loading them
+        
+        If the SUPABASE_COUNTS_RPC environment variable names the function
+        in sql/get_shift_counts.sql, all aggregates are computed by the
+        database in one round trip. Otherwise only the number of shifts is
+        available, counted with a HEAD request (PostgREST count=exact); the
+        breakdowns are None then.
+        
+        Args:
+            date_from (date|str, optional): First day (inclusive) of datum_von
+            date_to (date|str, optional): Last day (inclusive) of datum_von
+            
+        Returns:
+            dict: "shifts" (number of shifts), "shifts_per_day" (dicts with
+                "datum", "abschnitt" and "shifts"), "headcount_per_schichtzeit"
+                (dicts with "schichtzeit" and "headcount") and
+                "machine_days_per_type" (dicts with "type" and "machine_days")
+        """
+        if self.counts_rpc:
+            try:
+                query = self.supabase.rpc(self.counts_rpc, self._counts_params(date_from, date_to))
+                return self._shift_counts(self._read(query).data)
+            except Exception as e:
+                print(f"Counts RPC '{self.counts_rpc}' failed, falling back to counting shifts: {str(e)}")
+        
+        query = self.supabase.table("schichtplanung").select("id", count="exact", head=True)
+        query = apply_filters(query, shift_filters(date_from, date_to))
+        return {
+            "shifts": self._read(query).count,
+            "shifts_per_day": None,
+            "headcount_per_schichtzeit": None,
+            "machine_days_per_type": None,
+        }
     
     # --- SHIFTS METHODS ---
     
-    def get_schichtplanung(self):
-        """Get all shift planning data from Supabase"""
-        return self.supabase.table("schichtplanung").select("*").execute().data
+    def get_schichtplanung(self, date_from=None, date_to=None, abschnitt=None, columns=None, contains=None):
+        """Get shift planning data from Supabase
+        
+        All filters are applied by PostgREST, so only matching rows are
+        transferred. The rows are loaded page by page (see
+        iter_schichtplanung) so the result is not truncated by the PostgREST
+        row limit.
+        
+        Args:
+            date_from (date|str, optional): First day (inclusive) of datum_von
+            date_to (date|str, optional): Last day (inclusive) of datum_von
+            abschnitt (str, optional): Only shifts of this Abschnitt
+            columns (list, optional): Columns to select, all if not given
+            contains (dict, optional): Array column -> values the array must contain
+            
+        Returns:
+            list: The matching shift rows
+        """
+        rows = []
+        for batch in self.iter_schichtplanung(date_from, date_to, abschnitt, columns, contains):
+            rows.extend(batch)
+        return rows
+    
+    def iter_schichtplanung(self, date_from=None, date_to=None, abschnitt=None, columns=None,
+                            contains=None, batch_size=PAGE_SIZE):
+        """Iterate over the shift planning data in batches
+        
+        Uses keyset pagination on (datum_von, id), so each page is a cheap
+        index range scan and rows inserted meanwhile cannot shift the pages.
+        Shifts without datum_von are returned last, ordered by id, unless a
+        date window is given. While stale reads are enabled, the last loaded
+        date window is served from the disk cache.
+        
+        Args:
+            date_from (date|str, optional): First day (inclusive) of datum_von
+            date_to (date|str, optional): Last day (inclusive) of datum_von
+            abschnitt (str, optional): Only shifts of this Abschnitt
+            columns (list, optional): Columns to select, all if not given
+            contains (dict, optional): Array column -> values the array must contain
+            batch_size (int): Rows per request, must not exceed the
+                PostgREST max-rows setting
+            
+        Yields:
+            list: The next batch of shift rows
+        """
+        select = select_clause(columns, required=("id", "datum_von"))
+        filters = shift_filters(date_from, date_to, abschnitt, contains)
+        
+        windowed = bool(date_from or date_to)
+        
+        # The last loaded date window is kept on disk for the next start
+        window = self._shift_window(select, filters)
+        if self.stale_reads:
+            rows = self._read_persisted_window(window)
+            if rows is not None:
+                for start in range(0, len(rows), batch_size):
+                    yield rows[start:start + batch_size]
+                return
+        
+        loaded = []
+        # Shifts without a date can never match a date window
+        pages = self._iter_keyset_pages("schichtplanung", select, "datum_von", filters,
+                                        not windowed, batch_size)
+        for batch in pages:
+            loaded.extend(batch)
+            yield batch
+        
+        # The full history is not persisted, only date windows
+        if windowed:
+            self._persist(SHIFT_WINDOW_KEY, {"window": window, "rows": loaded})
+    
+    def _iter_keyset_pages(self, table, select, order_column, filters, include_nulls, batch_size):
+        """Fetch the pages of a query with keyset pagination on (order_column, id)
+        
+        Args:
+            table (str): Table name
+            select (str): Select clause, must include id and order_column
+            filters (list): Filter tuples
+            include_nulls (bool): Also return rows where order_column is
+                null, after all other rows, ordered by id
+            batch_size (int): Rows per request
+            
+        Yields:
+            list: The next batch of rows
+        """
+        # Rows with a value, ordered by (order_column, id)
+        last = None
+        while True:
+            query = self.supabase.table(table).select(select).not_.is_(order_column, "null")
+            query = apply_filters(query, filters)
+            if last:
+                query = query.or_(keyset_condition(order_column, last))
+            rows = self._read(query.order(order_column).order("id").limit(batch_size)).data
+            if rows:
+                yield rows
+            if len(rows) < batch_size:
+                break
+            last = rows[-1]
+        
+        if not include_nulls:
+            return
+        
+        # Rows without a value, ordered by id
+        last_id = None
+        while True:
+            query = self.supabase.table(table).select(select).is_(order_column, "null")
+            query = apply_filters(query, filters)
+            if last_id:
+                query = query.gt("id", last_id)
+            rows = self._read(query.order("id").limit(batch_size)).data
+            if rows:
+                yield rows
+            if len(rows) < batch_size:
+                break
+            last_id = rows[-1]["id"]
     
     def add_schichtplanung(self, data):
         """Add new shift planning to Supabase
@@ -98,20 +892,88 @@ class SupabaseConnector:
         Returns:
             list: The inserted data
         """
-        result = self.supabase.table("schichtplanung").insert(data).execute()
+        result = self._write("schichtplanung", self.supabase.table("schichtplanung").insert(data))
         return result.data
     
-    def update_schichtplanung(self, id, data):
+    def add_schichtplanung_many(self, rows, chunk_size=INSERT_CHUNK_SIZE):
+        """Add several shifts to Supabase in bulk
+        
+        Each chunk is sent as one array insert, which PostgREST applies in a
+        single transaction. If a chunk fails, the chunks inserted before it
+        are deleted again, so either all rows are applied or none.
+        
+        Args:
+            rows (list): Shift planning data dicts, all with the same keys
+            chunk_size (int): Maximum rows per insert request
+            
+        Returns:
+            list: One outcome per row, in input order. Each outcome is a dict
+                with "status" ("inserted", "failed", "rolled_back" or
+                "skipped"), "data" (the inserted row) and "error" (message);
+                failed outcomes also have "transient", True if the insert
+                failed because Supabase was unreachable. Rows still
+                "inserted" after a failed chunk could not be deleted again;
+                their outcomes have "rollback_error"
+        """
+        outcomes = [{"status": "skipped", "data": None, "error": None} for _ in rows]
+        inserted = []  # Indexes of rows inserted so far
+        
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                result = self._write("schichtplanung", self.supabase.table("schichtplanung").insert(chunk)).data
+            except Exception as e:
+                for index in range(start, start + len(chunk)):
+                    outcomes[index] = {"status": "failed", "data": None, "error": str(e),
+                                       "transient": is_transient(e)}
+                self._rollback_inserts(outcomes, inserted)
+                return outcomes
+            
+            # PostgREST returns the inserted rows in request order
+            for offset, row in enumerate(result):
+                outcomes[start + offset] = {"status": "inserted", "data": row, "error": None}
+                inserted.append(start + offset)
+        
+        return outcomes
+    
+    def _rollback_inserts(self, outcomes, inserted):
+        """Delete the shifts inserted by an aborted bulk insert
+        
+        Args:
+            outcomes (list): Outcomes of the bulk insert, updated in place
+            inserted (list): Indexes of the rows that were inserted
+        """
+        ids = [outcomes[index]["data"]["id"] for index in inserted]
+        try:
+            self.delete_many("schichtplanung", ids)
+        except Exception as e:
+            # The rows stay in the database; report them as inserted
+            print(f"Error rolling back inserted shifts: {str(e)}")
+            for index in inserted:
+                outcomes[index]["rollback_error"] = str(e)
+            return
+        
+        for index in inserted:
+            outcomes[index] = {"status": "rolled_back", "data": None, "error": None}
+    
+    def update_schichtplanung(self, id, data, base_version=None):
         """Update shift planning in Supabase
         
         Args:
             id (str): ID of the shift to update
             data (dict): Updated shift planning data
+            base_version (str, optional): Version the shift was loaded with;
+                if given, the update only applies while the shift still has
+                it (see update_if_unchanged)
             
         Returns:
-            list: The updated data
+            list: The updated data, empty if the shift was changed or
+                deleted by others
         """
-        return self.supabase.table("schichtplanung").update(data).eq("id", id).execute().data
+        query = self.supabase.table("schichtplanung").update(data).eq("id", id)
+        if base_version is not None:
+            query = query.eq(VERSION_COLUMNS["schichtplanung"], base_version)
+        return self._write("schichtplanung", query).data
     
     def delete_schichtplanung(self, id):
         """Delete shift planning from Supabase
@@ -119,140 +981,154 @@ class SupabaseConnector:
         Args:
             id (str): ID of the shift to delete
         """
-        return self.supabase.table("schichtplanung").delete().eq("id", id).execute()
+        return self._write("schichtplanung", self.supabase.table("schichtplanung").delete().eq("id", id))
     
     # --- ABSCHNITTE METHODS ---
     
-    def get_abschnitte(self):
-        """Get all abschnitte from Supabase"""
-        return self.supabase.table("abschnitte").select("*").execute().data
+    def get_abschnitte(self, columns=None):
+        """Get all abschnitte from Supabase
+        
+        Args:
+            columns (list, optional): Columns to select, all if not given
+        """
+        return self._select("abschnitte", columns)
     
     def add_abschnitt(self, abschnitt, beschreibung=""):
         """Add new abschnitt to Supabase"""
-        data = {"abschnitt": abschnitt, "beschreibung": beschreibung}
-        result = self.supabase.table("abschnitte").insert(data).execute()
+        data = make_record("abschnitte", abschnitt, beschreibung)
+        result = self._write("abschnitte", self.supabase.table("abschnitte").insert(data))
         return result.data
     
     def update_abschnitt(self, id, abschnitt, beschreibung=""):
         """Update an abschnitt in Supabase"""
-        data = {"abschnitt": abschnitt, "beschreibung": beschreibung}
-        return self.supabase.table("abschnitte").update(data).eq("id", id).execute().data
+        data = make_record("abschnitte", abschnitt, beschreibung)
+        return self._write("abschnitte", self.supabase.table("abschnitte").update(data).eq("id", id)).data
     
     def delete_abschnitt(self, id):
         """Delete an abschnitt from Supabase"""
-        return self.supabase.table("abschnitte").delete().eq("id", id).execute()
+        return self._write("abschnitte", self.supabase.table("abschnitte").delete().eq("id", id))
     
     # --- SCHICHTZEITEN METHODS ---
     
-    def get_schichtzeiten(self):
-        """Get all schichtzeiten from Supabase"""
-        return self.supabase.table("schichtzeiten").select("*").execute().data
+    def get_schichtzeiten(self, columns=None):
+        """Get all schichtzeiten from Supabase
+        
+        Args:
+            columns (list, optional): Columns to select, all if not given
+        """
+        return self._select("schichtzeiten", columns)
     
     def add_schichtzeit(self, schicht, zeit_von, zeit_bis):
         """Add new schichtzeit to Supabase"""
-        data = {"schicht": schicht, "zeit_von": zeit_von, "zeit_bis": zeit_bis}
-        result = self.supabase.table("schichtzeiten").insert(data).execute()
+        data = make_record("schichtzeiten", schicht, zeit_von, zeit_bis)
+        result = self._write("schichtzeiten", self.supabase.table("schichtzeiten").insert(data))
         return result.data
     
     def update_schichtzeit(self, id, schicht, zeit_von, zeit_bis):
         """Update a schichtzeit in Supabase"""
-        data = {"schicht": schicht, "zeit_von": zeit_von, "zeit_bis": zeit_bis}
-        return self.supabase.table("schichtzeiten").update(data).eq("id", id).execute().data
+        data = make_record("schichtzeiten", schicht, zeit_von, zeit_bis)
+        return self._write("schichtzeiten", self.supabase.table("schichtzeiten").update(data).eq("id", id)).data
     
     def delete_schichtzeit(self, id):
         """Delete a schichtzeit from Supabase"""
-        return self.supabase.table("schichtzeiten").delete().eq("id", id).execute()
+        return self._write("schichtzeiten", self.supabase.table("schichtzeiten").delete().eq("id", id))
     
     # --- ARBEITSLEITER METHODS ---
     
-    def get_arbeitsleiter(self):
-        """Get all arbeitsleiter from Supabase"""
-        return self.supabase.table("arbeitsleiter").select("*").execute().data
+    def get_arbeitsleiter(self, columns=None):
+        """Get all arbeitsleiter from Supabase
+        
+        Args:
+            columns (list, optional): Columns to select, all if not given
+        """
+        return self._select("arbeitsleiter", columns)
     
     def add_arbeitsleiter(self, name, telefonnummer="", email=""):
         """Add new arbeitsleiter to Supabase"""
-        data = {"name": name, "telefonnummer": telefonnummer, "email": email}
-        result = self.supabase.table("arbeitsleiter").insert(data).execute()
+        data = make_record("arbeitsleiter", name, telefonnummer, email)
+        result = self._write("arbeitsleiter", self.supabase.table("arbeitsleiter").insert(data))
         return result.data
     
     def update_arbeitsleiter(self, id, name, telefonnummer="", email=""):
         """Update an arbeitsleiter in Supabase"""
-        data = {"name": name, "telefonnummer": telefonnummer, "email": email}
-        return self.supabase.table("arbeitsleiter").update(data).eq("id", id).execute().data
+        data = make_record("arbeitsleiter", name, telefonnummer, email)
+        return self._write("arbeitsleiter", self.supabase.table("arbeitsleiter").update(data).eq("id", id)).data
     
     def delete_arbeitsleiter(self, id):
         """Delete an arbeitsleiter from Supabase"""
-        return self.supabase.table("arbeitsleiter").delete().eq("id", id).execute()
+        return self._write("arbeitsleiter", self.supabase.table("arbeitsleiter").delete().eq("id", id))
     
     # --- BAUFÜHRER METHODS ---
     
-    def get_baufuhrer(self):
-        """Get all bauführer from Supabase"""
-        return self.supabase.table("baufuhrer").select("*").execute().data
+    def get_baufuhrer(self, columns=None):
+        """Get all bauführer from Supabase
+        
+        Args:
+            columns (list, optional): Columns to select, all if not given
+        """
+        return self._select("baufuhrer", columns)
     
     def add_baufuhrer(self, name, telefonnummer="", email=""):
         """Add new bauführer to Supabase"""
-        data = {"name": name, "telefonnummer": telefonnummer, "email": email}
-        result = self.supabase.table("baufuhrer").insert(data).execute()
+        data = make_record("baufuhrer", name, telefonnummer, email)
+        result = self._write("baufuhrer", self.supabase.table("baufuhrer").insert(data))
         return result.data
     
     def update_baufuhrer(self, id, name, telefonnummer="", email=""):
         """Update a bauführer in Supabase"""
-        data = {"name": name, "telefonnummer": telefonnummer, "email": email}
-        return self.supabase.table("baufuhrer").update(data).eq("id", id).execute().data
+        data = make_record("baufuhrer", name, telefonnummer, email)
+        return self._write("baufuhrer", self.supabase.table("baufuhrer").update(data).eq("id", id)).data
     
     def delete_baufuhrer(self, id):
         """Delete a bauführer from Supabase"""
-        return self.supabase.table("baufuhrer").delete().eq("id", id).execute()
+        return self._write("baufuhrer", self.supabase.table("baufuhrer").delete().eq("id", id))
     
     # --- PERSONAL METHODS ---
     
-    def get_personal(self):
-        """Get all personnel from Supabase"""
-        return self.supabase.table("personal").select("*").execute().data
+    def get_personal(self, columns=None):
+        """Get all personnel from Supabase
+        
+        Args:
+            columns (list, optional): Columns to select, all if not given
+        """
+        return self._select("personal", columns)
     
     def add_personal(self, name, funktion="", telefonnummer="", email=""):
         """Add new personnel to Supabase"""
-        data = {
-            "name": name, 
-            "funktion": funktion, 
-            "telefonnummer": telefonnummer, 
-            "email": email
-        }
-        result = self.supabase.table("personal").insert(data).execute()
+        data = make_record("personal", name, funktion, telefonnummer, email)
+        result = self._write("personal", self.supabase.table("personal").insert(data))
         return result.data
     
     def update_personal(self, id, name, funktion="", telefonnummer="", email=""):
         """Update personnel in Supabase"""
-        data = {
-            "name": name, 
-            "funktion": funktion, 
-            "telefonnummer": telefonnummer, 
-            "email": email
-        }
-        return self.supabase.table("personal").update(data).eq("id", id).execute().data
+        data = make_record("personal", name, funktion, telefonnummer, email)
+        return self._write("personal", self.supabase.table("personal").update(data).eq("id", id)).data
     
     def delete_personal(self, id):
         """Delete personnel from Supabase"""
-        return self.supabase.table("personal").delete().eq("id", id).execute()
+        return self._write("personal", self.supabase.table("personal").delete().eq("id", id))
     
     # --- INVENTAR METHODS ---
     
-    def get_inventar(self):
-        """Get all inventar from Supabase"""
-        return self.supabase.table("inventar").select("*").execute().data
+    def get_inventar(self, columns=None):
+        """Get all inventar from Supabase
+        
+        Args:
+            columns (list, optional): Columns to select, all if not given
+        """
+        return self._select("inventar", columns)
     
     def add_inventar(self, maschine, firma="", type=""):
         """Add new inventar to Supabase"""
-        data = {"maschine": maschine, "firma": firma, "type": type}
-        result = self.supabase.table("inventar").insert(data).execute()
+        data = make_record("inventar", maschine, firma, type)
+        result = self._write("inventar", self.supabase.table("inventar").insert(data))
         return result.data
     
     def update_inventar(self, id, maschine, firma="", type=""):
         """Update inventar in Supabase"""
-        data = {"maschine": maschine, "firma": firma, "type": type}
-        return self.supabase.table("inventar").update(data).eq("id", id).execute().data
+        data = make_record("inventar", maschine, firma, type)
+        return self._write("inventar", self.supabase.table("inventar").update(data).eq("id", id)).data
     
     def delete_inventar(self, id):
         """Delete inventar from Supabase"""
-        return self.supabase.table("inventar").delete().eq("id", id).execute() 
\ No newline at end of file
+        return self._write("inventar", self.supabase.table("inventar").delete().eq("id", id)) 
\ No newline at end of file
@@ -0,0 +1,314 @@
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from connectors.disk_cache import default_cache_dir
+from connectors.resilience import is_transient
+from connectors.schema import VERSION_COLUMNS
+
+# Kinds of queued writes
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+def compact_writes(entries):
+    """Merge the queued writes of each row into the one write to replay
+    
+    Later writes of a row win: consecutive updates are merged, an update of
+    a row inserted offline stays an insert, and a row inserted and deleted
+    offline is dropped. The version the first write was based on is kept,
+    so remote changes made in the meantime are still detected.
+    
+    Args:
+        entries (list): Queued writes in queue order, see WriteQueue.pending
+    
+    Returns:
+        list: Dicts with "table", "op", "id", "data", "base_version" and
+            "seqs" (queue positions of the merged writes), in queue order
+    """
+    writes = {}
+    for entry in entries:
+        key = (entry["table"], entry["id"])
+        write = writes.get(key)
+        if write is None:
+            writes[key] = dict(entry, seqs=[entry["seq"]])
+            continue
+        
+        write["seqs"].append(entry["seq"])
+        if entry["op"] == DELETE:
+            if write["op"] == INSERT:
+                # Never reached the database; nothing to replay
+                write["op"] = None
+            else:
+                write["op"] = DELETE
+                write["data"] = None
+        elif write["op"] == DELETE:
+            # A new row reusing the ID of a deleted one
+            write["op"] = entry["op"]
+            write["data"] = entry["data"]
+        else:
+            write["data"] = dict(write["data"] or {}, **entry["data"])
+    
+    return sorted(writes.values(), key=lambda write: write["seqs"][0])
+
+def find_conflict(write, current, version_column):
+    """Check whether a queued write would overwrite a remote change
+    
+    Args:
+        write (dict): Compacted write, see compact_writes
+        current (dict): Current row in the database, None if it is missing
+        version_column (str): Version column of the table, None if it has none
+    
+    Returns:
+        str: Reason of the conflict, or None if the write can be replayed
+    """
+    if write["op"] == INSERT:
+        return None
+    if current is None:
+        # Updating would recreate the deleted row; deleting it is done already
+        return "remote gelöscht" if write["op"] == UPDATE else None
+    if version_column and write["base_version"] and current.get(version_column) != write["base_version"]:
+        return "remote geändert"
+    return None
+
+class WriteQueue:
+    """Durable queue of the writes made while Supabase is unreachable
+    
+    Writes are appended to a SQLite file, so they survive restarts, and are
+    replayed in bulk once the connection is back. Inserts carry an ID
+    generated on the client and are replayed as upserts, so a replay
+    interrupted halfway can simply be repeated.
+    """
+    
+    def __init__(self, path=None):
+        """Initialize the write queue
+        
+        Args:
+            path (str, optional): SQLite file, defaults to write_queue.sqlite3
+                in the user's cache directory
+        """
+        if path is None:
+            cache_dir = default_cache_dir()
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, "write_queue.sqlite3")
+        
+        self.path = path
+        self._lock = threading.Lock()
+        
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS writes ("
+                " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " table_name TEXT NOT NULL,"
+                " op TEXT NOT NULL,"
+                " row_id TEXT NOT NULL,"
+                " data TEXT,"
+                " base_version TEXT,"
+                " queued_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS conflicts ("
+                " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " table_name TEXT NOT NULL,"
+                " op TEXT NOT NULL,"
+                " row_id TEXT NOT NULL,"
+                " data TEXT,"
+                " reason TEXT NOT NULL,"
+                " detected_at REAL NOT NULL)"
+            )
+    
+    @contextlib.contextmanager
+    def _connect(self):
+        """Open a connection to the queue file, committing on success"""
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def enqueue(self, table, op, records, base_versions=None):
+        """Append writes to the queue
+        
+        Args:
+            table (str): Table name
+            op (str): INSERT, UPDATE or DELETE
+            records (list): Row dicts including "id"; for deletes only the
+                "id" is used
+            base_versions (dict, optional): Row ID -> version of the row the
+                write is based on, used to detect conflicting remote changes
+        """
+        base_versions = base_versions or {}
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO writes (table_name, op, row_id, data, base_version, queued_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (table, op, str(record["id"]),
+                     None if op == DELETE else json.dumps(record, default=str),
+                     base_versions.get(record["id"]), now)
+                    for record in records
+                ]
+            )
+    
+    def pending(self):
+        """Get all queued writes
+        
+        Returns:
+            list: Dicts with "seq", "table", "op", "id", "data" and
+                "base_version", in queue order
+        """
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT seq, table_name, op, row_id, data, base_version FROM writes ORDER BY seq"
+            ).fetchall()
+        return [
+            {"seq": seq, "table": table, "op": op, "id": row_id,
+             "data": json.loads(data) if data else None, "base_version": base_version}
+            for seq, table, op, row_id, data, base_version in rows
+        ]
+    
+    def count(self):
+        """Get the number of queued writes"""
+        with self._lock, self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM writes").fetchone()[0]
+    
+    def remove(self, seqs):
+        """Remove replayed writes from the queue
+        
+        Args:
+            seqs (list): Queue positions of the writes
+        """
+        with self._lock, self._connect() as conn:
+            conn.executemany("DELETE FROM writes WHERE seq = ?", [(seq,) for seq in seqs])
+    
+    def conflicts(self):
+        """Get the writes that were not replayed because of a conflict
+        
+        Returns:
+            list: Dicts with "table", "op", "id", "data" and "reason"
+        """
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT table_name, op, row_id, data, reason FROM conflicts ORDER BY seq"
+            ).fetchall()
+        return [
+            {"table": table, "op": op, "id": row_id,
+             "data": json.loads(data) if data else None, "reason": reason}
+            for table, op, row_id, data, reason in rows
+        ]
+    
+    def _set_aside(self, writes, reason):
+        """Move writes that cannot be replayed from the queue to the conflicts"""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO conflicts (table_name, op, row_id, data, reason, detected_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (write["table"], write["op"], write["id"],
+                     json.dumps(write["data"], default=str) if write["data"] else None,
+                     reason(write) if callable(reason) else reason, now)
+                    for write in writes
+                ]
+            )
+            conn.executemany(
+                "DELETE FROM writes WHERE seq = ?",
+                [(seq,) for write in writes for seq in write["seqs"]]
+            )
+    
+    def replay(self, connector):
+        """Send the queued writes to Supabase
+        
+        The writes are compacted per row and sent table by table as bulk
+        upserts and deletes. Before that, the current versions of the
+        updated and deleted rows are fetched in bulk; writes that would
+        overwrite a remote change are set aside as conflicts instead of
+        being sent. Writes rejected by the database are set aside as well.
+        On a network error the replay stops and the remaining writes stay
+        queued for the next attempt.
+        
+        Runs on a worker thread.
+        
+        Args:
+            connector (SupabaseConnector): Connector to send the writes with
+        
+        Returns:
+            dict: "applied" (number of rows written), "conflicts" (writes
+                set aside, with "reason") and "pending" (writes still queued)
+        """
+        report = {"applied": 0, "conflicts": [], "pending": 0}
+        
+        writes = compact_writes(self.pending())
+        dropped = [write for write in writes if write["op"] is None]
+        if dropped:
+            self.remove([seq for write in dropped for seq in write["seqs"]])
+        
+        by_table = {}
+        for write in writes:
+            if write["op"] is not None:
+                by_table.setdefault(write["table"], []).append(write)
+        
+        try:
+            for table, table_writes in by_table.items():
+                self._replay_table(connector, table, table_writes, report)
+        except Exception as e:
+            if not is_transient(e):
+                raise
+            print(f"Replay of queued writes interrupted: {str(e)}")
+        
+        report["pending"] = self.count()
+        return report
+    
+    def _replay_table(self, connector, table, writes, report):
+        """Replay the compacted writes of one table, see replay"""
+        version_column = VERSION_COLUMNS.get(table)
+        
+        # Current versions of the rows changed or deleted offline, in bulk
+        checked = [write["id"] for write in writes if write["op"] != INSERT]
+        current = {}
+        if checked:
+            columns = ["id", version_column] if version_column else ["id"]
+            current = {str(row["id"]): row for row in connector.get_by_ids(table, checked, columns)}
+        
+        upserts = []
+        deletes = []
+        conflicts = []
+        for write in writes:
+            reason = find_conflict(write, current.get(write["id"]), version_column)
+            if reason:
+                conflicts.append(dict(write, reason=reason))
+            elif write["op"] == DELETE:
+                deletes.append(write)
+            else:
+                upserts.append(write)
+        
+        if conflicts:
+            self._set_aside(conflicts, lambda write: write["reason"])
+            report["conflicts"].extend(conflicts)
+        
+        # Rows of one upsert request must have the same columns
+        groups = {}
+        for write in upserts:
+            groups.setdefault(tuple(sorted(write["data"])), []).append(write)
+        
+        for group in list(groups.values()) + ([deletes] if deletes else []):
+            try:
+                if group[0]["op"] == DELETE:
+                    connector.delete_many(table, [write["id"] for write in group])
+                else:
+                    connector.upsert_many(table, [write["data"] for write in group])
+            except Exception as e:
+                if is_transient(e):
+                    raise
+                reason = f"abgelehnt: {str(e)}"
+                self._set_aside(group, reason)
+                report["conflicts"].extend(dict(write, reason=reason) for write in group)
+                continue
+            
+            self.remove([seq for write in group for seq in write["seqs"]])
+            report["applied"] += len(group)
@@ -1,3 +1,4 @@
+import locale
 import tkinter as tk
 from tkinter import ttk
 from ttkthemes import ThemedTk
@@ -5,6 +6,13 @@ from app import SchichtplanerApp
 
 def main():
     """Main entry point for the application"""
+    # Sort text in the tables by the user's collation rules, e.g. umlauts
+    # with their base letters
+    try:
+        locale.setlocale(locale.LC_COLLATE, "")
+    except locale.Error:
+        pass
+    
     root = ThemedTk(theme="yaru")  # Use ThemedTk instead of Tk and set yaru theme
     root.title("Schichtplaner")  # Set window title
     
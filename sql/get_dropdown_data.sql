@@ -0,0 +1,16 @@
+-- Returns all base tables needed for the application dropdowns in one response.
+-- Enable it in the app by setting SUPABASE_DROPDOWN_RPC=get_dropdown_data.
+create or replace function get_dropdown_data()
+returns json
+language sql
+stable
+as $$
+    select json_build_object(
+        'abschnitte', coalesce((select json_agg(json_build_object('abschnitt', abschnitt)) from abschnitte), '[]'::json),
+        'baufuhrer', coalesce((select json_agg(json_build_object('name', name)) from baufuhrer), '[]'::json),
+        'arbeitsleiter', coalesce((select json_agg(json_build_object('name', name)) from arbeitsleiter), '[]'::json),
+        'schichtzeiten', coalesce((select json_agg(json_build_object('schicht', schicht)) from schichtzeiten), '[]'::json),
+        'personal', coalesce((select json_agg(json_build_object('name', name, 'funktion', funktion)) from personal), '[]'::json),
+        'inventar', coalesce((select json_agg(json_build_object('maschine', maschine, 'type', type)) from inventar), '[]'::json)
+    );
+$$;
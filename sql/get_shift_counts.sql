@@ -0,0 +1,54 @@
+-- Returns the aggregates shown in the summary panel of the shifts tab in one
+-- response, without sending any shift rows. Enable it in the app by setting
+-- SUPABASE_COUNTS_RPC=get_shift_counts. The date window works like the one
+-- of the shift list: both days inclusive, either may be null.
+-- Headcount sums the people columns (connectors/schema.py PERSONNEL_COLUMNS);
+-- a machine-day is a machine of inventar used on a day, counted once per day.
+create or replace function get_shift_counts(date_from date default null, date_to date default null)
+returns json
+language sql
+stable
+as $$
+    with shifts as (
+        select *
+        from schichtplanung
+        where (date_from is null or datum_von >= date_from)
+          and (date_to is null or datum_von < date_to + 1)
+    )
+    select json_build_object(
+        'shifts', (select count(*) from shifts),
+        'shifts_per_day', coalesce((
+            select json_agg(d order by d.datum, d.abschnitt)
+            from (
+                select (datum_von at time zone 'utc')::date as datum, abschnitt, count(*) as shifts
+                from shifts
+                group by 1, 2
+            ) d
+        ), '[]'::json),
+        'headcount_per_schichtzeit', coalesce((
+            select json_agg(h order by h.schichtzeit)
+            from (
+                select schichtzeit,
+                       sum(coalesce(cardinality(baufuhrer), 0) + coalesce(cardinality(arbeitsleiter), 0)
+                           + coalesce(cardinality(ako), 0) + coalesce(cardinality(sc_1), 0)
+                           + coalesce(cardinality(siwa_1), 0) + coalesce(cardinality(siwa_2), 0)
+                           + coalesce(cardinality(logistikpersonal), 0) + coalesce(cardinality(maschinisten), 0)
+                           + coalesce(cardinality(personal_gbm), 0)) as headcount
+                from shifts
+                group by 1
+            ) h
+        ), '[]'::json),
+        'machine_days_per_type', coalesce((
+            select json_agg(m order by m.type)
+            from (
+                select i.type, count(distinct ((s.datum_von at time zone 'utc')::date, machine)) as machine_days
+                from shifts s
+                cross join lateral unnest(
+                    coalesce(s.gleisbaumaschine, '{}') || coalesce(s.bagger, '{}') || coalesce(s.diverse_maschinen, '{}')
+                ) as machine
+                join inventar i on i.maschine = machine
+                group by i.type
+            ) m
+        ), '[]'::json)
+    );
+$$;
@@ -0,0 +1,13 @@
+-- Publishes the row changes of the application tables through Supabase
+-- Realtime, so open clients apply changes made by others as they happen
+-- (see connectors/change_feed.py). Without it the clients poll for changes.
+-- Deletes only carry the primary key, which is all the clients need.
+
+alter publication supabase_realtime add table
+    schichtplanung,
+    abschnitte,
+    schichtzeiten,
+    arbeitsleiter,
+    baufuhrer,
+    personal,
+    inventar;
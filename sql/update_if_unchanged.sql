@@ -0,0 +1,46 @@
+-- Applies a batch of conditional updates in one request: each row is only
+-- updated while its version column still holds the version the client
+-- loaded (see SupabaseConnector.update_if_unchanged). Enable it with
+-- SUPABASE_UPDATE_RPC=update_if_unchanged; without it, each row is sent as
+-- its own conditional PATCH.
+--
+-- updates is an array of {"row": {...}, "base_version": ...}; the result is
+-- {"updated": [rows as stored now], "conflicts": [ids of rejected rows]}.
+-- Versions are compared in their JSON form, as the client received them.
+
+create or replace function update_if_unchanged(table_name text, version_column text, updates jsonb)
+returns jsonb
+language plpgsql
+as $$
+declare
+    item jsonb;
+    assignments text;
+    result jsonb;
+    updated jsonb := '[]'::jsonb;
+    conflicts jsonb := '[]'::jsonb;
+begin
+    for item in select * from jsonb_array_elements(updates) loop
+        select string_agg(format('%I = r.%I', key, key), ', ')
+        into assignments
+        from jsonb_object_keys(item->'row') as key
+        where key <> 'id';
+        
+        execute format(
+            'update %1$I t set %2$s from jsonb_populate_record(null::%1$I, $1) r '
+            'where t.id = r.id and to_jsonb(t.%3$I) is not distinct from $2 '
+            'returning to_jsonb(t)',
+            table_name, assignments, version_column
+        )
+        using item->'row', nullif(item->'base_version', 'null'::jsonb)
+        into result;
+        
+        if result is null then
+            conflicts := conflicts || jsonb_build_array(item->'row'->'id');
+        else
+            updated := updated || jsonb_build_array(result);
+        end if;
+    end loop;
+    
+    return jsonb_build_object('updated', updated, 'conflicts', conflicts);
+end;
+$$;
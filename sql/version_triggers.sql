@@ -0,0 +1,45 @@
+-- Stamps every insert and update with the modification time, so clients can
+-- fetch only the rows changed since their last sync (see connectors/delta_sync.py).
+-- schichtplanung.updated_by_at is a text column; it gets a fixed-width UTC
+-- timestamp so that text comparison orders it correctly.
+-- clock_timestamp() is the write time, not the commit time; syncs therefore
+-- re-fetch a window below their high-water mark (HIGH_WATER_OVERLAP).
+
+create or replace function set_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at := clock_timestamp();
+    return new;
+end;
+$$;
+
+create or replace function set_updated_by_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_by_at := to_char(clock_timestamp() at time zone 'utc', 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"');
+    return new;
+end;
+$$;
+
+drop trigger if exists abschnitte_updated_at on abschnitte;
+create trigger abschnitte_updated_at
+    before insert or update on abschnitte
+    for each row execute function set_updated_at();
+
+drop trigger if exists schichtzeiten_updated_at on schichtzeiten;
+create trigger schichtzeiten_updated_at
+    before insert or update on schichtzeiten
+    for each row execute function set_updated_at();
+
+drop trigger if exists schichtplanung_updated_by_at on schichtplanung;
+create trigger schichtplanung_updated_by_at
+    before insert or update on schichtplanung
+    for each row execute function set_updated_by_at();
+
+create index if not exists abschnitte_updated_at_idx on abschnitte (updated_at, id);
+create index if not exists schichtzeiten_updated_at_idx on schichtzeiten (updated_at, id);
+create index if not exists schichtplanung_updated_by_at_idx on schichtplanung (updated_by_at, id);
@@ -0,0 +1,39 @@
+import unittest
+
+from connectors.cache import MISSING, TableCache
+
+class TableCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = TableCache({"personal": 600, "inventar": 600})
+    
+    def test_loaded_value_is_cached(self):
+        self.assertEqual(self.cache.get_or_load(("personal",), "key", lambda: ["alt"]), ["alt"])
+        self.assertEqual(self.cache.get_or_load(("personal",), "key", lambda: ["neu"]), ["alt"])
+    
+    def test_load_overlapping_a_write_is_not_cached(self):
+        def load():
+            # A write to the table lands while the rows are being read
+            self.cache.invalidate("personal")
+            return ["alt"]
+        
+        self.assertEqual(self.cache.get_or_load(("personal",), "key", load), ["alt"])
+        self.assertIs(self.cache.get(("personal",), "key"), MISSING)
+        self.assertEqual(self.cache.get_or_load(("personal",), "key", lambda: ["neu"]), ["neu"])
+    
+    def test_writes_to_other_tables_keep_the_load(self):
+        def load():
+            self.cache.invalidate("inventar")
+            return ["alt"]
+        
+        self.cache.get_or_load(("personal",), "key", load)
+        self.assertEqual(self.cache.get(("personal",), "key"), ["alt"])
+    
+    def test_set_after_clearing_all_tables_is_dropped(self):
+        generation = self.cache.generation(("personal",))
+        self.cache.invalidate()
+        self.cache.set(("personal",), "key", ["alt"], generation)
+        self.assertIs(self.cache.get(("personal",), "key"), MISSING)
+
+if __name__ == "__main__":
+    unittest.main()
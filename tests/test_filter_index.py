@@ -0,0 +1,52 @@
+import random
+import unittest
+
+from utils.filter_index import MAX_INDEXED_VALUES, FilterIndex
+
+WORDS = ["Gleis", "Weiche", "Schotter", "Nord", "Süd", "Stopfen", "Schweißen", "Umbau", "Zürich"]
+
+def shift_items(count):
+    generator = random.Random(3)
+    items = []
+    for i in range(count):
+        titel = " ".join(generator.choice(WORDS) for _ in range(generator.randint(1, 5))) + f" {i}"
+        items.append((str(i), (str(i), titel, generator.choice(["Tag", "Nacht"]))))
+    return items
+
+class FilterIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        # More distinct titles than the value index takes
+        self.items = shift_items(MAX_INDEXED_VALUES + 500)
+        self.index = FilterIndex(["id", "titel", "zeit"], self.items)
+    
+    def scan(self, filters):
+        columns = self.index.columns
+        return [
+            position for position, (_, values) in enumerate(self.items)
+            if all(text.lower() in values[columns.index(column)].lower() for column, text in filters.items())
+        ]
+    
+    def test_substring_filters_match_a_scan(self):
+        queries = ["sch", "SCHWEI", "nord 1", "ürich", "eiche gl", "12", "xyz", "d s", "Süd 2499"]
+        # Twice: the second round finds all trigrams in the index
+        for query in queries * 2:
+            self.assertEqual(self.index.filter({"titel": query}), self.scan({"titel": query}), query)
+            self.assertEqual(
+                self.index.filter({"titel": query, "zeit": "nacht"}),
+                self.scan({"titel": query, "zeit": "nacht"}),
+                query
+            )
+    
+    def test_trigrams_are_indexed_once(self):
+        self.index.filter({"titel": "weiche"})
+        ngrams = self.index._ngrams["titel"]
+        self.assertEqual(set(ngrams), {"wei", "eic", "ich", "che"})
+        
+        cached = ngrams["eic"]
+        self.index.filter({"titel": "eich"})
+        self.assertIs(self.index._ngrams["titel"]["eic"], cached)
+        self.assertEqual(set(ngrams), {"wei", "eic", "ich", "che"})
+
+if __name__ == "__main__":
+    unittest.main()
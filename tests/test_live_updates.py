@@ -0,0 +1,178 @@
+import unittest
+
+from connectors.change_feed import LocalChangeFeed, CHANNEL_ERROR, SUBSCRIBED
+from connectors.delta_sync import DeltaSync
+from utils.live_updates import LiveUpdates, DEBOUNCE_INTERVAL, POLL_INTERVAL
+
+class FakeRoot:
+    """Tk root whose after() jobs run when the test advances the clock"""
+    
+    def __init__(self):
+        self.now = 0
+        self.jobs = {}
+        self.next_job = 0
+    
+    def after(self, ms, callback):
+        self.next_job += 1
+        self.jobs[self.next_job] = (self.now + ms, callback)
+        return self.next_job
+    
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+    
+    def advance(self, ms):
+        """Move the clock forward, running the jobs that become due"""
+        end = self.now + ms
+        while True:
+            due = [(time, job) for job, (time, _) in self.jobs.items() if time <= end]
+            if not due:
+                break
+            time, job = min(due)
+            self.now = time
+            _, callback = self.jobs.pop(job)
+            callback()
+        self.now = end
+
+class FakeIO:
+    """I/O executor calling back on the calling thread"""
+    
+    def call_in_ui(self, callback, *args):
+        callback(*args)
+
+class FakeConnector:
+    """Connector part used by DeltaSync.apply_changes"""
+    
+    def invalidate_cache(self, table=None):
+        pass
+
+class FakeView:
+    """Table view recording the row changes applied to it"""
+    
+    def __init__(self, table):
+        self.TABLE = table
+        self.changes = []
+    
+    def apply_row_changes(self, upserted, deleted):
+        self.changes.append((upserted, deleted))
+
+class FakeApp:
+    """The parts of SchichtplanerApp used by LiveUpdates"""
+    
+    def __init__(self, views):
+        self.root = FakeRoot()
+        self.io = FakeIO()
+        self.delta_sync = DeltaSync(FakeConnector())
+        self.views = views
+        self.syncs = 0
+        self.dropdown_loads = 0
+    
+    def table_views(self):
+        return self.views
+    
+    def sync_changes(self, on_done=None, on_error=None):
+        self.syncs += 1
+        if on_done:
+            on_done(0)
+    
+    def load_dropdown_data(self, on_loaded=None):
+        self.dropdown_loads += 1
+    
+    def update_dropdown_values(self, dropdown_data):
+        pass
+
+def shift(shift_id, titel, version, **extra):
+    return dict({"id": shift_id, "titel": titel, "updated_by_at": version}, **extra)
+
+class LiveUpdatesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.shifts = FakeView("schichtplanung")
+        self.abschnitte = FakeView("abschnitte")
+        self.app = FakeApp([self.shifts, self.abschnitte])
+        self.app.delta_sync.track(
+            "schichtplanung", [shift("s1", "Alt", "v1"), shift("s2", "Alt", "v1")],
+            columns=("id", "titel", "updated_by_at")
+        )
+        self.app.delta_sync.track("abschnitte", [{"id": "a1", "abschnitt": "A1", "updated_at": "v1"}])
+        
+        self.feed = LocalChangeFeed()
+        self.live_updates = LiveUpdates(self.app, self.feed)
+        self.live_updates.start()
+    
+    def tearDown(self):
+        self.live_updates.stop()
+    
+    def test_subscribing_catches_up_once_instead_of_polling(self):
+        self.assertEqual(self.app.syncs, 1)
+        self.assertFalse(self.live_updates.polling)
+        
+        self.app.root.advance(POLL_INTERVAL * 3)
+        self.assertEqual(self.app.syncs, 1)
+    
+    def test_burst_of_changes_is_applied_once_per_table(self):
+        self.feed.publish("schichtplanung", "UPDATE", shift("s1", "Erste", "v2"))
+        self.feed.publish("schichtplanung", "UPDATE", shift("s1", "Letzte", "v3"))
+        self.feed.publish("schichtplanung", "INSERT", shift("s3", "Neu", "v2"))
+        
+        self.app.root.advance(DEBOUNCE_INTERVAL - 1)
+        self.assertEqual(self.shifts.changes, [])
+        
+        self.app.root.advance(1)
+        self.assertEqual(len(self.shifts.changes), 1)
+        upserted, deleted = self.shifts.changes[0]
+        self.assertEqual(
+            sorted(upserted, key=lambda row: row["id"]),
+            [shift("s1", "Letzte", "v3"), shift("s3", "Neu", "v2")]
+        )
+        self.assertEqual(deleted, [])
+    
+    def test_merged_rows_reach_the_view(self):
+        # Change feeds deliver all columns; the view gets the synced ones
+        self.feed.publish("schichtplanung", "UPDATE", shift("s1", "Neu", "v2", kommentare="x"))
+        self.feed.publish("schichtplanung", "DELETE", old_record={"id": "s2"})
+        # Unchanged rows are not applied again
+        self.feed.publish("schichtplanung", "UPDATE", shift("s1", "Neu", "v2"))
+        self.app.root.advance(DEBOUNCE_INTERVAL)
+        
+        self.assertEqual(self.shifts.changes, [([shift("s1", "Neu", "v2")], ["s2"])])
+        model = self.app.delta_sync.tables["schichtplanung"].model
+        self.assertEqual(sorted(model), ["s1"])
+        
+        self.feed.publish("schichtplanung", "UPDATE", shift("s1", "Neu", "v2"))
+        self.app.root.advance(DEBOUNCE_INTERVAL)
+        self.assertEqual(len(self.shifts.changes), 1)
+    
+    def test_master_data_changes_reload_the_dropdowns(self):
+        self.feed.publish("schichtplanung", "UPDATE", shift("s1", "Neu", "v2"))
+        self.app.root.advance(DEBOUNCE_INTERVAL)
+        self.assertEqual(self.app.dropdown_loads, 0)
+        
+        self.feed.publish("abschnitte", "UPDATE", {"id": "a1", "abschnitt": "A2", "updated_at": "v2"})
+        self.app.root.advance(DEBOUNCE_INTERVAL)
+        self.assertEqual(len(self.abschnitte.changes), 1)
+        self.assertEqual(self.app.dropdown_loads, 1)
+    
+    def test_disconnected_feed_falls_back_to_polling(self):
+        self.feed.set_status(CHANNEL_ERROR, ConnectionError("lost"))
+        self.assertTrue(self.live_updates.polling)
+        
+        self.app.root.advance(POLL_INTERVAL)
+        self.assertEqual(self.app.syncs, 2)
+        self.app.root.advance(POLL_INTERVAL)
+        self.assertEqual(self.app.syncs, 3)
+        
+        # Subscribed again: one catch-up sync, then no more polling
+        self.feed.set_status(SUBSCRIBED)
+        self.assertFalse(self.live_updates.polling)
+        self.assertEqual(self.app.syncs, 4)
+        self.app.root.advance(POLL_INTERVAL * 3)
+        self.assertEqual(self.app.syncs, 4)
+    
+    def test_stopped_updates_ignore_events(self):
+        self.live_updates.stop()
+        self.feed.publish("schichtplanung", "UPDATE", shift("s1", "Neu", "v2"))
+        self.app.root.advance(DEBOUNCE_INTERVAL)
+        self.assertEqual(self.shifts.changes, [])
+
+if __name__ == "__main__":
+    unittest.main()
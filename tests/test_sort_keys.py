@@ -0,0 +1,18 @@
+import unittest
+
+from utils.sort_keys import sort_items, value_key
+
+class ValueKeyTest(unittest.TestCase):
+
+    def test_only_finite_numbers_sort_as_numbers(self):
+        self.assertEqual(value_key("1,5"), (0, 1.5, ""))
+        for text in ("nan", "NaN", "inf", "-Infinity"):
+            self.assertEqual(value_key(text)[0], 1, text)
+    
+    def test_nan_text_keeps_equal_rows_in_order(self):
+        items = [("a", ("nan",)), ("b", ("2",)), ("c", ("nan",)), ("d", ("10",))]
+        ordered = sort_items(items, [(0, False)], {}, {})
+        self.assertEqual([item_id for item_id, _ in ordered], ["b", "d", "a", "c"])
+
+if __name__ == "__main__":
+    unittest.main()
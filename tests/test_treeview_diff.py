@@ -0,0 +1,102 @@
+import random
+import unittest
+
+from utils.treeview_diff import reconcile_items
+
+class FakeTreeview:
+    """Flat ttk.Treeview recording the calls made to it"""
+    
+    def __init__(self, items=()):
+        self.children = [item_id for item_id, _ in items]
+        self.values = {item_id: tuple(values) for item_id, values in items}
+        self.selected = set()
+        self.focused = ""
+        self.calls = []
+    
+    def get_children(self, item=""):
+        return tuple(self.children)
+    
+    def insert(self, parent, index, iid, values):
+        self.calls.append("insert")
+        self.values[iid] = tuple(values)
+        self.children.insert(index, iid)
+    
+    def delete(self, *items):
+        self.calls.append("delete")
+        for item_id in items:
+            self.children.remove(item_id)
+            del self.values[item_id]
+            self.selected.discard(item_id)
+    
+    def detach(self, *items):
+        # Tk drops detached rows from the selection
+        self.calls.append("detach")
+        for item_id in items:
+            self.children.remove(item_id)
+            self.selected.discard(item_id)
+    
+    def move(self, item_id, parent, index):
+        self.calls.append("move")
+        if item_id in self.children:
+            self.children.remove(item_id)
+        self.children.insert(index, item_id)
+    
+    def index(self, item_id):
+        self.calls.append("index")
+        return self.children.index(item_id)
+    
+    def item(self, item_id, option=None, values=None):
+        if values is None:
+            return self.values[item_id]
+        self.calls.append("item")
+        self.values[item_id] = tuple(values)
+    
+    def selection(self):
+        return tuple(self.selected)
+    
+    def selection_add(self, *items):
+        self.selected.update(items)
+    
+    def focus(self, item_id=None):
+        if item_id is None:
+            return self.focused
+        self.focused = item_id
+
+def rows(ids, version=0):
+    return [(item_id, (item_id, f"{item_id}-{version}")) for item_id in ids]
+
+class ReconcileItemsTest(unittest.TestCase):
+
+    def check(self, before, after):
+        tree = FakeTreeview(before)
+        counts = reconcile_items(tree, after)
+        self.assertEqual(list(tree.get_children()), [item_id for item_id, _ in after])
+        self.assertEqual([tree.values[item_id] for item_id in tree.children], [tuple(v) for _, v in after])
+        self.assertNotIn("index", tree.calls)
+        return tree, counts
+    
+    def test_random_changes_reach_the_wanted_rows(self):
+        generator = random.Random(7)
+        for _ in range(200):
+            before = rows(generator.sample(range(40), generator.randint(0, 30)))
+            after = rows(generator.sample(range(40), generator.randint(0, 30)), generator.randint(0, 1))
+            self.check(before, after)
+    
+    def test_small_change_touches_only_those_rows(self):
+        ids = list(range(1000))
+        after = rows(ids[:500] + [ids[700]] + ids[500:700] + ids[701:])
+        after[10] = (10, (10, "changed"))
+        tree, counts = self.check(rows(ids), after)
+        self.assertEqual(counts, {"inserted": 0, "updated": 1, "deleted": 0, "moved": 1})
+        self.assertEqual(tree.calls, ["detach", "item", "move"])
+    
+    def test_moved_rows_stay_selected_and_focused(self):
+        tree = FakeTreeview(rows("abcd"))
+        tree.selected = {"a", "c"}
+        tree.focused = "a"
+        reconcile_items(tree, rows("bcda"))
+        self.assertEqual(tree.selected, {"a", "c"})
+        self.assertEqual(tree.focused, "a")
+
+if __name__ == "__main__":
+    unittest.main()
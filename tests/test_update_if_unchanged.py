@@ -0,0 +1,93 @@
+import asyncio
+import json
+import unittest
+
+import httpx
+from supabase import AsyncClientOptions, ClientOptions, acreate_client, create_client
+
+from connectors.async_supabase_connector import AsyncSupabaseConnector
+from connectors.supabase_connector import SupabaseConnector
+
+URL = "https://example.supabase.co"
+KEY = "k" * 40
+
+class FakePostgrest:
+    """In-memory schichtplanung table answering PostgREST PATCH and GET requests"""
+    
+    def __init__(self, rows):
+        self.rows = {row["id"]: dict(row) for row in rows}
+        self.requests = []
+    
+    @staticmethod
+    def _matches(row, column, condition):
+        operator, _, value = condition.partition(".")
+        if operator == "is":
+            return row.get(column) is None
+        if operator == "in":
+            return row.get(column) in [item.strip('"') for item in value.strip("()").split(",")]
+        return str(row.get(column)) == value
+    
+    def handle(self, request):
+        self.requests.append(request.method)
+        filters = [(column, value) for column, value in request.url.params.multi_items() if column != "select"]
+        matching = [row for row in self.rows.values()
+                    if all(self._matches(row, column, value) for column, value in filters)]
+        if request.method == "PATCH":
+            changes = json.loads(request.content)
+            for row in matching:
+                row.update(changes, updated_by_at=f"{row['id']}-{len(self.requests)}")
+        return httpx.Response(200, json=matching)
+
+def shifts():
+    return [
+        {"id": "s1", "titel": "A", "updated_by_at": "v1"},
+        {"id": "s2", "titel": "B", "updated_by_at": "v2"},
+        {"id": "s3", "titel": "C", "updated_by_at": None},
+    ]
+
+# s1 is unchanged, s2 was changed by others, s4 was deleted by others
+EDITS = [
+    {"id": "s1", "titel": "A1"},
+    {"id": "s2", "titel": "B1"},
+    {"id": "s3", "titel": "C1"},
+    {"id": "s4", "titel": "D1"},
+]
+BASE_VERSIONS = {"s1": "v1", "s2": "v1", "s3": None}
+
+class UpdateIfUnchangedTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakePostgrest(shifts())
+    
+    def check_report(self, report):
+        self.assertEqual(sorted(row["id"] for row in report["updated"]), ["s1", "s3"])
+        conflicts = {conflict["id"]: conflict["current"] for conflict in report["conflicts"]}
+        self.assertEqual(sorted(conflicts), ["s2", "s4"])
+        self.assertEqual(conflicts["s2"]["titel"], "B")
+        self.assertIsNone(conflicts["s4"])
+        self.assertEqual(report["failed"], [])
+        
+        # Conflicting rows are left alone and deleted rows are not recreated
+        self.assertEqual(self.server.rows["s2"]["titel"], "B")
+        self.assertNotIn("s4", self.server.rows)
+        # One conditional PATCH per row, and one read for the conflicts only
+        self.assertEqual(self.server.requests, ["PATCH"] * 4 + ["GET"])
+    
+    def test_rows_are_updated_with_conditional_patches(self):
+        http_client = httpx.Client(transport=httpx.MockTransport(self.server.handle))
+        connector = SupabaseConnector(create_client(URL, KEY, ClientOptions(httpx_client=http_client)))
+        connector.update_rpc = None
+        self.check_report(connector.update_if_unchanged("schichtplanung", EDITS, BASE_VERSIONS))
+    
+    def test_async_rows_are_updated_with_conditional_patches(self):
+        async def update():
+            http_client = httpx.AsyncClient(transport=httpx.MockTransport(self.server.handle))
+            client = await acreate_client(URL, KEY, AsyncClientOptions(httpx_client=http_client))
+            connector = AsyncSupabaseConnector(client)
+            connector.update_rpc = None
+            return await connector.update_if_unchanged("schichtplanung", EDITS, BASE_VERSIONS)
+        
+        self.check_report(asyncio.run(update()))
+
+if __name__ == "__main__":
+    unittest.main()
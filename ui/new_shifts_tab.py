@@ -4,6 +4,7 @@ import datetime
 from tkcalendar import Calendar
 import uuid
 from utils.multiselect_dropdown import MultiSelectDropdown
+from connectors.write_queue import INSERT
 
 class NewShiftsTab:
     """UI component for the 'New Shifts' tab"""
@@ -350,16 +351,16 @@ class NewShiftsTab:
                                  "Bitte füllen Sie mindestens Titel, Zeit und Abschnitt aus.")
             return
         
-        # Prepare shifts for insertion
-        success_count = 0
-        for date in self.selected_dates:
-            # Format date as ISO string
-            date_iso = date.isoformat()
-            
-            # Prepare data for Supabase
-            shift_data = {
+        # Prepare shifts for insertion, one per selected date
+        dates = sorted(self.selected_dates)
+        shift_rows = []
+        for date in dates:
+            # Prepare data for Supabase; the ID is generated here, so the
+            # insert can be replayed safely from the offline write queue
+            shift_rows.append({
+                "id": str(uuid.uuid4()),
                 "titel": title,
-                "datum_von": date_iso,
+                "datum_von": date.isoformat(),  # Format date as ISO string
                 "schichtzeit": zeit,
                 "abschnitt": abschnitt,
                 "tatigkeit": activity,
@@ -373,45 +374,116 @@ class NewShiftsTab:
                 "diverse_maschinen": machines if machines else None,
                 "gleisbaumaschine": gbm_machines if gbm_machines else None,
                 "kommentare": comments if comments else None
-            }
+            })
+        
+        # Save to Supabase if connected
+        if self.app.is_supabase_connected:
+            # Insert all shifts in bulk in the background; either all are saved or none
+            self.submit_btn.configure(state="disabled")
+            self.app.io.submit(
+                self.app.supabase_connector.add_schichtplanung_many, shift_rows,
+                on_success=lambda outcomes: self.on_shifts_saved(dates, shift_rows, outcomes),
+                on_error=lambda e: self.on_shifts_save_failed(e, dates, shift_rows)
+            )
+            return
+        
+        # Without a connection, keep the shifts for the next replay
+        self.app.queue_writes("schichtplanung", INSERT, shift_rows)
+        self.add_shifts_to_view(dates, shift_rows)
+        self.finish_submit(len(shift_rows))
+    
+    def add_shifts_to_view(self, dates, shift_rows):
+        """Show shifts not saved to Supabase yet in the shifts view
+        
+        Args:
+            dates (list): Selected dates, in the order of the rows
+            shift_rows (list): Rows of the shifts
+        """
+        for date, row in zip(dates, shift_rows):
+            self.app.view_shifts_ui.add_shift_to_view(
+                row["id"], date.strftime("%d.%m.%Y"), row["titel"], row["schichtzeit"], row["abschnitt"],
+                ", ".join(row["baufuhrer"] or []), ", ".join(row["arbeitsleiter"] or []), row["tatigkeit"]
+            )
+    
+    def on_shifts_saved(self, dates, shift_rows, outcomes):
+        """Report the outcome of the bulk insert started by submit_shifts
+        
+        Args:
+            dates (list): Selected dates, in the order of the rows
+            shift_rows (list): Rows sent to Supabase
+            outcomes (list): Per-row outcomes of add_schichtplanung_many
+        """
+        self.submit_btn.configure(state="normal")
+        
+        failed = [(date, outcome) for date, outcome in zip(dates, outcomes)
+                  if outcome["status"] == "failed"]
+        not_saved = [outcome for outcome in outcomes if outcome["status"] != "inserted"]
+        
+        # Supabase is unreachable: keep the shifts for the next replay
+        if (failed and all(outcome["transient"] for _, outcome in failed)
+                and self.app.queue_writes("schichtplanung", INSERT, shift_rows)):
+            self.add_shifts_to_view(dates, shift_rows)
+            self.finish_submit(len(shift_rows))
+            return
+        
+        if not_saved:
+            failed_dates = ", ".join(date.strftime("%d.%m.%Y") for date, _ in failed)
+            error = failed[0][1]["error"] if failed else ""
             
-            # Save to Supabase if connected
-            if self.app.is_supabase_connected:
-                try:
-                    # Insert shift
-                    result = self.app.supabase_connector.add_schichtplanung(shift_data)
-                    if result:
-                        success_count += 1
-                except Exception as e:
-                    messagebox.showerror("Fehler", f"Fehler beim Speichern der Schicht: {str(e)}")
-                    continue
-            else:
-                # Just show success message when not connected
-                success_count += 1
-                
-                # Add to tree view for demonstration - pass to view shifts tab
-                date_str = date.strftime("%d.%m.%Y")
-                next_id = str(uuid.uuid4())
-                self.app.view_shifts_ui.add_shift_to_view(
-                    next_id, date_str, title, zeit, abschnitt, baufuhrer, arbeitsleiter, activity
+            # Shifts of which the rollback failed stay in the database
+            left = [(date, outcome) for date, outcome in zip(dates, outcomes) if "rollback_error" in outcome]
+            if left:
+                left_shifts = "\n".join(
+                    f"{date.strftime('%d.%m.%Y')}: {outcome['data']['titel']}" for date, outcome in left
                 )
+                messagebox.showerror("Fehler",
+                                    f"{len(not_saved)} von {len(shift_rows)} Schichten konnten nicht "
+                                    f"gespeichert werden.\nBetroffene Daten: {failed_dates}\nFehler: {error}\n\n"
+                                    f"{len(left)} bereits gespeicherte Schichten konnten nicht wieder "
+                                    f"entfernt werden und bleiben erhalten:\n{left_shifts}\n"
+                                    f"Fehler: {left[0][1]['rollback_error']}")
+                self.app.view_shifts_ui.refresh_data()
+                return
+            
+            messagebox.showerror("Fehler",
+                                f"{len(not_saved)} von {len(shift_rows)} Schichten konnten nicht "
+                                f"gespeichert werden. Es wurde keine Schicht hinzugefügt.\n"
+                                f"Betroffene Daten: {failed_dates}\nFehler: {error}")
+            return
         
+        self.finish_submit(len(shift_rows))
+        
+        # Refresh shifts view
+        self.app.view_shifts_ui.refresh_data()
+    
+    def on_shifts_save_failed(self, error, dates, shift_rows):
+        """Handle an error of the bulk insert started by submit_shifts
+        
+        Args:
+            error (Exception): Error raised by the connector
+            dates (list): Selected dates, in the order of the rows
+            shift_rows (list): Rows sent to Supabase
+        """
+        self.submit_btn.configure(state="normal")
+        if self.app.queue_if_offline(error, "schichtplanung", INSERT, shift_rows):
+            self.add_shifts_to_view(dates, shift_rows)
+            self.finish_submit(len(shift_rows))
+            return
+        messagebox.showerror("Fehler", f"Fehler beim Speichern der Schichten: {str(error)}")
+    
+    def finish_submit(self, count):
+        """Confirm the added shifts and reset the form
+        
+        Args:
+            count (int): Number of added shifts
+        """
         # Show confirmation
-        if success_count > 0:
-            if success_count == len(self.selected_dates):
-                messagebox.showinfo("Schichten hinzugefügt", 
-                                   f"Alle {success_count} Schichten wurden erfolgreich hinzugefügt.")
-            else:
-                messagebox.showinfo("Schichten hinzugefügt", 
-                                   f"{success_count} von {len(self.selected_dates)} Schichten wurden hinzugefügt.")
-            
-            # Clear form and selection
-            self.clear_form()
-            self.clear_calendar_selection()
-            
-            # Refresh shifts view
-            if self.app.is_supabase_connected:
-                self.app.view_shifts_ui.refresh_shifts_view()
+        messagebox.showinfo("Schichten hinzugefügt", 
+                           f"Alle {count} Schichten wurden erfolgreich hinzugefügt.")
+        
+        # Clear form and selection
+        self.clear_form()
+        self.clear_calendar_selection()
     
     def clear_form(self):
         """Clear all form fields"""
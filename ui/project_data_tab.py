@@ -1,5 +1,5 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
 
 from ui.project_sections.abschnitte_section import AbschnitteSection
 from ui.project_sections.schichtzeiten_section import SchichtzeitenSection
@@ -27,6 +27,9 @@ class ProjectDataTab:
         # Sections
         self.sections = {}
         
+        # Background load of all sections still in flight
+        self.refresh_group = None
+        
         # Set up individual sections
         self.setup_sections()
     
@@ -65,10 +68,47 @@ class ProjectDataTab:
         if self.app.is_supabase_connected:
             self.refresh_all_project_data()
     
-    def refresh_all_project_data(self):
-        """Refresh all data in the project data tab"""
+    def refresh_all_project_data(self, on_done=None):
+        """Refresh all data in the project data tab
+        
+        The tables of all sections are fetched concurrently in the background.
+        Once the last one arrives, all tables are updated in a single pass, so
+        the refresh takes about as long as the slowest table.
+        
+        Args:
+            on_done (function, optional): Called with the loaded rows by table
+                name once all sections were updated
+        """
+        if not self.app.is_supabase_connected:
+            return
+        
+        # A newer refresh replaces any load still in flight
+        if self.refresh_group:
+            self.refresh_group.cancel()
         for section in self.sections.values():
-            section.refresh_data()
+            if section.load_task:
+                section.load_task.cancel()
+                section.load_task = None
+        
+        def loaded(results, errors):
+            self.refresh_group = None
+            
+            # Apply all tables in one pass
+            for name, rows in results.items():
+                self.sections[name].display_rows(rows)
+            
+            if errors:
+                details = "\n".join(f"{self.sections[name].LOAD_ERROR}: {str(error)}"
+                                     for name, error in errors.items())
+                messagebox.showerror("Fehler", details)
+            
+            if on_done:
+                on_done({self.sections[name].TABLE: rows for name, rows in results.items()})
+        
+        self.refresh_group = self.app.io.submit_all(
+            {name: section.fetch_rows for name, section in self.sections.items()},
+            on_done=loaded
+        )
     
     def update_dropdown_values(self, dropdown_data):
         """Update dropdown values when data is refreshed
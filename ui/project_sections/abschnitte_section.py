@@ -1,11 +1,21 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import uuid
+from connectors.write_queue import INSERT
 from ui.project_sections.base_section import BaseSection
 
 class AbschnitteSection(BaseSection):
     """UI component for the Abschnitte section"""
     
+    # Database table edited by this section
+    TABLE = "abschnitte"
+    
+    # Fields requested from the database for this table
+    FIELDS = ("id", "abschnitt", "beschreibung", "updated_at")
+    
+    # Message shown when loading the table fails
+    LOAD_ERROR = "Fehler beim Aktualisieren der Abschnitte"
+    
     def __init__(self, parent, app):
         """Initialize the Abschnitte section
         
@@ -45,37 +55,23 @@ class AbschnitteSection(BaseSection):
         for item_id in self.abschnitte_tree.get_children():
             self.abschnitte_tree.all_items.append((item_id, self.abschnitte_tree.item(item_id, "values")))
     
-    def refresh_data(self):
-        """Refresh data from Supabase"""
-        if not self.app.is_supabase_connected:
-            return
+    def fetch_rows(self):
+        """Get the Abschnitte from Supabase - runs on a worker thread"""
+        return self.app.supabase_connector.get_abschnitte(columns=self.FIELDS)
+    
+    def row_to_values(self, item):
+        """Convert a row of the abschnitte table into tree values
         
-        try:
-            # Clear current display
-            for item in self.abschnitte_tree.get_children():
-                self.abschnitte_tree.delete(item)
-            
-            # Get data from Supabase
-            abschnitte = self.app.supabase_connector.get_abschnitte()
-            
-            # Populate tree
-            for item in abschnitte:
-                # Store description or empty string if it doesn't exist
-                beschreibung = item.get("beschreibung", "")
-                
-                self.abschnitte_tree.insert("", tk.END, iid=item["id"], values=(
-                    item["id"], item["abschnitt"], beschreibung
-                ))
+        Args:
+            item (dict): Row as returned by Supabase
             
-            # Update all_items for filtering
-            self.abschnitte_tree.all_items = []
-            for item_id in self.abschnitte_tree.get_children():
-                self.abschnitte_tree.all_items.append(
-                    (item_id, self.abschnitte_tree.item(item_id, "values"))
-                )
+        Returns:
+            tuple: Values in the order of the table columns
+        """
+        # Store description or empty string if it doesn't exist
+        beschreibung = item.get("beschreibung", "")
         
-        except Exception as e:
-            messagebox.showerror("Fehler", f"Fehler beim Aktualisieren der Abschnitte: {str(e)}")
+        return (item["id"], item["abschnitt"], beschreibung)
     
     def show_add_dialog(self, columns):
         """Show dialog to add a new item
@@ -137,8 +133,10 @@ class AbschnitteSection(BaseSection):
                 item_id = result[0]["id"]
                 all_values = (item_id, values["Abschnitt"], values.get("Beschreibung", ""))
             else:
+                # Without a connection, keep the new row for the next replay
                 item_id = str(uuid.uuid4())
                 all_values = (item_id, values["Abschnitt"], values.get("Beschreibung", ""))
+                self.app.queue_writes(self.TABLE, INSERT, [self.values_to_record(all_values)])
             
             # Insert into tree
             self.abschnitte_tree.insert("", tk.END, iid=item_id, values=all_values)
@@ -152,86 +150,13 @@ class AbschnitteSection(BaseSection):
         except Exception as e:
             messagebox.showerror("Fehler", f"Fehler beim Speichern: {str(e)}")
     
-    def save_table_edits(self):
-        """Save all edits made in edit mode to Supabase"""
-        if not self.abschnitte_tree:
-            return
-            
-        # Complete any ongoing edit
-        if self.abschnitte_tree.current_cell_editor:
-            self.finish_cell_edit(self.abschnitte_tree)
-        
-        # Update Supabase if connected
-        if self.app.is_supabase_connected:
-            try:
-                # Get all items
-                for item_id in self.abschnitte_tree.get_children():
-                    values = self.abschnitte_tree.item(item_id, "values")
-                    
-                    # Update Supabase
-                    self.app.supabase_connector.update_abschnitt(
-                        values[0],  # ID
-                        values[1],  # Abschnitt
-                        values[2]   # Beschreibung
-                    )
-                
-            except Exception as e:
-                messagebox.showerror("Fehler", f"Fehler beim Aktualisieren der Abschnitte: {str(e)}")
-        
-        # Exit edit mode
-        self.abschnitte_tree.edit_controls_frame.pack_forget()
-        self.abschnitte_tree.is_in_edit_mode = False
-        
-        # Re-enable regular buttons
-        for child in self.abschnitte_tree.btn_frame.winfo_children():
-            child.configure(state="normal")
-        
-        messagebox.showinfo("Änderungen gespeichert", "Ihre Änderungen wurden gespeichert.")
-        
-        # Update the list of all items for filtering
-        self.abschnitte_tree.all_items = []
-        for item_id in self.abschnitte_tree.get_children():
-            self.abschnitte_tree.all_items.append(
-                (item_id, self.abschnitte_tree.item(item_id, "values"))
-            )
-        
-        # Update dropdown data if connected to Supabase
-        if self.app.is_supabase_connected:
-            self.app.load_dropdown_data()
-            self.app.update_dropdown_values()
-    
-    def delete_selected_item(self):
-        """Delete the selected item from the treeview and Supabase"""
-        # Get selected item
-        selected = self.abschnitte_tree.selection()
-        if not selected:
-            messagebox.showwarning("Keine Auswahl", "Bitte wählen Sie einen Datensatz aus.")
-            return
+    def values_to_record(self, values):
+        """Convert tree values into a record of the abschnitte table
         
-        # Confirm deletion
-        if messagebox.askyesno("Löschen bestätigen", "Möchten Sie diesen Datensatz wirklich löschen?"):
-            for item in selected:
-                # Get item ID
-                item_id = self.abschnitte_tree.item(item, "values")[0]
-                
-                # Delete from Supabase if connected
-                if self.app.is_supabase_connected:
-                    try:
-                        self.app.supabase_connector.delete_abschnitt(item_id)
-                    except Exception as e:
-                        messagebox.showerror("Fehler", f"Fehler beim Löschen aus der Datenbank: {str(e)}")
-                        continue
-                
-                # Remove from all_items list for filtering
-                self.abschnitte_tree.all_items = [
-                    (id, vals) for id, vals in self.abschnitte_tree.all_items 
-                    if id != item
-                ]
-                
-                # Remove from tree
-                self.abschnitte_tree.delete(item)
+        Args:
+            values: Values of a tree row
             
-            # Update dropdown data if connected to Supabase
-            if self.app.is_supabase_connected:
-                self.app.load_dropdown_data()
-                self.app.update_dropdown_values() 
\ No newline at end of file
+        Returns:
+            dict: Record for the batched upsert
+        """
+        return {"id": values[0], "abschnitt": values[1], "beschreibung": values[2]}
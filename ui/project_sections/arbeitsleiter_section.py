@@ -6,6 +6,15 @@ from ui.project_sections.base_section import BaseSection
 class ArbeitsleiterSection(BaseSection):
     """UI component for the Arbeitsleiter section"""
     
+    # Database table edited by this section
+    TABLE = "arbeitsleiter"
+    
+    # Fields requested from the database for this table
+    FIELDS = ("id", "name", "telefonnummer", "email")
+    
+    # Message shown when loading the table fails
+    LOAD_ERROR = "Fehler beim Aktualisieren der Arbeitsleiter"
+    
     def __init__(self, parent, app):
         """Initialize the Arbeitsleiter section
         
@@ -47,37 +56,25 @@ class ArbeitsleiterSection(BaseSection):
         for item_id in self.arbeitsleiter_tree.get_children():
             self.arbeitsleiter_tree.all_items.append((item_id, self.arbeitsleiter_tree.item(item_id, "values")))
     
-    def refresh_data(self):
-        """Refresh data from Supabase"""
-        if not self.app.is_supabase_connected:
-            return
+    def fetch_rows(self):
+        """Get the Arbeitsleiter from Supabase - runs on a worker thread"""
+        return self.app.supabase_connector.get_arbeitsleiter(columns=self.FIELDS)
+    
+    def row_to_values(self, item):
+        """Convert a row of the arbeitsleiter table into tree values
         
-        try:
-            # Clear current display
-            for item in self.arbeitsleiter_tree.get_children():
-                self.arbeitsleiter_tree.delete(item)
-            
-            # Get data from Supabase
-            arbeitsleiter = self.app.supabase_connector.get_arbeitsleiter()
-            
-            # Populate tree
-            for item in arbeitsleiter:
-                self.arbeitsleiter_tree.insert("", tk.END, iid=item["id"], values=(
-                    item["id"], 
-                    item["name"], 
-                    item["telefonnummer"], 
-                    item["email"]
-                ))
+        Args:
+            item (dict): Row as returned by Supabase
             
-            # Update all_items for filtering
-            self.arbeitsleiter_tree.all_items = []
-            for item_id in self.arbeitsleiter_tree.get_children():
-                self.arbeitsleiter_tree.all_items.append(
-                    (item_id, self.arbeitsleiter_tree.item(item_id, "values"))
-                )
-        
-        except Exception as e:
-            messagebox.showerror("Fehler", f"Fehler beim Aktualisieren der Arbeitsleiter: {str(e)}")
+        Returns:
+            tuple: Values in the order of the table columns
+        """
+        return (
+            item["id"], 
+            item["name"], 
+            item["telefonnummer"], 
+            item["email"]
+        )
     
     def show_add_dialog(self, columns):
         """Show dialog to add a new item"""
@@ -89,12 +86,13 @@ class ArbeitsleiterSection(BaseSection):
         # TODO: Implement similar to AbschnitteSection with appropriate data
         pass
     
-    def save_table_edits(self):
-        """Save all edits made in edit mode to Supabase"""
-        # TODO: Implement similar to AbschnitteSection with appropriate data
-        pass
-    
-    def delete_selected_item(self):
-        """Delete the selected item from the treeview and Supabase"""
-        # TODO: Implement similar to AbschnitteSection with appropriate data
-        pass 
\ No newline at end of file
+    def values_to_record(self, values):
+        """Convert tree values into a record of the arbeitsleiter table
+        
+        Args:
+            values: Values of a tree row
+            
+        Returns:
+            dict: Record for the batched upsert
+        """
+        return {"id": values[0], "name": values[1], "telefonnummer": values[2], "email": values[3]}
@@ -1,9 +1,38 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+from connectors.write_queue import UPDATE, DELETE
+from utils.virtual_treeview import VirtualTreeview, SHIFT_MASK
+from utils.treeview_diff import reconcile_items
+from utils.filter_index import FilterIndex
+from utils.sort_keys import sort_items, value_key, date_key
+
+# Milliseconds typing in a filter entry has to pause before the table is filtered
+FILTER_DELAY = 200
 
 class BaseSection:
     """Base class for all project data sections"""
     
+    # Database table edited by this section
+    TABLE = None
+    
+    # Fields requested from the database for this table
+    FIELDS = None
+    
+    # Message shown when loading the table fails
+    LOAD_ERROR = "Fehler beim Aktualisieren der Daten"
+    
+    # Show the table in a VirtualTreeview, for tables with many thousand rows
+    VIRTUAL_TABLE = False
+    
+    # Columns filtered as dates (ranges "from..to") and as lists joined with
+    # ", " (any of "a, b"), see utils.filter_index.FilterIndex
+    DATE_COLUMNS = ()
+    LIST_COLUMNS = ()
+    
+    # Sort key functions of columns, see utils.sort_keys; DATE_COLUMNS sort
+    # as dates and all others by value_key
+    SORT_KEYS = {}
+    
     def __init__(self, parent, app):
         """Initialize the base section
         
@@ -15,6 +44,9 @@ class BaseSection:
         self.app = app
         self.tree = None
         
+        # Background load of the table still in flight
+        self.load_task = None
+        
     def create_data_table(self, columns, column_widths=None):
         """Create a standard data table with scrollbar
         
@@ -71,6 +103,9 @@ class BaseSection:
             entry = ttk.Entry(filter_frame, width=10)
             entry.grid(row=0, column=i*2+1, padx=2, pady=2)
             filter_entries[col] = entry
+            
+            # Filter as the user types
+            entry.bind("<KeyRelease>", lambda event: self.schedule_filters(filter_entries))
         
         # Add apply filter button
         filter_btn = ttk.Button(filter_frame, text="Filter anwenden", 
@@ -86,11 +121,13 @@ class BaseSection:
         tree_frame = ttk.Frame(frame)
         tree_frame.pack(fill=tk.BOTH, expand=True)
         
-        tree = ttk.Treeview(tree_frame, columns=columns, show="headings")
+        # Large tables only materialize the visible rows as Tk items
+        tree_class = VirtualTreeview if self.VIRTUAL_TABLE else ttk.Treeview
+        tree = tree_class(tree_frame, columns=columns, show="headings")
         
-        # Configure headings and column widths
+        # Configure headings and column widths; a heading click sorts
         for i, col in enumerate(columns):
-            tree.heading(col, text=col)
+            tree.heading(col, text=col, command=lambda col=col: self.sort_by(col))
             # Set column width if provided
             if column_widths and i < len(column_widths):
                 tree.column(col, width=column_widths[i])
@@ -113,6 +150,9 @@ class BaseSection:
         # Setup direct cell editing via double-click
         tree.bind("<Double-1>", lambda event, t=tree: self.on_cell_double_click(event, t))
         
+        # Heading commands get no event, so note whether Shift was held
+        tree.bind("<ButtonPress-1>", lambda event, t=tree: self.on_heading_press(event, t), add="+")
+        
         # Store references to components
         tree.btn_frame = btn_frame
         tree.edit_controls_frame = edit_controls_frame
@@ -120,7 +160,15 @@ class BaseSection:
         tree.filter_entries = filter_entries
         tree.is_in_edit_mode = False
         tree.all_items = []  # Store all items to support filtering
+        tree.filter_index = None  # Index over all_items, built when filtering
+        tree.last_filter = None  # (index, filters, positions) of the last filter pass
+        tree.filter_job = None  # Filter pass waiting for typing to pause
+        tree.sort_columns = []  # (column, descending) tuples, primary first
+        tree.sort_keys = {}  # Column index -> {cell value: sort key}
+        tree.sort_extend = False  # Shift held on the last heading press
         tree.current_cell_editor = None
+        tree.dirty_items = set()  # Items edited since the last save
+        tree.base_versions = {}  # Item ID -> version when it was first edited
         
         self.tree = tree
         return tree
@@ -156,7 +204,9 @@ class BaseSection:
             for child in self.tree.btn_frame.winfo_children():
                 child.configure(state="normal")
                 
-            # Refresh tree to original values
+            # Discard unsaved edits and refresh tree to original values
+            self.tree.dirty_items.clear()
+            self.tree.base_versions.clear()
             self.refresh_table_data()
     
     def on_cell_double_click(self, event, tree):
@@ -228,16 +278,49 @@ class BaseSection:
         col_idx = tree.current_cell_editor["column_index"]
         values = list(tree.item(item_id, "values"))
         
-        # Update the value
-        values[col_idx] = new_value
-        
-        # Update the item
-        tree.item(item_id, values=values)
+        # Update the value and remember the item as edited if it changed
+        if str(values[col_idx]) != new_value:
+            values[col_idx] = new_value
+            tree.item(item_id, values=values)
+            self.mark_edited(tree, item_id)
         
         # Remove the editor
         tree.current_cell_editor["entry"].destroy()
         tree.current_cell_editor = None
     
+    def mark_edited(self, tree, item_id):
+        """Remember a row as edited, with the version it was edited from
+        
+        Live updates and syncs keep advancing the delta sync model while
+        the user edits, so the version is taken when the row is first
+        edited; saves are conditional on that version.
+        
+        Args:
+            tree (ttk.Treeview): The edited tree
+            item_id: Tree item ID of the row
+        """
+        if item_id not in tree.dirty_items:
+            delta_sync = getattr(self.app, "delta_sync", None)
+            versions = delta_sync.versions(self.TABLE, [item_id]) if delta_sync and self.TABLE else {}
+            tree.base_versions[item_id] = versions.get(item_id)
+        tree.dirty_items.add(item_id)
+    
+    def get_base_versions(self, records):
+        """Get the versions the edited rows were edited from, see mark_edited
+        
+        Args:
+            records (list): Records including "id"
+            
+        Returns:
+            dict: Row ID -> version, for the rows with a known version
+        """
+        base_versions = {}
+        for record in records:
+            version = self.tree.base_versions.get(record["id"])
+            if version is not None:
+                base_versions[record["id"]] = version
+        return base_versions
+    
     def cancel_cell_edit(self, tree):
         """Cancel cell editing without saving"""
         if tree.current_cell_editor:
@@ -245,55 +328,373 @@ class BaseSection:
             tree.current_cell_editor = None
     
     def save_table_edits(self):
-        """Save all edits made in edit mode - to be implemented by subclasses"""
-        raise NotImplementedError("Subclasses must implement save_table_edits")
+        """Save all edits made in edit mode to Supabase
+        
+        Only the rows edited since entering edit mode are sent, in one
+        batched upsert (see values_to_record). Without a connection, the
+        edits are kept in the offline write queue.
+        """
+        if not self.tree:
+            return
+        
+        # Complete any ongoing edit
+        if self.tree.current_cell_editor:
+            self.finish_cell_edit(self.tree)
+        
+        try:
+            rows = [self.values_to_record(values) for _, values in self.get_dirty_rows()]
+        except Exception as e:
+            messagebox.showerror("Fehler", f"Fehler beim Aktualisieren der Datenbank: {str(e)}")
+            return
+        
+        # Update Supabase in the background if connected
+        if self.app.is_supabase_connected:
+            self.tree.edit_controls_frame.configure(cursor="watch")
+            self.app.io.submit(
+                self.app.supabase_connector.upsert_many, self.TABLE, rows,
+                on_success=lambda result: self.finish_save(),
+                on_error=lambda e: self.on_save_failed(e, rows)
+            )
+            return
+        
+        self.app.queue_writes(self.TABLE, UPDATE, rows, self.get_base_versions(rows))
+        self.finish_save()
+    
+    def on_save_failed(self, error, rows):
+        """Handle an error of the upsert started by save_table_edits
+        
+        If Supabase is unreachable, the edits are queued for the next
+        replay. Otherwise the table stays in edit mode, so the edits can be
+        saved again.
+        
+        Args:
+            error (Exception): Error raised by the connector
+            rows (list): Records sent in the upsert
+        """
+        if self.app.queue_if_offline(error, self.TABLE, UPDATE, rows, self.get_base_versions(rows)):
+            self.finish_save()
+            return
+        
+        self.tree.edit_controls_frame.configure(cursor="")
+        messagebox.showerror("Fehler", f"Fehler beim Aktualisieren der Datenbank: {str(error)}")
+    
+    def finish_save(self):
+        """Leave edit mode after the edits were saved"""
+        self.tree.edit_controls_frame.configure(cursor="")
+        self.tree.dirty_items.clear()
+        self.tree.base_versions.clear()
+        
+        # Exit edit mode
+        self.tree.edit_controls_frame.pack_forget()
+        self.tree.is_in_edit_mode = False
+        
+        # Re-enable regular buttons
+        for child in self.tree.btn_frame.winfo_children():
+            child.configure(state="normal")
+        
+        messagebox.showinfo("Änderungen gespeichert", "Ihre Änderungen wurden gespeichert.")
+        
+        # Update the list of all items for filtering; rows hidden by the
+        # filters were not edited
+        self.tree.all_items = [
+            (item_id, self.tree.item(item_id, "values") if self.tree.exists(item_id) else values)
+            for item_id, values in self.tree.all_items
+        ]
+        
+        # Update dropdown data if connected to Supabase
+        if self.app.is_supabase_connected:
+            self.app.load_dropdown_data(on_loaded=self.app.update_dropdown_values)
+    
+    def get_dirty_rows(self):
+        """Get the rows edited since the last save
+        
+        Returns:
+            list: (item_id, values) tuples of the edited rows still in the tree
+        """
+        return [
+            (item_id, self.tree.item(item_id, "values"))
+            for item_id in self.tree.dirty_items
+            if self.tree.exists(item_id)
+        ]
+    
+    def values_to_record(self, values):
+        """Convert tree values into a database record - to be implemented by subclasses
+        
+        Args:
+            values: Values of a tree row
+            
+        Returns:
+            dict: Record including the "id" column
+        """
+        raise NotImplementedError("Subclasses must implement values_to_record")
     
     def show_add_dialog(self, columns):
         """Show dialog to add a new item - to be implemented by subclasses"""
         raise NotImplementedError("Subclasses must implement show_add_dialog")
     
     def delete_selected_item(self):
-        """Delete the selected item - to be implemented by subclasses"""
-        raise NotImplementedError("Subclasses must implement delete_selected_item")
+        """Delete the selected items from the treeview and Supabase
+        
+        All selected rows are deleted together, with one request per chunk
+        of IDs. Without a connection, the deletes are kept in the offline
+        write queue.
+        """
+        # Get selected items
+        selected = self.tree.selection()
+        if not selected:
+            messagebox.showwarning("Keine Auswahl", "Bitte wählen Sie einen Datensatz aus.")
+            return
+        
+        # Confirm deletion
+        if not messagebox.askyesno("Löschen bestätigen", "Möchten Sie diesen Datensatz wirklich löschen?"):
+            return
+        
+        # Delete from Supabase in the background if connected
+        records = [{"id": self.tree.item(item, "values")[0]} for item in selected]
+        if self.app.is_supabase_connected:
+            self.app.io.submit(
+                self.app.supabase_connector.delete_many, self.TABLE, [record["id"] for record in records],
+                on_success=lambda result: self.finish_delete(selected),
+                on_error=lambda e: self.on_delete_failed(e, selected, records)
+            )
+            return
+        
+        self.app.queue_writes(self.TABLE, DELETE, records)
+        self.finish_delete(selected)
+    
+    def on_delete_failed(self, error, items, records):
+        """Handle an error of the delete started by delete_selected_item
+        
+        If Supabase is unreachable, the delete is queued for the next replay.
+        
+        Args:
+            error (Exception): Error raised by the connector
+            items: Tree item IDs of the rows to delete
+            records (list): {"id": ...} dicts of the rows to delete
+        """
+        if self.app.queue_if_offline(error, self.TABLE, DELETE, records):
+            self.finish_delete(items)
+            return
+        messagebox.showerror("Fehler", f"Fehler beim Löschen aus der Datenbank: {str(error)}")
+    
+    def finish_delete(self, items):
+        """Remove deleted items from the table
+        
+        Args:
+            items: Tree item IDs of the deleted rows
+        """
+        self.remove_items(items)
+        
+        # Update dropdown data if connected to Supabase
+        if self.app.is_supabase_connected:
+            self.app.load_dropdown_data(on_loaded=self.app.update_dropdown_values)
+    
+    def remove_items(self, items):
+        """Remove items from the tree and the list used for filtering
+        
+        Args:
+            items: Tree item IDs to remove
+        """
+        removed = set(items)
+        self.tree.all_items = [
+            (item_id, values) for item_id, values in self.tree.all_items
+            if item_id not in removed
+        ]
+        self.tree.dirty_items -= removed
+        for item_id in removed:
+            self.tree.base_versions.pop(item_id, None)
+        for item in items:
+            if self.tree.exists(item):
+                self.tree.delete(item)
+    
+    def schedule_filters(self, filter_entries):
+        """Apply the filters once typing pauses for FILTER_DELAY
+        
+        Each keystroke cancels the pass scheduled by the one before, so
+        only the last query is filtered.
+        """
+        if self.tree.filter_job is not None:
+            self.tree.after_cancel(self.tree.filter_job)
+        self.tree.filter_job = self.tree.after(FILTER_DELAY, lambda: self.apply_live_filters(filter_entries))
+    
+    def apply_live_filters(self, filter_entries):
+        """Apply the filters after typing paused, unless they did not change"""
+        self.tree.filter_job = None
+        last = self.tree.last_filter
+        if (last is not None and last[0] is self.tree.filter_index
+                and last[1] == self.get_filter_values(filter_entries)):
+            # E.g. only the cursor was moved
+            return
+        self.apply_filters(filter_entries)
     
     def apply_filters(self, filter_entries):
         """Apply filters to the table"""
         if self.tree:
-            # Clear current display
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-                
-            # Get filter values
-            filters = {}
-            for column, entry in filter_entries.items():
-                value = entry.get().strip().lower()
-                if value:
-                    filters[column] = value
+            # A pass waiting for typing to pause is superseded
+            if self.tree.filter_job is not None:
+                self.tree.after_cancel(self.tree.filter_job)
+                self.tree.filter_job = None
+            self.show_items(self.filter_items(self.tree.all_items, filter_entries))
+    
+    @staticmethod
+    def get_filter_values(filter_entries):
+        """Get the non-empty filter texts entered above the table
+        
+        Args:
+            filter_entries (dict): Column -> filter Entry
             
-            # If no filters, display all items
-            if not filters:
-                for item_id, values in self.tree.all_items:
-                    self.tree.insert("", tk.END, values=values)
-                return
-                
-            # Apply filters
-            for item_id, values in self.tree.all_items:
-                should_display = True
-                
-                for column, filter_value in filters.items():
-                    # Get the column index
-                    columns = self.tree["columns"]
-                    if column in columns:
-                        col_idx = columns.index(column)
-                        cell_value = str(values[col_idx]).lower()
-                        
-                        # Check if filter value is in the cell value
-                        if filter_value not in cell_value:
-                            should_display = False
-                            break
-                
-                if should_display:
-                    self.tree.insert("", tk.END, values=values)
+        Returns:
+            dict: Column -> filter text
+        """
+        filters = {}
+        for column, entry in filter_entries.items():
+            value = entry.get().strip()
+            if value:
+                filters[column] = value
+        return filters
+    
+    def filter_items(self, items, filter_entries):
+        """Get the items matching the filters entered above the table
+        
+        Args:
+            items (list): (item_id, values) tuples
+            filter_entries (dict): Column -> filter Entry
+            
+        Returns:
+            list: The matching items, in their order
+        """
+        filters = self.get_filter_values(filter_entries)
+        
+        # If no filters, display all items
+        if not filters:
+            return list(items)
+        
+        index = self.get_filter_index(items)
+        
+        # When the filters extend the last ones on the same items, e.g.
+        # "Nor" became "Nord", only the rows matched last time are checked
+        last = self.tree.last_filter
+        previous = last[1:] if last is not None and last[0] is index else None
+        positions = index.filter(filters, previous)
+        if items is self.tree.all_items:
+            self.tree.last_filter = (index, filters, positions)
+        return index.select(positions)
+    
+    def get_filter_index(self, items):
+        """Get the filter index over items, reusing the one of all_items
+        
+        The index of all_items is rebuilt once the list was replaced or
+        grew; apply_row_changes, which replaces items in place, drops it.
+        
+        Args:
+            items (list): (item_id, values) tuples
+            
+        Returns:
+            FilterIndex: The index
+        """
+        index = self.tree.filter_index
+        if index is not None and index.items is items and index.size == len(items):
+            return index
+        
+        index = FilterIndex(self.tree["columns"], items, self.DATE_COLUMNS, self.LIST_COLUMNS)
+        if items is self.tree.all_items:
+            self.tree.filter_index = index
+        return index
+    
+    def show_items(self, items):
+        """Show these items in the table, touching only the rows that differ
+        
+        The items are put in the sort order of the table first. Rows that
+        stay keep their selection and the scroll position is kept.
+        
+        Args:
+            items (list): (item_id, values) tuples in display order
+            
+        Returns:
+            dict: Number of rows inserted, updated, deleted and moved
+        """
+        return reconcile_items(self.tree, self.sort_items(items))
+    
+    def on_heading_press(self, event, tree):
+        """Remember whether a heading was pressed with Shift, see sort_by"""
+        if tree.identify_region(event.x, event.y) == "heading":
+            tree.sort_extend = bool(event.state & SHIFT_MASK)
+    
+    def sort_by(self, column):
+        """Sort the table by a column after its heading was clicked
+        
+        A click sorts by the column alone, or reverses it if the table is
+        sorted by it alone. A click with Shift adds the column as a further
+        sort column, or reverses it if it already is one.
+        
+        Args:
+            column (str): Column name
+        """
+        tree = self.tree
+        extend, tree.sort_extend = tree.sort_extend, False
+        
+        sort_columns = list(tree.sort_columns)
+        sorted_by = [sort_column for sort_column, _ in sort_columns]
+        if extend and column in sorted_by:
+            i = sorted_by.index(column)
+            sort_columns[i] = (column, not sort_columns[i][1])
+        elif extend:
+            sort_columns.append((column, False))
+        elif sorted_by == [column]:
+            sort_columns = [(column, not sort_columns[0][1])]
+        else:
+            sort_columns = [(column, False)]
+        tree.sort_columns = sort_columns
+        
+        self.update_sort_headings()
+        self.sort_table()
+    
+    def update_sort_headings(self):
+        """Mark the sort columns in the headings with their direction"""
+        tree = self.tree
+        sorted_by = [sort_column for sort_column, _ in tree.sort_columns]
+        for column in tree["columns"]:
+            text = column
+            if column in sorted_by:
+                i = sorted_by.index(column)
+                text += " ▼" if tree.sort_columns[i][1] else " ▲"
+                # Number the sort columns when there are several
+                if len(sorted_by) > 1:
+                    text += str(i + 1)
+            tree.heading(column, text=text)
+    
+    def sort_table(self):
+        """Put the shown rows in sort order, moving only rows out of place
+        
+        The shown values are kept, including edits not yet saved.
+        """
+        tree = self.tree
+        self.show_items([(item_id, tree.item(item_id, "values")) for item_id in tree.get_children()])
+    
+    def sort_items(self, items):
+        """Sort items by the sort columns of the table
+        
+        Sort keys are cached per distinct cell value, and rows with equal
+        keys keep their order.
+        
+        Args:
+            items (list): (item_id, values) tuples
+            
+        Returns:
+            list: The items in sort order
+        """
+        tree = self.tree
+        if not tree.sort_columns:
+            return items
+        
+        columns = list(tree["columns"])
+        sort_columns = []
+        key_functions = {}
+        for column, descending in tree.sort_columns:
+            col_idx = columns.index(column)
+            sort_columns.append((col_idx, descending))
+            key_functions[col_idx] = date_key if column in self.DATE_COLUMNS else self.SORT_KEYS.get(column, value_key)
+        return sort_items(items, sort_columns, key_functions, tree.sort_keys)
     
     def clear_filters(self, filter_entries):
         """Clear all filters"""
@@ -305,19 +706,147 @@ class BaseSection:
         self.apply_filters(filter_entries)
     
     def refresh_table_data(self):
-        """Refresh the table data to its original state"""
-        if self.tree:
-            # Clear current display
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-                
-            # Insert original items
-            for _, values in self.tree.all_items:
-                self.tree.insert("", tk.END, values=values)
+        """Show the current items again through the filters and sort order
+        
+        Rows edited and not yet saved keep their shown values and stay
+        visible, even if their stored values no longer match the filters.
+        """
+        if not self.tree:
+            return
+        items = self.filter_items(self.tree.all_items, self.tree.filter_entries)
+        
+        edited = {
+            item_id: self.tree.item(item_id, "values")
+            for item_id in self.tree.dirty_items if self.tree.exists(item_id)
+        }
+        if edited:
+            shown = {item_id for item_id, _ in items} | set(edited)
+            items = [
+                (item_id, edited.get(item_id, values))
+                for item_id, values in self.tree.all_items if item_id in shown
+            ]
+        self.show_items(items)
+    
+    def refresh_data(self, on_done=None):
+        """Reload the table from Supabase in the background
+        
+        The rows are fetched on the I/O executor and displayed once they
+        arrive; a load of this table still in flight is cancelled.
+        
+        Args:
+            on_done (function, optional): Called without arguments once the
+                table was loaded, or loading failed
+        """
+        if not self.app.is_supabase_connected:
+            return
+        
+        if self.load_task:
+            self.load_task.cancel()
+        
+        def loaded(rows):
+            self.load_task = None
+            self.display_rows(rows)
+            if on_done:
+                on_done()
+        
+        def failed(error):
+            self.load_task = None
+            messagebox.showerror("Fehler", f"{self.LOAD_ERROR}: {str(error)}")
+            if on_done:
+                on_done()
+        
+        self.load_task = self.app.io.submit(self.fetch_rows, on_success=loaded, on_error=failed)
+    
+    def fetch_rows(self):
+        """Get the rows of the table - to be implemented by subclasses
+        
+        Runs on a worker thread, so it must not touch any widgets.
+        
+        Returns:
+            list: Rows as returned by Supabase
+        """
+        raise NotImplementedError("Subclasses must implement fetch_rows")
     
-    def refresh_data(self):
-        """Refresh data from the data source - to be implemented by subclasses"""
-        raise NotImplementedError("Subclasses must implement refresh_data")
+    def row_to_values(self, item):
+        """Convert a database row into tree values - to be implemented by subclasses
+        
+        Args:
+            item (dict): Row as returned by Supabase
+            
+        Returns:
+            tuple: Values in the order of the table columns, ID first
+        """
+        raise NotImplementedError("Subclasses must implement row_to_values")
+    
+    def display_rows(self, rows, filters=None):
+        """Replace the table contents with the rows of a full load
+        
+        Only rows that changed since the last load are touched in the tree,
+        so the selection and the scroll position survive a reload. The rows
+        are also registered with the delta sync engine, so later
+        syncs only fetch the changes.
+        
+        Args:
+            rows (list): Rows as returned by Supabase
+            filters (list, optional): Filter tuples the rows were loaded with
+        """
+        # Keep all_items for filtering and show the matching ones
+        self.tree.all_items = []
+        for item in rows:
+            values = self.row_to_values(item)
+            self.tree.all_items.append((values[0], values))
+        self.refresh_table_data()
+        
+        self.track_rows(rows, filters)
+    
+    def track_rows(self, rows, filters=None):
+        """Register the rows of a full load with the delta sync engine
+        
+        Args:
+            rows (list): Rows as returned by Supabase
+            filters (list, optional): Filter tuples the rows were loaded with
+        """
+        delta_sync = getattr(self.app, "delta_sync", None)
+        if delta_sync is not None and self.TABLE:
+            delta_sync.track(self.TABLE, rows, self.FIELDS, filters)
+    
+    def apply_row_changes(self, upserted, deleted):
+        """Apply changed and deleted rows from a delta sync to the table
+        
+        The rows are merged into all_items and the table is shown again
+        through the filters and the sort order, touching only the rows that
+        differ. Rows edited in edit mode and not yet saved keep their local
+        values.
+        
+        Args:
+            upserted (list): New or changed rows as returned by Supabase
+            deleted (list): IDs of deleted rows
+        """
+        dirty = self.tree.dirty_items
+        positions = {item_id: i for i, (item_id, _) in enumerate(self.tree.all_items)}
+        
+        # Replace changed rows in place and append new ones
+        for item in upserted:
+            values = self.row_to_values(item)
+            item_id = values[0]
+            if item_id in dirty:
+                continue
+            if item_id in positions:
+                self.tree.all_items[positions[item_id]] = (item_id, values)
+            else:
+                positions[item_id] = len(self.tree.all_items)
+                self.tree.all_items.append((item_id, values))
+        
+        removed = {item_id for item_id in deleted if item_id not in dirty}
+        if removed:
+            self.tree.all_items = [
+                (item_id, values) for item_id, values in self.tree.all_items
+                if item_id not in removed
+            ]
+        
+        # The index holds the replaced values, so filter with a new one
+        self.tree.filter_index = None
+        self.refresh_table_data()
     
     def update_dropdown_values(self, dropdown_data):
         """Update dropdown values when data is refreshed - to be implemented by subclasses that need it"""
@@ -1,11 +1,21 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import uuid
+from connectors.write_queue import INSERT
 from ui.project_sections.base_section import BaseSection
 
 class InventarSection(BaseSection):
     """UI component for the Inventar section"""
     
+    # Database table edited by this section
+    TABLE = "inventar"
+    
+    # Fields requested from the database for this table
+    FIELDS = ("id", "maschine", "firma", "type")
+    
+    # Message shown when loading the table fails
+    LOAD_ERROR = "Fehler beim Aktualisieren des Inventars"
+    
     def __init__(self, parent, app):
         """Initialize the Inventar section
         
@@ -53,37 +63,25 @@ class InventarSection(BaseSection):
         for item_id in self.inventar_tree.get_children():
             self.inventar_tree.all_items.append((item_id, self.inventar_tree.item(item_id, "values")))
     
-    def refresh_data(self):
-        """Refresh data from Supabase"""
-        if not self.app.is_supabase_connected:
-            return
+    def fetch_rows(self):
+        """Get the Inventar from Supabase - runs on a worker thread"""
+        return self.app.supabase_connector.get_inventar(columns=self.FIELDS)
+    
+    def row_to_values(self, item):
+        """Convert a row of the inventar table into tree values
         
-        try:
-            # Clear current display
-            for item in self.inventar_tree.get_children():
-                self.inventar_tree.delete(item)
-            
-            # Get data from Supabase
-            inventar = self.app.supabase_connector.get_inventar()
-            
-            # Populate tree
-            for item in inventar:
-                self.inventar_tree.insert("", tk.END, iid=item["id"], values=(
-                    item["id"], 
-                    item["maschine"], 
-                    item["firma"], 
-                    item["type"]
-                ))
+        Args:
+            item (dict): Row as returned by Supabase
             
-            # Update all_items for filtering
-            self.inventar_tree.all_items = []
-            for item_id in self.inventar_tree.get_children():
-                self.inventar_tree.all_items.append(
-                    (item_id, self.inventar_tree.item(item_id, "values"))
-                )
-        
-        except Exception as e:
-            messagebox.showerror("Fehler", f"Fehler beim Aktualisieren des Inventars: {str(e)}")
+        Returns:
+            tuple: Values in the order of the table columns
+        """
+        return (
+            item["id"], 
+            item["maschine"], 
+            item["firma"], 
+            item["type"]
+        )
     
     def show_add_dialog(self, columns):
         """Show dialog to add a new item
@@ -154,8 +152,10 @@ class InventarSection(BaseSection):
                 item_id = result[0]["id"]
                 all_values = (item_id, values["Maschine"], values["Firma"], values["Type"])
             else:
+                # Without a connection, keep the new row for the next replay
                 item_id = str(uuid.uuid4())
                 all_values = (item_id, values["Maschine"], values["Firma"], values["Type"])
+                self.app.queue_writes(self.TABLE, INSERT, [self.values_to_record(all_values)])
             
             # Insert into tree
             self.inventar_tree.insert("", tk.END, iid=item_id, values=all_values)
@@ -169,86 +169,13 @@ class InventarSection(BaseSection):
         except Exception as e:
             messagebox.showerror("Fehler", f"Fehler beim Speichern: {str(e)}")
     
-    def save_table_edits(self):
-        """Save all edits made in edit mode to Supabase"""
-        if self.inventar_tree:
-            # Complete any ongoing edit
-            if self.inventar_tree.current_cell_editor:
-                self.finish_cell_edit(self.inventar_tree)
-            
-            # Update Supabase if connected
-            if self.app.is_supabase_connected:
-                try:
-                    # Get all items
-                    for item_id in self.inventar_tree.get_children():
-                        values = self.inventar_tree.item(item_id, "values")
-                        
-                        # Update Supabase
-                        self.app.supabase_connector.update_inventar(
-                            values[0],  # ID
-                            values[1],  # Maschine
-                            values[2],  # Firma
-                            values[3]   # Type
-                        )
-                        
-                except Exception as e:
-                    messagebox.showerror("Fehler", f"Fehler beim Aktualisieren der Datenbank: {str(e)}")
-                    return
-            
-            # Exit edit mode
-            self.inventar_tree.edit_controls_frame.pack_forget()
-            self.inventar_tree.is_in_edit_mode = False
-            
-            # Re-enable regular buttons
-            for child in self.inventar_tree.btn_frame.winfo_children():
-                child.configure(state="normal")
-            
-            messagebox.showinfo("Änderungen gespeichert", "Ihre Änderungen wurden gespeichert.")
-            
-            # Update the list of all items for filtering
-            self.inventar_tree.all_items = []
-            for item_id in self.inventar_tree.get_children():
-                self.inventar_tree.all_items.append(
-                    (item_id, self.inventar_tree.item(item_id, "values"))
-                )
-            
-            # Update dropdown data if connected to Supabase
-            if self.app.is_supabase_connected:
-                self.app.load_dropdown_data()
-                self.app.update_dropdown_values()
-    
-    def delete_selected_item(self):
-        """Delete the selected item from the treeview and Supabase"""
-        # Get selected item
-        selected = self.inventar_tree.selection()
-        if not selected:
-            messagebox.showwarning("Keine Auswahl", "Bitte wählen Sie einen Datensatz aus.")
-            return
+    def values_to_record(self, values):
+        """Convert tree values into a record of the inventar table
         
-        # Confirm deletion
-        if messagebox.askyesno("Löschen bestätigen", "Möchten Sie diesen Datensatz wirklich löschen?"):
-            for item in selected:
-                # Get item ID
-                item_id = self.inventar_tree.item(item, "values")[0]
-                
-                # Delete from Supabase if connected
-                if self.app.is_supabase_connected:
-                    try:
-                        self.app.supabase_connector.delete_inventar(item_id)
-                    except Exception as e:
-                        messagebox.showerror("Fehler", f"Fehler beim Löschen aus der Datenbank: {str(e)}")
-                        continue
-                
-                # Remove from all_items list for filtering
-                self.inventar_tree.all_items = [
-                    (id, vals) for id, vals in self.inventar_tree.all_items 
-                    if id != item
-                ]
-                
-                # Remove from tree
-                self.inventar_tree.delete(item)
+        Args:
+            values: Values of a tree row
             
-            # Update dropdown data if connected to Supabase
-            if self.app.is_supabase_connected:
-                self.app.load_dropdown_data()
-                self.app.update_dropdown_values() 
\ No newline at end of file
+        Returns:
+            dict: Record for the batched upsert
+        """
+        return {"id": values[0], "maschine": values[1], "firma": values[2], "type": values[3]}
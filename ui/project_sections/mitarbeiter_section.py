@@ -6,6 +6,15 @@ from ui.project_sections.base_section import BaseSection
 class MitarbeiterSection(BaseSection):
     """UI component for the Mitarbeiter section"""
     
+    # Database table edited by this section
+    TABLE = "personal"
+    
+    # Fields requested from the database for this table
+    FIELDS = ("id", "name", "funktion", "telefonnummer", "email")
+    
+    # Message shown when loading the table fails
+    LOAD_ERROR = "Fehler beim Aktualisieren der Mitarbeiter"
+    
     def __init__(self, parent, app):
         """Initialize the Mitarbeiter section
         
@@ -50,38 +59,26 @@ class MitarbeiterSection(BaseSection):
         for item_id in self.mitarbeiter_tree.get_children():
             self.mitarbeiter_tree.all_items.append((item_id, self.mitarbeiter_tree.item(item_id, "values")))
     
-    def refresh_data(self):
-        """Refresh data from Supabase"""
-        if not self.app.is_supabase_connected:
-            return
+    def fetch_rows(self):
+        """Get the Mitarbeiter from Supabase - runs on a worker thread"""
+        return self.app.supabase_connector.get_personal(columns=self.FIELDS)
+    
+    def row_to_values(self, item):
+        """Convert a row of the personal table into tree values
         
-        try:
-            # Clear current display
-            for item in self.mitarbeiter_tree.get_children():
-                self.mitarbeiter_tree.delete(item)
-            
-            # Get data from Supabase
-            personal = self.app.supabase_connector.get_personal()
-            
-            # Populate tree
-            for item in personal:
-                self.mitarbeiter_tree.insert("", tk.END, iid=item["id"], values=(
-                    item["id"], 
-                    item["name"], 
-                    item.get("funktion", ""), 
-                    item.get("telefonnummer", ""), 
-                    item.get("email", "")
-                ))
+        Args:
+            item (dict): Row as returned by Supabase
             
-            # Update all_items for filtering
-            self.mitarbeiter_tree.all_items = []
-            for item_id in self.mitarbeiter_tree.get_children():
-                self.mitarbeiter_tree.all_items.append(
-                    (item_id, self.mitarbeiter_tree.item(item_id, "values"))
-                )
-        
-        except Exception as e:
-            messagebox.showerror("Fehler", f"Fehler beim Aktualisieren der Mitarbeiter: {str(e)}")
+        Returns:
+            tuple: Values in the order of the table columns
+        """
+        return (
+            item["id"], 
+            item["name"], 
+            item.get("funktion", ""), 
+            item.get("telefonnummer", ""), 
+            item.get("email", "")
+        )
     
     def show_add_dialog(self, columns):
         """Show dialog to add a new item"""
@@ -93,12 +90,19 @@ class MitarbeiterSection(BaseSection):
         # TODO: Implement similar to AbschnitteSection with appropriate data
         pass
     
-    def save_table_edits(self):
-        """Save all edits made in edit mode to Supabase"""
-        # TODO: Implement similar to AbschnitteSection with appropriate data
-        pass
-    
-    def delete_selected_item(self):
-        """Delete the selected item from the treeview and Supabase"""
-        # TODO: Implement similar to AbschnitteSection with appropriate data
-        pass 
\ No newline at end of file
+    def values_to_record(self, values):
+        """Convert tree values into a record of the personal table
+        
+        Args:
+            values: Values of a tree row
+            
+        Returns:
+            dict: Record for the batched upsert
+        """
+        return {
+            "id": values[0],
+            "name": values[1],
+            "funktion": values[2],
+            "telefonnummer": values[3],
+            "email": values[4]
+        }
@@ -2,10 +2,23 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import uuid
 from ui.project_sections.base_section import BaseSection
+from utils.sort_keys import time_key
 
 class SchichtzeitenSection(BaseSection):
     """UI component for the Schichtzeiten section"""
     
+    # Database table edited by this section
+    TABLE = "schichtzeiten"
+    
+    # Fields requested from the database for this table
+    FIELDS = ("id", "schicht", "zeit_von", "zeit_bis", "updated_at")
+    
+    # Message shown when loading the table fails
+    LOAD_ERROR = "Fehler beim Aktualisieren der Schichtzeiten"
+    
+    # Sort the times by time of day
+    SORT_KEYS = {"Zeit von": time_key, "Zeit bis": time_key}
+    
     def __init__(self, parent, app):
         """Initialize the Schichtzeiten section
         
@@ -48,37 +61,25 @@ class SchichtzeitenSection(BaseSection):
         for item_id in self.schichtzeiten_tree.get_children():
             self.schichtzeiten_tree.all_items.append((item_id, self.schichtzeiten_tree.item(item_id, "values")))
     
-    def refresh_data(self):
-        """Refresh data from Supabase"""
-        if not self.app.is_supabase_connected:
-            return
+    def fetch_rows(self):
+        """Get the Schichtzeiten from Supabase - runs on a worker thread"""
+        return self.app.supabase_connector.get_schichtzeiten(columns=self.FIELDS)
+    
+    def row_to_values(self, item):
+        """Convert a row of the schichtzeiten table into tree values
         
-        try:
-            # Clear current display
-            for item in self.schichtzeiten_tree.get_children():
-                self.schichtzeiten_tree.delete(item)
-            
-            # Get data from Supabase
-            schichtzeiten = self.app.supabase_connector.get_schichtzeiten()
-            
-            # Populate tree
-            for item in schichtzeiten:
-                self.schichtzeiten_tree.insert("", tk.END, iid=item["id"], values=(
-                    item["id"], 
-                    item["schicht"], 
-                    item["zeit_von"], 
-                    item["zeit_bis"]
-                ))
+        Args:
+            item (dict): Row as returned by Supabase
             
-            # Update all_items for filtering
-            self.schichtzeiten_tree.all_items = []
-            for item_id in self.schichtzeiten_tree.get_children():
-                self.schichtzeiten_tree.all_items.append(
-                    (item_id, self.schichtzeiten_tree.item(item_id, "values"))
-                )
-        
-        except Exception as e:
-            messagebox.showerror("Fehler", f"Fehler beim Aktualisieren der Schichtzeiten: {str(e)}")
+        Returns:
+            tuple: Values in the order of the table columns
+        """
+        return (
+            item["id"], 
+            item["schicht"], 
+            item["zeit_von"], 
+            item["zeit_bis"]
+        )
     
     def show_add_dialog(self, columns):
         """Show dialog to add a new item"""
@@ -90,12 +91,13 @@ class SchichtzeitenSection(BaseSection):
         # TODO: Implement similar to AbschnitteSection with appropriate data
         pass
     
-    def save_table_edits(self):
-        """Save all edits made in edit mode to Supabase"""
-        # TODO: Implement similar to AbschnitteSection with appropriate data
-        pass
-    
-    def delete_selected_item(self):
-        """Delete the selected item from the treeview and Supabase"""
-        # TODO: Implement similar to AbschnitteSection with appropriate data
-        pass 
\ No newline at end of file
+    def values_to_record(self, values):
+        """Convert tree values into a record of the schichtzeiten table
+        
+        Args:
+            values: Values of a tree row
+            
+        Returns:
+            dict: Record for the batched upsert
+        """
+        return {"id": values[0], "schicht": values[1], "zeit_von": values[2], "zeit_bis": values[3]}
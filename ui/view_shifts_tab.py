@@ -3,10 +3,33 @@ from tkinter import ttk, messagebox
 import uuid
 import datetime
 from ui.project_sections.base_section import BaseSection
+from connectors.schema import VERSION_COLUMNS
+from connectors.supabase_connector import shift_filters
+from connectors.write_queue import UPDATE, DELETE
+
+# Default number of weeks shown after the current week
+DEFAULT_WINDOW_WEEKS = 4
 
 class ViewShiftsTab(BaseSection):
     """UI component for the 'View Shifts' tab"""
     
+    # Database table shown in this tab
+    TABLE = "schichtplanung"
+    
+    # Date windows can hold tens of thousands of shifts
+    VIRTUAL_TABLE = True
+    
+    # Filter datum by date range and the joined array columns by element
+    DATE_COLUMNS = ("datum",)
+    LIST_COLUMNS = ("baufuhrer", "arbeitsleiter", "gleisbaumaschine", "diverse_maschinen")
+    
+    # Fields requested from the database for the shifts table
+    FIELDS = (
+        "id", "datum_von", "titel", "schichtzeit", "abschnitt", "baufuhrer", "arbeitsleiter",
+        "tatigkeit", "baugruppe", "ako", "sc_1", "siwa_1", "logistikpersonal",
+        "gleisbaumaschine", "diverse_maschinen", "kommentare", "updated_by_at"
+    )
+    
     def __init__(self, parent, app):
         """Initialize the View Shifts tab
         
@@ -16,6 +39,17 @@ class ViewShiftsTab(BaseSection):
         """
         super().__init__(parent, app)
         
+        # Date window of the loaded shifts: current week and the next four weeks
+        today = datetime.date.today()
+        self.date_from = today - datetime.timedelta(days=today.weekday())
+        self.date_to = self.date_from + datetime.timedelta(weeks=DEFAULT_WINDOW_WEEKS + 1, days=-1)
+        
+        # Background load of the summary panel still in flight
+        self.summary_task = None
+        
+        # Shifts received by the load in flight, as (item_id, values)
+        self.loaded_items = []
+        
         # Set up the UI
         self.setup_ui()
         
@@ -27,6 +61,10 @@ class ViewShiftsTab(BaseSection):
     
     def setup_ui(self):
         """Set up the UI components"""
+        # Date window controls and summary above the table
+        self.setup_window_controls()
+        self.setup_summary_panel()
+        
         # Define columns and their widths
         columns = [
             'id', 'datum', 'titel', 'zeit', 'abschnitt', 'baufuhrer', 'arbeitsleiter',
@@ -59,149 +97,541 @@ class ViewShiftsTab(BaseSection):
         # Store reference to tree
         self.tree = self.shifts_tree
     
-    def refresh_data(self):
-        """Refresh data from Supabase"""
+    def setup_window_controls(self):
+        """Set up the controls selecting the date window of loaded shifts"""
+        window_frame = ttk.Frame(self.parent)
+        window_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+        
+        ttk.Label(window_frame, text="Zeitraum von:").pack(side=tk.LEFT, padx=(5, 2))
+        self.date_from_entry = ttk.Entry(window_frame, width=12)
+        self.date_from_entry.pack(side=tk.LEFT, padx=2)
+        
+        ttk.Label(window_frame, text="bis:").pack(side=tk.LEFT, padx=(5, 2))
+        self.date_to_entry = ttk.Entry(window_frame, width=12)
+        self.date_to_entry.pack(side=tk.LEFT, padx=2)
+        
+        ttk.Button(window_frame, text="Anzeigen",
+                  command=self.apply_date_window).pack(side=tk.LEFT, padx=5)
+        ttk.Button(window_frame, text="4 Wochen früher",
+                  command=lambda: self.widen_date_window(weeks_before=4)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(window_frame, text="4 Wochen später",
+                  command=lambda: self.widen_date_window(weeks_after=4)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(window_frame, text="Alle Schichten",
+                  command=self.show_all_dates).pack(side=tk.LEFT, padx=5)
+        
+        # Progress of the load in flight
+        self.cancel_load_btn = ttk.Button(window_frame, text="Abbrechen", state="disabled",
+                                          command=self.cancel_refresh)
+        self.cancel_load_btn.pack(side=tk.RIGHT, padx=5)
+        self.load_status_label = ttk.Label(window_frame, text="")
+        self.load_status_label.pack(side=tk.RIGHT, padx=5)
+        
+        self.update_window_entries()
+    
+    def setup_summary_panel(self):
+        """Set up the panel showing the aggregates of the date window
+        
+        The numbers are computed by the database (see get_shift_counts), so
+        they are shown before the shifts themselves have been loaded.
+        """
+        summary_frame = ttk.LabelFrame(self.parent, text="Übersicht", padding=5)
+        summary_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+        
+        self.summary_label = ttk.Label(summary_frame, text="")
+        self.summary_label.pack(anchor=tk.W)
+        
+        tables_frame = ttk.Frame(summary_frame)
+        tables_frame.pack(fill=tk.X)
+        
+        # One small table per aggregate: (key, headings, column widths)
+        self.summary_trees = {}
+        for key, headings, widths in (
+            ("shifts_per_day", ("Tag", "Abschnitt", "Schichten"), (90, 150, 80)),
+            ("headcount_per_schichtzeit", ("Schichtzeit", "Personal"), (150, 80)),
+            ("machine_days_per_type", ("Typ", "Maschinentage"), (150, 100)),
+        ):
+            frame = ttk.Frame(tables_frame)
+            frame.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
+            
+            tree = ttk.Treeview(frame, columns=headings, show="headings", height=4)
+            for heading, width in zip(headings, widths):
+                tree.heading(heading, text=heading)
+                tree.column(heading, width=width)
+            scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+            tree.configure(yscrollcommand=scrollbar.set)
+            tree.pack(side=tk.LEFT, fill=tk.X, expand=True)
+            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            self.summary_trees[key] = tree
+    
+    def refresh_summary(self):
+        """Load the aggregates of the date window for the summary panel"""
         if not self.app.is_supabase_connected:
             return
         
+        if self.summary_task:
+            self.summary_task.cancel()
+        
+        # At startup the other reads are served from the disk cache inline;
+        # the aggregates are not persisted, so load them in the background
+        # once the window is shown instead of blocking it on Supabase
+        if self.app.io.is_inline:
+            self.summary_label.configure(text="Loading summary...")
+            self.app.root.after_idle(self.refresh_summary)
+            return
+        
+        def failed(error):
+            self.summary_task = None
+            self.summary_label.configure(text=f"Summary not available: {str(error)}")
+        
+        self.summary_task = self.app.io.submit(
+            self.app.supabase_connector.get_shift_counts, self.date_from, self.date_to,
+            on_success=self.show_summary,
+            on_error=failed
+        )
+    
+    def show_summary(self, counts):
+        """Show the aggregates loaded by refresh_summary
+        
+        Args:
+            counts (dict): Result of get_shift_counts
+        """
+        self.summary_task = None
+        self.summary_label.configure(text=f"{counts['shifts']} Schichten im Zeitraum")
+        
+        for key, tree in self.summary_trees.items():
+            tree.delete(*tree.get_children())
+            rows = counts[key]
+            if rows is None:
+                # Breakdowns need the counts RPC, see sql/get_shift_counts.sql
+                tree.insert("", tk.END, values=("n/a",))
+                continue
+            for row in rows:
+                if key == "shifts_per_day":
+                    datum = datetime.date.fromisoformat(row["datum"]).strftime("%d.%m.%Y") if row["datum"] else ""
+                    values = (datum, row["abschnitt"] or "", row["shifts"])
+                elif key == "headcount_per_schichtzeit":
+                    values = (row["schichtzeit"] or "", row["headcount"])
+                else:
+                    values = (row["type"] or "", row["machine_days"])
+                tree.insert("", tk.END, values=values)
+    
+    def apply_row_changes(self, upserted, deleted):
+        """Apply changed and deleted shifts to the table and update the summary"""
+        super().apply_row_changes(upserted, deleted)
+        self.refresh_summary()
+    
+    def update_window_entries(self):
+        """Show the current date window in the entry fields"""
+        for entry, value in ((self.date_from_entry, self.date_from), (self.date_to_entry, self.date_to)):
+            entry.delete(0, tk.END)
+            if value:
+                entry.insert(0, value.strftime("%d.%m.%Y"))
+    
+    def apply_date_window(self):
+        """Load the shifts for the dates entered in the window controls
+        
+        An empty field leaves that side of the window open.
+        """
         try:
-            # Clear current display
-            for item in self.shifts_tree.get_children():
-                self.shifts_tree.delete(item)
-            
-            # Initialize all_items if it doesn't exist
-            if not hasattr(self.shifts_tree, 'all_items'):
-                self.shifts_tree.all_items = []
-            
-            # Get data from Supabase
-            shifts = self.app.supabase_connector.get_schichtplanung()
-            
-            # Ensure shifts is not None and is iterable
-            if shifts is None:
-                shifts = []
+            dates = []
+            for entry in (self.date_from_entry, self.date_to_entry):
+                text = entry.get().strip()
+                dates.append(datetime.datetime.strptime(text, "%d.%m.%Y").date() if text else None)
+        except ValueError:
+            messagebox.showerror("Error", "Invalid date format. Please use DD.MM.YYYY format.")
+            return
+        
+        self.date_from, self.date_to = dates
+        self.refresh_data()
+    
+    def widen_date_window(self, weeks_before=0, weeks_after=0):
+        """Extend the date window and reload the shifts
+        
+        Args:
+            weeks_before (int): Weeks to add before the window start
+            weeks_after (int): Weeks to add after the window end
+        """
+        if self.date_from and weeks_before:
+            self.date_from -= datetime.timedelta(weeks=weeks_before)
+        if self.date_to and weeks_after:
+            self.date_to += datetime.timedelta(weeks=weeks_after)
+        self.update_window_entries()
+        self.refresh_data()
+    
+    def show_all_dates(self):
+        """Remove the date window and load all shifts"""
+        self.date_from = None
+        self.date_to = None
+        self.update_window_entries()
+        self.refresh_data()
+    
+    def refresh_data(self, on_done=None):
+        """Refresh data from Supabase
+        
+        Shifts are streamed in batches on the I/O executor and shown as
+        they arrive, so the table fills up progressively while the window
+        stays responsive. The shown rows are updated in place rather than
+        cleared, and rows that are gone are removed once the load is done,
+        so the selection and the scroll position survive a reload. A load
+        still in flight is cancelled.
+        
+        Args:
+            on_done (function, optional): Called without arguments once all
+                shifts were loaded, or loading failed
+        """
+        if not self.app.is_supabase_connected:
+            return
+        
+        if self.load_task:
+            self.load_task.cancel()
+        
+        # The aggregates arrive long before the shifts of a large window
+        self.refresh_summary()
+        
+        self.loaded_items = []
+        rows = []
+        filters = shift_filters(self.date_from, self.date_to)
+        
+        def on_batch(batch):
+            self.insert_shifts(batch)
+            rows.extend(batch)
+            self.show_load_status(f"{len(rows)} shifts loaded...", loading=True)
+        
+        def loaded(batch_count):
+            self.load_task = None
+            self.show_loaded_shifts()
+            self.show_load_status(f"{len(rows)} shifts")
             
-            # Populate tree
-            for item in shifts:
-                # Format date
-                datum = item.get("datum_von", "")
-                if datum:
-                    try:
-                        # Try to parse the date if it's a string
-                        if isinstance(datum, str):
-                            datum = datetime.datetime.fromisoformat(datum.replace('Z', '+00:00'))
-                        # Format as DD.MM.YYYY
-                        datum = datum.strftime("%d.%m.%Y")
-                    except Exception:
-                        pass
-                
-                # Handle array/list values (convert to string)
-                baufuhrer = item.get("baufuhrer", "")
-                if isinstance(baufuhrer, list) and baufuhrer:
-                    baufuhrer = ", ".join(baufuhrer)
-                
-                arbeitsleiter = item.get("arbeitsleiter", "")
-                if isinstance(arbeitsleiter, list) and arbeitsleiter:
-                    arbeitsleiter = ", ".join(arbeitsleiter)
-                
-                gleisbaumaschine = item.get("gleisbaumaschine", "")
-                if isinstance(gleisbaumaschine, list) and gleisbaumaschine:
-                    gleisbaumaschine = ", ".join(gleisbaumaschine)
-                
-                diverse_maschinen = item.get("diverse_maschinen", "")
-                if isinstance(diverse_maschinen, list) and diverse_maschinen:
-                    diverse_maschinen = ", ".join(diverse_maschinen)
-                
-                values = (
-                    item.get("id", str(uuid.uuid4())),  # Ensure we always have an ID
-                    datum,
-                    item.get("titel", ""),
-                    item.get("schichtzeit", ""),
-                    item.get("abschnitt", ""),
-                    baufuhrer,
-                    arbeitsleiter,
-                    item.get("tatigkeit", ""),
-                    item.get("baugruppe", ""),
-                    item.get("ako", ""),
-                    item.get("sc_1", ""),
-                    item.get("siwa_1", ""),
-                    item.get("logistikpersonal", ""),
-                    gleisbaumaschine,
-                    diverse_maschinen,
-                    item.get("kommentare", "")
-                )
-                
-                try:
-                    self.shifts_tree.insert("", tk.END, iid=values[0], values=values)
-                except tk.TclError as e:
-                    print(f"Error inserting item: {e}")
-                    continue
+            # Later syncs only fetch the shifts changed since this load
+            self.track_rows(rows, filters)
+            if on_done:
+                on_done()
+        
+        def failed(error):
+            self.load_task = None
+            self.show_loaded_shifts()
+            self.show_load_status(f"{len(rows)} shifts (incomplete)")
+            messagebox.showerror("Error", f"Failed to load shifts data from database: {str(error)}")
+            if on_done:
+                on_done()
+        
+        # Stream the shifts of the selected date window from Supabase
+        self.show_load_status("Loading shifts...", loading=True)
+        self.load_task = self.app.io.submit_iter(
+            self.app.supabase_connector.iter_schichtplanung,
+            self.date_from, self.date_to, columns=self.FIELDS,
+            on_item=on_batch, on_success=loaded, on_error=failed
+        )
+    
+    def cancel_refresh(self):
+        """Stop the load in flight, keeping the shifts received so far"""
+        if self.load_task:
+            self.load_task.cancel()
+            self.load_task = None
+            self.show_loaded_shifts()
+            self.show_load_status(f"{len(self.shifts_tree.all_items)} shifts (cancelled)")
+    
+    def show_load_status(self, text, loading=False):
+        """Show the state of the shift load next to the window controls
+        
+        Args:
+            text (str): Status text
+            loading (bool): Whether a load is in flight and can be cancelled
+        """
+        self.load_status_label.configure(text=text)
+        self.cancel_load_btn.configure(state="normal" if loading else "disabled")
+    
+    def insert_shifts(self, shifts):
+        """Show a batch of shift rows while the load is in flight
+        
+        Shown rows are updated in place and new rows matching the filters
+        are appended; show_loaded_shifts puts them in order at the end.
+        
+        Args:
+            shifts (list): Shift rows as returned by Supabase
+        """
+        items = [(values[0], values) for values in map(self.row_to_values, shifts)]
+        self.loaded_items.extend(items)
+        
+        for item_id, values in self.filter_items(items, self.shifts_tree.filter_entries):
+            try:
+                if self.shifts_tree.exists(item_id):
+                    self.shifts_tree.item(item_id, values=values)
+                else:
+                    self.shifts_tree.insert("", tk.END, iid=item_id, values=values)
+            except tk.TclError as e:
+                print(f"Error inserting item: {e}")
+    
+    def show_loaded_shifts(self):
+        """Replace the shown shifts with those received by the last load
+        
+        Only the rows that differ are touched: shifts no longer loaded are
+        removed and the rest are put in load order.
+        """
+        self.shifts_tree.all_items = self.loaded_items
+        self.refresh_table_data()
+    
+    def row_to_values(self, item):
+        """Convert a shift row from Supabase into tree values
+        
+        Args:
+            item (dict): Shift row
             
-            # Update all_items for filtering
-            self.shifts_tree.all_items = []
-            for item_id in self.shifts_tree.get_children():
-                self.shifts_tree.all_items.append(
-                    (item_id, self.shifts_tree.item(item_id, "values"))
-                )
+        Returns:
+            tuple: Values in the order of the table columns
+        """
+        # Format date
+        datum = item.get("datum_von", "")
+        if datum:
+            try:
+                # Try to parse the date if it's a string
+                if isinstance(datum, str):
+                    datum = datetime.datetime.fromisoformat(datum.replace('Z', '+00:00'))
+                # Format as DD.MM.YYYY
+                datum = datum.strftime("%d.%m.%Y")
+            except Exception:
+                pass
         
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load shifts data from database: {str(e)}")
-            raise  # Re-raise the exception for debugging
+        # Handle array/list values (convert to string)
+        baufuhrer = item.get("baufuhrer", "")
+        if isinstance(baufuhrer, list) and baufuhrer:
+            baufuhrer = ", ".join(baufuhrer)
+        
+        arbeitsleiter = item.get("arbeitsleiter", "")
+        if isinstance(arbeitsleiter, list) and arbeitsleiter:
+            arbeitsleiter = ", ".join(arbeitsleiter)
+        
+        gleisbaumaschine = item.get("gleisbaumaschine", "")
+        if isinstance(gleisbaumaschine, list) and gleisbaumaschine:
+            gleisbaumaschine = ", ".join(gleisbaumaschine)
+        
+        diverse_maschinen = item.get("diverse_maschinen", "")
+        if isinstance(diverse_maschinen, list) and diverse_maschinen:
+            diverse_maschinen = ", ".join(diverse_maschinen)
+        
+        return (
+            item.get("id", str(uuid.uuid4())),  # Ensure we always have an ID
+            datum,
+            item.get("titel", ""),
+            item.get("schichtzeit", ""),
+            item.get("abschnitt", ""),
+            baufuhrer,
+            arbeitsleiter,
+            item.get("tatigkeit", ""),
+            item.get("baugruppe", ""),
+            item.get("ako", ""),
+            item.get("sc_1", ""),
+            item.get("siwa_1", ""),
+            item.get("logistikpersonal", ""),
+            gleisbaumaschine,
+            diverse_maschinen,
+            item.get("kommentare", "")
+        )
     
     def save_table_edits(self):
-        """Save all edits made in edit mode to Supabase"""
+        """Save all edits made in edit mode to Supabase
+        
+        Only the rows edited since entering edit mode are sent, each on
+        condition that nobody else changed it since it was first edited
+        (see mark_edited). Rows
+        changed by others are shown for merging. Without a connection, the
+        edits are kept in the offline write queue.
+        """
+        # Complete any ongoing edit
+        if self.shifts_tree.current_cell_editor:
+            self.finish_cell_edit(self.shifts_tree)
+        
+        rows = []
+        for item_id, values in self.get_dirty_rows():
+            try:
+                rows.append(self.values_to_record(values))
+            except ValueError:
+                messagebox.showerror("Error", f"Invalid date format: {values[1]}. Please use DD.MM.YYYY format.")
+                return
+        
         if not self.app.is_supabase_connected:
-            messagebox.showerror("Error", "Not connected to database")
+            self.app.queue_writes(self.TABLE, UPDATE, rows, self.get_base_versions(rows))
+            self.finish_save()
             return
         
-        try:
-            for item_id in self.shifts_tree.get_children():
-                values = self.shifts_tree.item(item_id)['values']
-                
-                # Convert date from DD.MM.YYYY to YYYY-MM-DD
-                date_str = values[1]  # Get date in DD.MM.YYYY format
-                try:
-                    # Parse the German format date
-                    date_obj = datetime.datetime.strptime(date_str, "%d.%m.%Y")
-                    # Convert to ISO format
-                    iso_date = date_obj.strftime("%Y-%m-%d")
-                except ValueError as e:
-                    messagebox.showerror("Error", f"Invalid date format: {date_str}. Please use DD.MM.YYYY format.")
-                    return
-                
-                # Convert string lists back to arrays
-                baufuhrer = [x.strip() for x in values[5].split(",")] if values[5] else []
-                arbeitsleiter = [x.strip() for x in values[6].split(",")] if values[6] else []
-                gleisbaumaschine = [x.strip() for x in values[13].split(",")] if values[13] else []
-                diverse_maschinen = [x.strip() for x in values[14].split(",")] if values[14] else []
-                
-                # Convert values to dictionary
-                update_data = {
-                    'datum_von': iso_date,  # Use ISO format date
-                    'titel': values[2],
-                    'schichtzeit': values[3],  # zeit
-                    'abschnitt': values[4],
-                    'baufuhrer': baufuhrer,
-                    'arbeitsleiter': arbeitsleiter,
-                    'tatigkeit': values[7],
-                    'baugruppe': values[8],
-                    'ako': values[9],
-                    'sc_1': values[10],
-                    'siwa_1': values[11],
-                    'logistikpersonal': values[12],
-                    'gleisbaumaschine': gleisbaumaschine,
-                    'diverse_maschinen': diverse_maschinen,
-                    'kommentare': values[15]
-                }
-                
-                # Update in Supabase
-                self.app.supabase_connector.update_schichtplanung(values[0], update_data)
+        self.save_rows(rows, self.get_base_versions(rows))
+    
+    def save_rows(self, rows, base_versions):
+        """Update shift rows in Supabase in the background unless changed by others
+        
+        Args:
+            rows (list): Records to save
+            base_versions (dict): Row ID -> version the row was edited from
+        """
+        self.app.io.submit(
+            self.app.supabase_connector.update_if_unchanged, self.TABLE, rows, base_versions,
+            on_success=self.on_rows_saved,
+            on_error=lambda e: self.on_save_failed(e, rows, base_versions)
+        )
+    
+    def on_rows_saved(self, result):
+        """Handle the outcome of the conditional updates started by save_rows
+        
+        Args:
+            result (dict): Result of update_if_unchanged
+        """
+        # Later saves of these rows are based on the versions just written
+        if result["updated"] and self.app.delta_sync.is_tracked(self.TABLE):
+            self.app.delta_sync.apply_changes(self.TABLE, result["updated"], [])
+        
+        if result["failed"]:
+            failed = result["failed"]
+            if not (result["transient"] and self.app.queue_writes(self.TABLE, UPDATE, failed, self.get_base_versions(failed))):
+                messagebox.showerror(
+                    "Error", f"Failed to save {len(result['failed'])} changes: {result['error']}")
+                return
+        
+        if result["conflicts"]:
+            self.show_conflicts(result["conflicts"])
+            return
+        
+        self.finish_save()
+    
+    def show_conflicts(self, conflicts):
+        """Let the user merge edited shifts that others changed in the meantime
+        
+        Each conflict lists the fields where the edited row and the row as
+        stored now differ. The user either keeps their edits, overwriting
+        the changes of others, or discards them.
+        
+        Args:
+            conflicts (list): Conflicts reported by update_if_unchanged
+        """
+        version_column = VERSION_COLUMNS[self.TABLE]
+        
+        dialog = tk.Toplevel(self.app.root)
+        dialog.title("Conflicting changes")
+        dialog.geometry("800x400")
+        dialog.transient(self.app.root)
+        dialog.grab_set()
+        
+        frame = ttk.Frame(dialog, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(
+            frame,
+            text=f"{len(conflicts)} shifts were changed or deleted by someone else since they were loaded."
+        ).pack(anchor=tk.W)
+        
+        # One line per differing field of each conflicting shift
+        tree_frame = ttk.Frame(frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True, pady=(5, 10))
+        tree = ttk.Treeview(tree_frame, columns=("shift", "field", "yours", "current"), show="headings")
+        for column, heading, width in (("shift", "Shift", 220), ("field", "Field", 120),
+                                       ("yours", "Your value", 200), ("current", "Current value", 200)):
+            tree.heading(column, text=heading)
+            tree.column(column, width=width)
+        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        for conflict in conflicts:
+            record = conflict["record"]
+            current = conflict["current"]
+            shift = f"{self.row_to_values(record)[1]} {record.get('titel', '')}".strip()
+            if current is None:
+                tree.insert("", tk.END, values=(shift, "", "(edited)", "(deleted)"))
+                continue
             
-            messagebox.showinfo("Success", "Changes saved successfully")
-            self.exit_edit_mode()
-            self.refresh_data()
+            # Compare like the table shows the values, without the ID
+            yours = self.row_to_values(record)[1:]
+            theirs = self.row_to_values(current)[1:]
+            for field, mine, current_value in zip(self.FIELDS[1:], yours, theirs):
+                if mine != current_value:
+                    tree.insert("", tk.END, values=(shift, field, mine, current_value))
+        
+        def keep_mine():
+            # Save again, based on the versions stored now; deleted shifts
+            # are created again
+            dialog.destroy()
+            rows = [conflict["record"] for conflict in conflicts]
+            for conflict in conflicts:
+                current = conflict["current"]
+                self.shifts_tree.base_versions[conflict["id"]] = current[version_column] if current is not None else None
+            self.save_rows(rows, self.get_base_versions(rows))
+        
+        def keep_theirs():
+            dialog.destroy()
+            self.finish_save()
+        
+        btn_frame = ttk.Frame(frame)
+        btn_frame.pack(fill=tk.X)
+        ttk.Button(btn_frame, text="Keep my changes", command=keep_mine).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(btn_frame, text="Discard my changes", command=keep_theirs).pack(side=tk.LEFT)
+    
+    def on_save_failed(self, error, rows, base_versions=None):
+        """Handle an error of the updates started by save_rows
+        
+        Args:
+            error (Exception): Error raised by the connector
+            rows (list): Records sent in the updates
+            base_versions (dict, optional): Versions the updates were based on
+        """
+        if self.app.queue_if_offline(error, self.TABLE, UPDATE, rows, base_versions):
+            self.finish_save()
+            return
+        messagebox.showerror("Error", f"Failed to save changes: {str(error)}")
+    
+    def finish_save(self):
+        """Leave edit mode after the edits were saved and reload the shifts"""
+        messagebox.showinfo("Success", "Changes saved successfully")
+        
+        # Keep the saved values when leaving edit mode, as the reload is
+        # skipped while offline
+        saved = dict(self.get_dirty_rows())
+        self.shifts_tree.all_items = [
+            (item_id, saved.get(item_id, values)) for item_id, values in self.shifts_tree.all_items
+        ]
+        
+        self.exit_edit_mode()
+        self.refresh_data()
+    
+    def values_to_record(self, values):
+        """Convert tree values into a record of the schichtplanung table
+        
+        Args:
+            values: Values of a tree row
             
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save changes: {str(e)}")
+        Returns:
+            dict: Record for the batched upsert
+            
+        Raises:
+            ValueError: If the date is not in DD.MM.YYYY format
+        """
+        # Convert date from DD.MM.YYYY to YYYY-MM-DD
+        date_obj = datetime.datetime.strptime(values[1], "%d.%m.%Y")
+        iso_date = date_obj.strftime("%Y-%m-%d")
+        
+        # Convert string lists back to arrays
+        baufuhrer = [x.strip() for x in values[5].split(",")] if values[5] else []
+        arbeitsleiter = [x.strip() for x in values[6].split(",")] if values[6] else []
+        gleisbaumaschine = [x.strip() for x in values[13].split(",")] if values[13] else []
+        diverse_maschinen = [x.strip() for x in values[14].split(",")] if values[14] else []
+        
+        return {
+            'id': values[0],
+            'datum_von': iso_date,  # Use ISO format date
+            'titel': values[2],
+            'schichtzeit': values[3],  # zeit
+            'abschnitt': values[4],
+            'baufuhrer': baufuhrer,
+            'arbeitsleiter': arbeitsleiter,
+            'tatigkeit': values[7],
+            'baugruppe': values[8],
+            'ako': values[9],
+            'sc_1': values[10],
+            'siwa_1': values[11],
+            'logistikpersonal': values[12],
+            'gleisbaumaschine': gleisbaumaschine,
+            'diverse_maschinen': diverse_maschinen,
+            'kommentare': values[15]
+        }
     
     def show_add_dialog(self, columns):
         """Show dialog to add a new item - not implemented for shifts view"""
@@ -217,20 +647,40 @@ class ViewShiftsTab(BaseSection):
         if not messagebox.askyesno("Confirm Delete", "Are you sure you want to delete the selected items?"):
             return
         
+        records = [{"id": self.shifts_tree.item(item)['values'][0]} for item in selected_items]
         if not self.app.is_supabase_connected:
-            messagebox.showerror("Error", "Not connected to database")
+            self.app.queue_writes(self.TABLE, DELETE, records)
+            self.finish_delete(selected_items)
             return
         
-        try:
-            for item in selected_items:
-                item_id = self.shifts_tree.item(item)['values'][0]
-                self.app.supabase_connector.delete_schichtplanung(item_id)
-                self.shifts_tree.delete(item)
-            
-            messagebox.showinfo("Success", "Items deleted successfully")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to delete items: {str(e)}")
+        # Delete all selected shifts together in the background, one request per chunk of IDs
+        self.app.io.submit(
+            self.app.supabase_connector.delete_many, "schichtplanung", [record["id"] for record in records],
+            on_success=lambda result: self.finish_delete(selected_items),
+            on_error=lambda e: self.on_delete_failed(e, selected_items, records)
+        )
+    
+    def on_delete_failed(self, error, items, records):
+        """Handle an error of the delete started by delete_selected_item
+        
+        Args:
+            error (Exception): Error raised by the connector
+            items: Tree item IDs of the shifts to delete
+            records (list): {"id": ...} dicts of the shifts to delete
+        """
+        if self.app.queue_if_offline(error, self.TABLE, DELETE, records):
+            self.finish_delete(items)
+            return
+        messagebox.showerror("Error", f"Failed to delete items: {str(error)}")
+    
+    def finish_delete(self, items):
+        """Remove deleted shifts from the table
+        
+        Args:
+            items: Tree item IDs of the deleted shifts
+        """
+        self.remove_items(items)
+        messagebox.showinfo("Success", "Items deleted successfully")
     
     def add_shift_to_view(self, shift_id, datum, titel, zeit, abschnitt, baufuhrer, arbeitsleiter, tatigkeit,
                          baugruppe="", ako="", sc_1="", siwa_1="", logistikpersonal="", 
@@ -268,25 +718,30 @@ class ViewShiftsTab(BaseSection):
         self.shifts_tree.all_items.append((shift_id, values))
     
     def get_options_for_column(self, column):
-        """Get available options for a column from related tables"""
+        """Get available options for a column from related tables
+        
+        The connector caches these tables, so opening the editor repeatedly
+        does not cause any requests.
+        """
         if not self.app.is_supabase_connected:
             return []
             
         try:
             if column == 'baufuhrer':
-                baufuhrer = self.app.supabase_connector.get_baufuhrer()
+                baufuhrer = self.app.supabase_connector.get_baufuhrer(columns=["name"])
                 return [item['name'] for item in baufuhrer] if baufuhrer else []
             elif column == 'arbeitsleiter':
-                arbeitsleiter = self.app.supabase_connector.get_arbeitsleiter()
+                arbeitsleiter = self.app.supabase_connector.get_arbeitsleiter(columns=["name"])
                 return [item['name'] for item in arbeitsleiter] if arbeitsleiter else []
             elif column == 'baugruppe':
-                baugruppen = self.app.supabase_connector.get_baugruppen()
-                return [item['name'] for item in baugruppen] if baugruppen else []
+                # Baugruppe holds the assigned staff (Mitarbeiter)
+                personal = self.app.supabase_connector.get_personal(columns=["name"])
+                return [item['name'] for item in personal] if personal else []
             elif column == 'gleisbaumaschine':
-                maschinen = self.app.supabase_connector.get_inventar()
+                maschinen = self.app.supabase_connector.get_inventar(columns=["maschine", "type"])
                 return [item['maschine'] for item in maschinen if item.get('type') == 'GBM'] if maschinen else []
             elif column == 'diverse_maschinen':
-                maschinen = self.app.supabase_connector.get_inventar()
+                maschinen = self.app.supabase_connector.get_inventar(columns=["maschine", "type"])
                 return [item['maschine'] for item in maschinen if item.get('type') == 'Diverses'] if maschinen else []
         except Exception as e:
             print(f"Error getting options for {column}: {str(e)}")
@@ -377,10 +832,11 @@ class ViewShiftsTab(BaseSection):
                 selections = [listbox.get(i) for i in listbox.curselection()]
                 new_value = ", ".join(selections)
                 
-                # Update the tree
+                # Update the tree and remember the item as edited
                 values = list(tree.item(item_id)['values'])
                 values[column_index] = new_value
                 tree.item(item_id, values=values)
+                self.mark_edited(tree, item_id)
                 
                 dialog.destroy()
             
@@ -405,7 +861,7 @@ class ViewShiftsTab(BaseSection):
             
             # Store reference to current editor
             tree.current_cell_editor = {
-                'widget': entry,
+                'entry': entry,
                 'item_id': item_id,
                 'column': column,
                 'column_index': column_index
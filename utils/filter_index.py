@@ -0,0 +1,359 @@
+import bisect
+import datetime
+
+# Columns with more distinct values than this are filtered through a
+# trigram index instead of a value index
+MAX_INDEXED_VALUES = 2000
+
+# Length of the substrings in the trigram index
+NGRAM_SIZE = 3
+
+# Separates the bounds of a date range, e.g. "01.10.2026..31.10.2026"
+RANGE_SEPARATOR = ".."
+
+# Separates the values of a set filter on list columns, e.g. "Müller, Meier"
+LIST_SEPARATOR = ","
+
+DATE_FORMATS = ("%d.%m.%Y", "%Y-%m-%d")
+
+def parse_date(text):
+    """Parse a date as shown in the tables (DD.MM.YYYY) or in ISO format
+    
+    Args:
+        text (str): Date text
+    
+    Returns:
+        datetime.date: The date, or None if the text is no date
+    """
+    text = str(text).strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+def to_bitset(positions, size):
+    """Build a bitset (an int with bit i set for row i) from row positions"""
+    buffer = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+class FilterIndex:
+    """Column-oriented index over the items of a table for fast filtering
+    
+    Filters on several columns are combined by intersecting the bitsets of
+    the rows matching each column. Per column, built on first use:
+    
+    - cells lowercased once, for substring scans
+    - a value index (lowercased value -> bitset) if the column has few
+      distinct values, so a substring filter only scans those values
+    - otherwise a trigram index (three-character substring -> bitset),
+      filled with the trigrams filtered for, so a substring filter only
+      checks the rows holding all its trigrams
+    - for date columns, the parsed dates sorted for range lookups
+    - for list columns (values joined with ", "), a token index over the
+      single elements for set membership
+    
+    A filter that only extends the text filters of an earlier one (typing
+    "Nor", then "Nord") rechecks just the rows the earlier one matched.
+    
+    The index is a snapshot: build a new one when the items change.
+    """
+    
+    def __init__(self, columns, items, date_columns=(), list_columns=()):
+        """Initialize the index
+        
+        Args:
+            columns (list): Column names, in the order of the item values
+            items (list): (item_id, values) tuples
+            date_columns (tuple): Columns holding dates
+            list_columns (tuple): Columns holding lists joined with ", "
+        """
+        self.columns = list(columns)
+        self.items = items
+        self.size = len(items)
+        self.all = (1 << self.size) - 1
+        self.date_columns = set(date_columns)
+        self.list_columns = set(list_columns)
+        self._text = {}
+        self._values = {}
+        self._ngrams = {}
+        self._tokens = {}
+        self._dates = {}
+    
+    def filter(self, filters, previous=None):
+        """Get the positions of the rows matching all filters
+        
+        Args:
+            filters (dict): Column -> filter text, see match
+            previous (tuple, optional): (filters, positions) of an earlier
+                call on this index; if the filters narrow those, only these
+                positions are checked
+            
+        Returns:
+            list: Positions of the matching rows, in order
+        """
+        if previous is not None:
+            positions = self._narrow(filters, *previous)
+            if positions is not None:
+                return positions
+        return self.positions(self.match(filters))
+    
+    def match(self, filters):
+        """Get the rows matching all filters
+        
+        Args:
+            filters (dict): Column -> filter text. Text filters match
+                case-insensitive substrings. Date columns also take ranges
+                "from..to" with either bound optional; list columns also
+                take "a, b" to match rows containing any of the elements.
+        
+        Returns:
+            int: Bitset of the matching rows
+        """
+        bits = self.all
+        # No row can match once the intersection is empty
+        for column, text in filters.items():
+            if column not in self.columns:
+                continue
+            bits &= self.match_column(column, text)
+            if not bits:
+                break
+        return bits
+    
+    def match_column(self, column, text):
+        """Get the rows of which a column matches a filter text, see match"""
+        query = text.strip().lower()
+        if not query:
+            return self.all
+        
+        if column in self.date_columns and RANGE_SEPARATOR in query:
+            date_range = self._parse_range(query)
+            if date_range is not None:
+                return self._match_dates(column, *date_range)
+        
+        if column in self.list_columns and LIST_SEPARATOR in query:
+            elements = [element.strip() for element in query.split(LIST_SEPARATOR)]
+            return self._match_elements(column, [element for element in elements if element])
+        
+        return self._match_substring(column, query)
+    
+    def positions(self, bits):
+        """Get the positions of the rows in a bitset, in order"""
+        if bits == self.all:
+            return list(range(self.size))
+        # bin() lists the bits from the highest; reversed, digit i is row i
+        digits = bin(bits)[:1:-1]
+        return [position for position, digit in enumerate(digits) if digit == "1"]
+    
+    def select(self, positions):
+        """Get the items at these row positions"""
+        items = self.items
+        return [items[position] for position in positions]
+    
+    def _queries(self, filters):
+        """Get the non-empty filters on known columns, lowercased"""
+        queries = {}
+        for column, text in filters.items():
+            query = text.strip().lower()
+            if query and column in self.columns:
+                queries[column] = query
+        return queries
+    
+    def _is_substring_query(self, column, query):
+        """Check whether a lowercased filter is matched as a substring"""
+        if column in self.date_columns and RANGE_SEPARATOR in query and self._parse_range(query):
+            return False
+        return not (column in self.list_columns and LIST_SEPARATOR in query)
+    
+    def _narrow(self, filters, previous_filters, positions):
+        """Filter the rows an earlier filter matched, if the new one narrows it
+        
+        The new filters narrow the earlier ones if each earlier filter is
+        kept, or is a substring filter whose text the new one contains, and
+        each added filter is a substring filter.
+        
+        Returns:
+            list: Positions of the matching rows, or None if the filters
+                do not narrow the earlier ones
+        """
+        queries = self._queries(filters)
+        previous_queries = self._queries(previous_filters)
+        
+        changed = {}
+        for column, query in queries.items():
+            previous = previous_queries.get(column)
+            if query == previous:
+                continue
+            if not self._is_substring_query(column, query):
+                return None
+            if previous is not None and (previous not in query or not self._is_substring_query(column, previous)):
+                return None
+            changed[column] = query
+        if any(column not in queries for column in previous_queries):
+            return None
+        
+        for column, query in changed.items():
+            text = self._column_text(column)
+            positions = [position for position in positions if query in text[position]]
+        return list(positions)
+    
+    def _column_text(self, column):
+        """Get the lowercased cells of a column"""
+        text = self._text.get(column)
+        if text is None:
+            col_idx = self.columns.index(column)
+            text = [str(values[col_idx]).lower() for _, values in self.items]
+            self._text[column] = text
+        return text
+    
+    def _value_index(self, column):
+        """Get the bitsets of the rows per lowercased value of a column
+        
+        Returns:
+            dict: Value -> bitset, or None if the column has too many
+                distinct values to index
+        """
+        if column not in self._values:
+            positions = {}
+            for position, value in enumerate(self._column_text(column)):
+                positions.setdefault(value, []).append(position)
+            self._values[column] = None
+            if len(positions) <= MAX_INDEXED_VALUES:
+                self._values[column] = {
+                    value: to_bitset(rows, self.size) for value, rows in positions.items()
+                }
+        return self._values[column]
+    
+    def _token_index(self, column):
+        """Get the positions of the rows per lowercased element of a list column"""
+        tokens = self._tokens.get(column)
+        if tokens is None:
+            tokens = {}
+            for position, value in enumerate(self._column_text(column)):
+                for token in value.split(LIST_SEPARATOR):
+                    token = token.strip()
+                    if token:
+                        tokens.setdefault(token, []).append(position)
+            self._tokens[column] = tokens
+        return tokens
+    
+    def _date_index(self, column):
+        """Get the parsed dates of a column, sorted, with their row positions
+        
+        Returns:
+            tuple: (list of date ordinals, list of row positions)
+        """
+        dates = self._dates.get(column)
+        if dates is None:
+            col_idx = self.columns.index(column)
+            parsed = {}
+            entries = []
+            for position, (_, values) in enumerate(self.items):
+                # Few distinct dates, so each is parsed once
+                text = values[col_idx]
+                if text not in parsed:
+                    date = parse_date(text) if text else None
+                    parsed[text] = date.toordinal() if date else None
+                if parsed[text] is not None:
+                    entries.append((parsed[text], position))
+            entries.sort()
+            dates = ([ordinal for ordinal, _ in entries], [position for _, position in entries])
+            self._dates[column] = dates
+        return dates
+    
+    def _match_substring(self, column, query):
+        """Get the rows of which a column contains a text"""
+        values = self._value_index(column)
+        if values is not None:
+            bits = 0
+            for value, value_bits in values.items():
+                if query in value:
+                    bits |= value_bits
+            return bits
+        
+        if len(query) >= NGRAM_SIZE:
+            return self._match_ngrams(column, query)
+        
+        return to_bitset(
+            (position for position, value in enumerate(self._column_text(column)) if query in value),
+            self.size
+        )
+    
+    def _match_ngrams(self, column, query):
+        """Get the rows of which a column contains a text, through its trigrams
+        
+        Only rows holding all trigrams of the text can contain it; just
+        these candidates are checked for the whole text. The rows of
+        trigrams not filtered for before are found in one pass over the
+        column and kept, so while typing and deleting most filters need
+        no pass at all.
+        
+        Args:
+            column (str): Column name
+            query (str): Lowercased text, at least NGRAM_SIZE characters
+        """
+        ngrams = self._ngrams.setdefault(column, {})
+        text = self._column_text(column)
+        query_ngrams = {query[i:i + NGRAM_SIZE] for i in range(len(query) - NGRAM_SIZE + 1)}
+        
+        missing = [ngram for ngram in query_ngrams if ngram not in ngrams]
+        if missing:
+            found = {ngram: [] for ngram in missing}
+            for position, value in enumerate(text):
+                for ngram in missing:
+                    if ngram in value:
+                        found[ngram].append(position)
+            for ngram, positions in found.items():
+                ngrams[ngram] = to_bitset(positions, self.size)
+        
+        # Rarest first, so the candidates shrink fastest
+        bits = self.all
+        for ngram in sorted(query_ngrams, key=lambda ngram: ngrams[ngram].bit_count()):
+            bits &= ngrams[ngram]
+            if not bits:
+                return 0
+        
+        if len(query) == NGRAM_SIZE:
+            return bits
+        return to_bitset((position for position in self.positions(bits) if query in text[position]), self.size)
+    
+    def _match_dates(self, column, date_from, date_to):
+        """Get the rows of which a date column lies in a range
+        
+        Args:
+            column (str): Column name
+            date_from (datetime.date): First date, or None for no lower bound
+            date_to (datetime.date): Last date, or None for no upper bound
+        """
+        ordinals, positions = self._date_index(column)
+        start = bisect.bisect_left(ordinals, date_from.toordinal()) if date_from else 0
+        end = bisect.bisect_right(ordinals, date_to.toordinal()) if date_to else len(ordinals)
+        return to_bitset(positions[start:end], self.size)
+    
+    def _match_elements(self, column, elements):
+        """Get the rows of which a list column contains any of the elements"""
+        tokens = self._token_index(column)
+        positions = []
+        for element in elements:
+            positions.extend(tokens.get(element, ()))
+        return to_bitset(positions, self.size)
+    
+    @staticmethod
+    def _parse_range(query):
+        """Parse a date range filter "from..to"
+        
+        Returns:
+            tuple: (date_from, date_to), either None if open, or None if
+                the text is no date range
+        """
+        start, _, end = query.partition(RANGE_SEPARATOR)
+        date_from = parse_date(start) if start.strip() else None
+        date_to = parse_date(end) if end.strip() else None
+        if (start.strip() and date_from is None) or (end.strip() and date_to is None):
+            return None
+        if date_from is None and date_to is None:
+            return None
+        return date_from, date_to
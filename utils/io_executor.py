@@ -0,0 +1,285 @@
+import contextlib
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Number of worker threads running database calls: enough for the six
+# project tables and the shift stream to load at the same time
+DEFAULT_WORKERS = 8
+
+# Milliseconds between checks for finished work on the Tk thread
+POLL_INTERVAL = 30
+
+class TaskCancelled(Exception):
+    """Raised inside a worker when its task was cancelled"""
+
+class IOTask:
+    """Handle of a call running on the I/O executor"""
+    
+    def __init__(self, executor, on_success=None, on_error=None, on_progress=None):
+        """Initialize the task handle
+        
+        Args:
+            executor (IOExecutor): Executor running the task
+            on_success (function, optional): Called with the result
+            on_error (function, optional): Called with the exception
+            on_progress (function, optional): Called with each progress report
+        """
+        self.executor = executor
+        self.on_success = on_success
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.future = None
+        self.done = False
+        self._cancel_event = threading.Event()
+    
+    @property
+    def cancelled(self):
+        """Whether the task was cancelled"""
+        return self._cancel_event.is_set()
+    
+    def cancel(self):
+        """Cancel the task
+        
+        A task that has not started yet is dropped; a running task stops at
+        its next progress report. No callbacks are called after cancelling.
+        """
+        self._cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+    
+    def check_cancelled(self):
+        """Raise TaskCancelled in the worker if the task was cancelled"""
+        if self.cancelled:
+            raise TaskCancelled()
+    
+    def report_progress(self, value):
+        """Pass a progress report from the worker to on_progress on the Tk thread
+        
+        Args:
+            value: Progress value, e.g. a batch of rows
+        
+        Raises:
+            TaskCancelled: If the task was cancelled
+        """
+        self.check_cancelled()
+        if self.on_progress:
+            self.executor.call_in_ui(self._deliver, self.on_progress, value)
+    
+    def _deliver(self, callback, value):
+        """Call a callback on the Tk thread unless the task was cancelled"""
+        if not self.cancelled:
+            callback(value)
+
+class IOTaskGroup:
+    """Handle of several calls started together with IOExecutor.submit_all"""
+    
+    def __init__(self, on_done=None):
+        """Initialize the group handle
+        
+        Args:
+            on_done (function, optional): Called with the results and the
+                exceptions once all calls finished
+        """
+        self.on_done = on_done
+        self.tasks = []
+        self.pending = set()
+        self.results = {}
+        self.errors = {}
+        self.cancelled = False
+    
+    def cancel(self):
+        """Cancel all calls of the group; on_done is not called"""
+        self.cancelled = True
+        for task in self.tasks:
+            task.cancel()
+    
+    def finish(self, key, result=None, error=None):
+        """Record the outcome of one call - called on the Tk thread"""
+        self.pending.discard(key)
+        if error is not None:
+            self.errors[key] = error
+        elif key is not None:
+            self.results[key] = result
+        if not self.pending and not self.cancelled and self.on_done:
+            self.on_done(self.results, self.errors)
+
+class IOExecutor:
+    """Runs database calls on worker threads and hands results back to Tk
+    
+    Tk widgets may only be touched from the thread running the mainloop.
+    Workers therefore never call back directly: callbacks are queued and
+    the queue is drained on the Tk thread with root.after.
+    """
+    
+    def __init__(self, root, max_workers=DEFAULT_WORKERS, poll_interval=POLL_INTERVAL):
+        """Initialize the executor
+        
+        Args:
+            root: Tk root window
+            max_workers (int): Number of worker threads
+            poll_interval (int): Milliseconds between queue checks
+        """
+        self.root = root
+        self.poll_interval = poll_interval
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="io")
+        self.callbacks = queue.Queue()
+        self.is_inline = False
+        self.is_shut_down = False
+        
+        self._poll()
+    
+    def submit(self, func, *args, on_success=None, on_error=None, on_progress=None,
+               pass_task=False, **kwargs):
+        """Run a function on a worker thread
+        
+        Args:
+            func (function): Function to run
+            *args: Positional arguments for func
+            on_success (function, optional): Called on the Tk thread with the result
+            on_error (function, optional): Called on the Tk thread with the exception;
+                without it, errors are printed
+            on_progress (function, optional): Called on the Tk thread with each
+                value passed to task.report_progress
+            pass_task (bool): Pass the IOTask to func as keyword argument "task",
+                so it can report progress and check for cancellation
+            **kwargs: Keyword arguments for func
+        
+        Returns:
+            IOTask: Handle to cancel the task
+        """
+        task = IOTask(self, on_success, on_error, on_progress)
+        if pass_task:
+            kwargs["task"] = task
+        
+        if self.is_inline:
+            # Run on the calling thread, e.g. for reads served from the disk cache
+            self._run(task, func, args, kwargs)
+            self.drain()
+        else:
+            task.future = self.pool.submit(self._run, task, func, args, kwargs)
+        return task
+    
+    def submit_iter(self, func, *args, on_item=None, on_success=None, on_error=None, **kwargs):
+        """Run a generator function on a worker thread, streaming its items
+        
+        Each yielded item is passed to on_item on the Tk thread as it
+        arrives. Cancelling the task stops the generator at the next item.
+        
+        Args:
+            func (function): Generator function to run
+            *args: Positional arguments for func
+            on_item (function, optional): Called on the Tk thread with each item
+            on_success (function, optional): Called on the Tk thread with the
+                number of items once the generator is exhausted
+            on_error (function, optional): Called on the Tk thread with the exception
+            **kwargs: Keyword arguments for func
+        
+        Returns:
+            IOTask: Handle to cancel the task
+        """
+        def consume(task):
+            count = 0
+            for item in func(*args, **kwargs):
+                task.report_progress(item)
+                count += 1
+            return count
+        
+        return self.submit(consume, on_success=on_success, on_error=on_error,
+                           on_progress=on_item, pass_task=True)
+    
+    def submit_all(self, calls, on_done=None):
+        """Run several functions concurrently and collect all their results
+        
+        on_done is called once, on the Tk thread, after every call finished,
+        so the results can be applied to the UI in a single pass.
+        
+        Args:
+            calls (dict): Key -> function without arguments
+            on_done (function, optional): Called with a dict of results and a
+                dict of exceptions, both by key
+            
+        Returns:
+            IOTaskGroup: Handle to cancel all calls
+        """
+        group = IOTaskGroup(on_done)
+        group.pending.update(calls)
+        for key, func in calls.items():
+            group.tasks.append(self.submit(
+                func,
+                on_success=lambda result, key=key: group.finish(key, result=result),
+                on_error=lambda error, key=key: group.finish(key, error=error)
+            ))
+        if not calls:
+            group.finish(None)
+        return group
+    
+    def call_in_ui(self, callback, *args):
+        """Queue a callback to be called on the Tk thread
+        
+        Args:
+            callback (function): Callback to call
+            *args: Arguments for the callback
+        """
+        self.callbacks.put((callback, args))
+    
+    @contextlib.contextmanager
+    def inline(self):
+        """Run submitted tasks on the calling thread within the block
+        
+        Used at startup, when reads are served from the disk cache and must
+        finish before the tabs are shown.
+        """
+        previous = self.is_inline
+        self.is_inline = True
+        try:
+            yield self
+        finally:
+            self.is_inline = previous
+    
+    def drain(self):
+        """Call all queued callbacks"""
+        while True:
+            try:
+                callback, args = self.callbacks.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error in background task callback: {str(e)}")
+    
+    def shutdown(self):
+        """Cancel pending tasks and stop the worker threads"""
+        self.is_shut_down = True
+        self.pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _run(self, task, func, args, kwargs):
+        """Run a task on the worker and queue its outcome"""
+        if task.cancelled:
+            return
+        try:
+            result = func(*args, **kwargs)
+        except TaskCancelled:
+            return
+        except Exception as e:
+            self.call_in_ui(self._finish, task, task.on_error, e)
+        else:
+            self.call_in_ui(self._finish, task, task.on_success, result)
+    
+    def _finish(self, task, callback, value):
+        """Deliver the outcome of a task on the Tk thread"""
+        task.done = True
+        if task.cancelled:
+            return
+        if callback:
+            callback(value)
+        elif isinstance(value, Exception):
+            print(f"Error in background task: {str(value)}")
+    
+    def _poll(self):
+        """Drain the callback queue and schedule the next check"""
+        if self.is_shut_down:
+            return
+        self.drain()
+        self.root.after(self.poll_interval, self._poll)
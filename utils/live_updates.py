@@ -0,0 +1,157 @@
+from connectors.change_feed import SUBSCRIBED
+from connectors.schema import DROPDOWN_TABLES
+
+# Milliseconds to collect change events before applying them, so a burst of
+# changes (e.g. a bulk insert) updates each table once
+DEBOUNCE_INTERVAL = 250
+
+# Milliseconds between delta syncs while the change feed is not subscribed
+POLL_INTERVAL = 30000
+
+class LiveUpdates:
+    """Applies the changes made by others to the tables as they happen
+    
+    Row changes from a change feed (see connectors.change_feed) are
+    collected for DEBOUNCE_INTERVAL, merged into the delta sync model and
+    applied to the affected Treeview rows only. While the feed is not
+    subscribed, or without a feed, the tables are delta synced every
+    POLL_INTERVAL instead.
+    """
+    
+    def __init__(self, app, feed=None, debounce_interval=DEBOUNCE_INTERVAL,
+                 poll_interval=POLL_INTERVAL):
+        """Initialize the live updates
+        
+        Args:
+            app (SchichtplanerApp): The application
+            feed (optional): Change feed, polling only if not given
+            debounce_interval (int): Milliseconds to collect change events
+            poll_interval (int): Milliseconds between delta syncs while
+                the feed is not subscribed
+        """
+        self.app = app
+        self.feed = feed
+        self.debounce_interval = debounce_interval
+        self.poll_interval = poll_interval
+        self.status = None
+        self.pending = {}
+        self.flush_job = None
+        self.poll_job = None
+        self.polling = False
+        self.stopped = False
+    
+    def start(self):
+        """Subscribe to the change feed, polling until it is subscribed"""
+        self.start_polling()
+        if self.feed is not None:
+            # Feeds call back on their own thread
+            self.feed.start(
+                on_change=lambda event: self.app.io.call_in_ui(self.queue_change, event),
+                on_status=lambda status, error: self.app.io.call_in_ui(self.on_status, status, error)
+            )
+    
+    def stop(self):
+        """Unsubscribe and stop polling"""
+        self.stopped = True
+        if self.feed is not None:
+            self.feed.stop()
+        for job in (self.flush_job, self.poll_job):
+            if job is not None:
+                self.app.root.after_cancel(job)
+        self.flush_job = None
+        self.poll_job = None
+        self.polling = False
+    
+    def queue_change(self, event):
+        """Collect a change event until the next flush
+        
+        Only the last event per row is kept.
+        
+        Args:
+            event (dict): Change event, see connectors.change_feed.change_event
+        """
+        if self.stopped:
+            return
+        row_id = (event["record"] or event["old_record"]).get("id")
+        if row_id is None:
+            return
+        self.pending.setdefault(event["table"], {})[row_id] = event
+        if self.flush_job is None:
+            self.flush_job = self.app.root.after(self.debounce_interval, self.flush)
+    
+    def flush(self):
+        """Apply the collected change events to the model and the Treeviews"""
+        self.flush_job = None
+        pending, self.pending = self.pending, {}
+        
+        changed_tables = set()
+        for view in self.app.table_views():
+            events = pending.get(view.TABLE)
+            # Tables never fully loaded get all their rows on the next load
+            if not events or not self.app.delta_sync.is_tracked(view.TABLE):
+                continue
+            rows = [event["record"] for event in events.values() if event["type"] != "DELETE"]
+            deleted_ids = [row_id for row_id, event in events.items() if event["type"] == "DELETE"]
+            changes = self.app.delta_sync.apply_changes(view.TABLE, rows, deleted_ids)
+            if changes["upserted"] or changes["deleted"]:
+                view.apply_row_changes(changes["upserted"], changes["deleted"])
+                changed_tables.add(view.TABLE)
+        
+        # Dropdowns are derived from the master data tables
+        if changed_tables & set(DROPDOWN_TABLES):
+            self.app.load_dropdown_data(on_loaded=self.app.update_dropdown_values)
+    
+    def on_status(self, status, error=None):
+        """Switch between the change feed and polling
+        
+        Args:
+            status (str): Subscription status reported by the feed
+            error (Exception, optional): Error reported with the status
+        """
+        if self.stopped or status == self.status:
+            return
+        self.status = status
+        
+        if status == SUBSCRIBED:
+            self.stop_polling()
+            # Catch up on the changes made while not subscribed
+            self.app.sync_changes(on_error=self.report_error)
+        else:
+            print(f"Change feed {status}, polling for changes: {error}")
+            self.start_polling()
+    
+    def start_polling(self):
+        """Delta sync the tables every poll_interval"""
+        if self.polling or self.stopped:
+            return
+        self.polling = True
+        self.schedule_poll()
+    
+    def stop_polling(self):
+        """Stop the periodic delta syncs"""
+        self.polling = False
+        if self.poll_job is not None:
+            self.app.root.after_cancel(self.poll_job)
+            self.poll_job = None
+    
+    def schedule_poll(self):
+        """Run the next delta sync after poll_interval"""
+        if self.polling and self.poll_job is None:
+            self.poll_job = self.app.root.after(self.poll_interval, self.poll)
+    
+    def poll(self):
+        """Delta sync the tables, then schedule the next sync once it is done"""
+        self.poll_job = None
+        if not self.polling:
+            return
+        
+        def failed(error):
+            self.report_error(error)
+            self.schedule_poll()
+        
+        self.app.sync_changes(on_done=lambda changed: self.schedule_poll(), on_error=failed)
+    
+    @staticmethod
+    def report_error(error):
+        """Log a failed background sync; the next one will try again"""
+        print(f"Error syncing changes: {str(error)}")
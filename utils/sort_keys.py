@@ -0,0 +1,99 @@
+import datetime
+import locale
+import math
+
+from utils.filter_index import parse_date
+
+TIME_FORMATS = ("%H:%M:%S", "%H:%M")
+
+def value_key(value):
+    """Sort key for a cell: numbers by value, text by locale collation
+    
+    Text is collated with the LC_COLLATE locale, so umlauts sort with
+    their base letters once the application set the user's locale (see
+    main.py). Only finite numbers count as numbers; "nan" or "inf" are
+    text. Empty cells sort last.
+    
+    Args:
+        value: Cell value as shown in the table
+    
+    Returns:
+        tuple: The key
+    """
+    text = str(value).strip()
+    if not text:
+        return (2, 0, "")
+    try:
+        number = float(text.replace(",", "."))
+    except ValueError:
+        number = None
+    if number is not None and math.isfinite(number):
+        return (0, number, "")
+    return (1, 0, locale.strxfrm(text.casefold()))
+
+def date_key(value):
+    """Sort key for a date cell (DD.MM.YYYY or ISO), other text after dates"""
+    date = parse_date(value) if str(value).strip() else None
+    if date is None:
+        return (1,) + value_key(value)
+    return (0, date.toordinal())
+
+def time_key(value):
+    """Sort key for a time cell (HH:MM or HH:MM:SS), other text after times"""
+    text = str(value).strip()
+    for time_format in TIME_FORMATS:
+        try:
+            time = datetime.datetime.strptime(text, time_format).time()
+        except ValueError:
+            continue
+        return (0, time.hour * 3600 + time.minute * 60 + time.second)
+    return (1,) + value_key(value)
+
+def sort_items(items, sort_columns, key_functions, key_caches):
+    """Sort items by several columns, keeping the order of equal rows
+    
+    The distinct cells of each sort column are ranked by their keys, so
+    the rows are sorted on one integer each; tables repeat most cells.
+    
+    Args:
+        items (list): (item_id, values) tuples
+        sort_columns (list): (column index, descending) tuples, the
+            primary sort column first
+        key_functions (dict): Column index -> key function
+        key_caches (dict): Column index -> {cell value: key}, filled with
+            the keys computed, so each distinct cell is converted once
+    
+    Returns:
+        list: The sorted items
+    """
+    if not sort_columns:
+        return list(items)
+    
+    # One integer per row: the ranks of its cells, primary column first
+    keys = [0] * len(items)
+    for col_idx, descending in sort_columns:
+        key_function = key_functions.get(col_idx, value_key)
+        cache = key_caches.setdefault(col_idx, {})
+        cells = [values[col_idx] if col_idx < len(values) else "" for _, values in items]
+        
+        distinct = set(cells)
+        for value in distinct:
+            if value not in cache:
+                cache[value] = key_function(value)
+        
+        # Cells with equal keys share a rank, so their rows keep their order
+        ranks = {}
+        rank = -1
+        previous = None
+        for value in sorted(distinct, key=cache.__getitem__):
+            if rank < 0 or cache[value] != previous:
+                rank += 1
+                previous = cache[value]
+            ranks[value] = rank
+        count = rank + 1
+        if descending:
+            ranks = {value: count - 1 - value_rank for value, value_rank in ranks.items()}
+        keys = [key * count + ranks[value] for key, value in zip(keys, cells)]
+    
+    order = sorted(range(len(items)), key=keys.__getitem__)
+    return [items[position] for position in order]
@@ -0,0 +1,107 @@
+import bisect
+
+def unmoved_items(current, wanted):
+    """Get the largest set of rows that are already in the wanted order
+    
+    Only the other rows have to be moved; this is the longest increasing
+    subsequence of the current positions, taken in the wanted order.
+    
+    Args:
+        current (list): Row IDs in their current order
+        wanted (list): The same row IDs in the wanted order
+    
+    Returns:
+        set: IDs of the rows that can stay where they are
+    """
+    position = {item_id: index for index, item_id in enumerate(current)}
+    sequence = [position[item_id] for item_id in wanted]
+    
+    # tail_values[k] is the smallest last position of an increasing run of
+    # length k + 1, ending at sequence index tail_indexes[k]
+    tail_values = []
+    tail_indexes = []
+    previous = [-1] * len(sequence)
+    for index, value in enumerate(sequence):
+        length = bisect.bisect_left(tail_values, value)
+        previous[index] = tail_indexes[length - 1] if length else -1
+        if length == len(tail_values):
+            tail_values.append(value)
+            tail_indexes.append(index)
+        else:
+            tail_values[length] = value
+            tail_indexes[length] = index
+    
+    unmoved = set()
+    index = tail_indexes[-1] if tail_indexes else -1
+    while index >= 0:
+        unmoved.add(wanted[index])
+        index = previous[index]
+    return unmoved
+
+def same_values(shown, values):
+    """Check whether a row shows these values
+    
+    Tk returns numbers in cell values as int, so values are compared as
+    text like the Treeview displays them.
+    """
+    return len(shown) == len(values) and all(str(a) == str(b) for a, b in zip(shown, values))
+
+def reconcile_items(tree, items):
+    """Make a Treeview show exactly these rows, touching only the differences
+    
+    Rows are matched by ID: rows no longer wanted are deleted, changed rows
+    get their new values, new rows are inserted and rows out of order are
+    moved, as few as possible. Rows that stay keep their selection, and the
+    scroll position is kept. Trees with a reconcile method of their own
+    (VirtualTreeview) do this on their model.
+    
+    Args:
+        tree (ttk.Treeview): Flat tree whose item IDs are the row IDs
+        items (list): (item_id, values) tuples in display order
+    
+    Returns:
+        dict: Number of rows "inserted", "updated", "deleted" and "moved"
+    """
+    reconcile = getattr(tree, "reconcile", None)
+    if reconcile is not None:
+        return reconcile(items)
+    
+    wanted = {item_id for item_id, _ in items}
+    current = tree.get_children()
+    stale = [item_id for item_id in current if item_id not in wanted]
+    if stale:
+        tree.delete(*stale)
+    current = [item_id for item_id in current if item_id in wanted]
+    kept = set(current)
+    unmoved = unmoved_items(current, [item_id for item_id, _ in items if item_id in kept])
+    
+    # Unlink the rows to move, so the children left are the unmoved rows in
+    # the wanted order; the index of each insert and move is then the
+    # number of rows placed so far, without asking Tk for positions
+    moved = [item_id for item_id in current if item_id not in unmoved]
+    moving = set(moved)
+    selected = []
+    focus = None
+    if moved:
+        selected = [item_id for item_id in tree.selection() if item_id in moving]
+        focus = tree.focus()
+        tree.detach(*moved)
+    
+    counts = {"inserted": 0, "updated": 0, "deleted": len(stale), "moved": len(moved)}
+    for index, (item_id, values) in enumerate(items):
+        if item_id not in kept:
+            tree.insert("", index, iid=item_id, values=values)
+            counts["inserted"] += 1
+            continue
+        if not same_values(tree.item(item_id, "values"), values):
+            tree.item(item_id, values=values)
+            counts["updated"] += 1
+        if item_id not in unmoved:
+            tree.move(item_id, "", index)
+    
+    # Moved rows stay selected and focused
+    if selected:
+        tree.selection_add(*selected)
+    if focus in moving:
+        tree.focus(focus)
+    return counts
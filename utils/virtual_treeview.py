@@ -0,0 +1,461 @@
+import itertools
+import tkinter as tk
+from tkinter import ttk
+
+from utils.treeview_diff import unmoved_items
+
+# Rows materialized below the visible ones, so small resizes and the partly
+# visible last row need no new Tk items
+BUFFER_ROWS = 5
+
+# Rows scrolled per mouse wheel step
+WHEEL_ROWS = 3
+
+# Modifier bits of event.state that extend the selection on click
+SHIFT_MASK = 0x0001
+CONTROL_MASK = 0x0004
+
+class VirtualTreeview(ttk.Treeview):
+    """Treeview keeping all rows in a Python model and showing only a window
+    
+    Tk slows down to a crawl with many thousand items, so only the rows in
+    the viewport plus BUFFER_ROWS exist as Tk items. These items are
+    recycled on scroll: they get the values of the rows scrolled into view,
+    and the scrollbar is driven from the model.
+    
+    The item methods (insert, item, delete, exists, get_children, index,
+    move, selection, focus, see, bbox, identify_row) take and return row
+    IDs like those of a plain Treeview, so code written for one works with
+    both. Only flat tables (parent "") are supported.
+    """
+    
+    def __init__(self, master=None, **kw):
+        """Initialize the treeview
+        
+        Args:
+            master: Parent widget
+            **kw: Options of ttk.Treeview
+        """
+        self._yscrollcommand = kw.pop("yscrollcommand", None)
+        super().__init__(master, **kw)
+        
+        self._order = []  # Row IDs in display order
+        self._rows = {}  # Row ID -> {"values": tuple, "tags": tuple}
+        self._stale = False  # _order still holds deleted row IDs
+        self._selected = set()
+        self._focus = ""
+        self._ids = itertools.count(1)
+        
+        self._first = 0  # Index of the first shown row
+        self._slots = []  # Tk items showing rows
+        self._shown = []  # Row ID shown in each slot
+        self._rendered = []  # (row ID, values, tags) last written to each slot
+        self._rendered_selection = ()
+        self._render_job = None
+        self._extend_selection = False
+        
+        self.bind("<Configure>", lambda event: self._schedule_render(), add="+")
+        self.bind("<ButtonPress-1>", self._on_click, add="+")
+        self.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.bind(sequence, self._on_wheel)
+        for sequence, step in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "-page"), ("<Next>", "page"),
+                               ("<Home>", "home"), ("<End>", "end")):
+            self.bind(sequence, lambda event, step=step: self._on_key(step))
+    
+    # --- TREEVIEW API ON ROW IDS ---
+    
+    def insert(self, parent, index, iid=None, **kw):
+        """Add a row to the model, see ttk.Treeview.insert
+        
+        Returns:
+            str: The row ID
+        """
+        if iid is None:
+            iid = f"I{next(self._ids):05d}"
+            while iid in self._rows:
+                iid = f"I{next(self._ids):05d}"
+        elif iid in self._rows:
+            raise tk.TclError(f"Item {iid} already exists")
+        
+        # A deleted row with the same ID may still be in the order
+        if self._stale:
+            self._compact()
+        
+        self._rows[iid] = {"values": tuple(kw.get("values", ())), "tags": tuple(kw.get("tags", ()))}
+        if index in (tk.END, "end") or int(index) >= len(self._order):
+            self._order.append(iid)
+        else:
+            self._order.insert(int(index), iid)
+        self._schedule_render()
+        return iid
+    
+    def item(self, item, option=None, **kw):
+        """Query or change the values or tags of a row, see ttk.Treeview.item"""
+        row = self._row(item)
+        if kw:
+            if "values" in kw:
+                row["values"] = tuple(kw["values"])
+            if "tags" in kw:
+                row["tags"] = tuple(kw["tags"]) if isinstance(kw["tags"], (list, tuple)) else (kw["tags"],)
+            self._schedule_render()
+            return None
+        if option == "values":
+            return row["values"]
+        if option == "tags":
+            return row["tags"]
+        if option is not None:
+            return ""
+        return {"text": "", "image": "", "values": list(row["values"]), "open": 0, "tags": list(row["tags"])}
+    
+    def set(self, item, column=None, value=None):
+        """Query or change one cell of a row, see ttk.Treeview.set"""
+        row = self._row(item)
+        columns = list(self["columns"])
+        if column is None:
+            return dict(zip(columns, row["values"]))
+        index = columns.index(column)
+        if value is None:
+            return row["values"][index] if index < len(row["values"]) else ""
+        values = list(row["values"]) + [""] * (len(columns) - len(row["values"]))
+        values[index] = value
+        row["values"] = tuple(values)
+        self._schedule_render()
+        return None
+    
+    def delete(self, *items):
+        """Remove rows from the model, see ttk.Treeview.delete"""
+        items = set(items)
+        for item in items:
+            self._row(item)
+        if len(items) >= len(self._rows):
+            # Clearing the table needs no compaction
+            self._order = []
+            self._rows = {}
+            self._stale = False
+        else:
+            for item in items:
+                del self._rows[item]
+            self._stale = True
+        self._selected.difference_update(items)
+        if self._focus in items:
+            self._focus = ""
+        self._schedule_render()
+    
+    def exists(self, item):
+        """Check whether a row is in the model"""
+        return item in self._rows
+    
+    def get_children(self, item=None):
+        """Get the IDs of all rows in display order"""
+        self._compact()
+        return tuple(self._order) if not item else ()
+    
+    def index(self, item):
+        """Get the position of a row in the display order"""
+        self._row(item)
+        self._compact()
+        return self._order.index(item)
+    
+    def move(self, item, parent, index):
+        """Move a row to another position, see ttk.Treeview.move"""
+        self._row(item)
+        self._compact()
+        self._order.remove(item)
+        if index in (tk.END, "end"):
+            self._order.append(item)
+        else:
+            self._order.insert(int(index), item)
+        self._schedule_render()
+    
+    def reconcile(self, items):
+        """Show exactly these rows, see utils.treeview_diff.reconcile_items
+        
+        The model is replaced in one pass; rows that stay keep their
+        selection, and only recycled items showing changed rows are updated.
+        
+        Args:
+            items (list): (item_id, values) tuples in display order
+            
+        Returns:
+            dict: Number of rows "inserted", "updated", "deleted" and "moved"
+        """
+        self._compact()
+        previous = self._rows
+        rows = {}
+        counts = {"inserted": 0, "updated": 0, "deleted": 0, "moved": 0}
+        for item_id, values in items:
+            row = previous.get(item_id)
+            values = tuple(values)
+            if row is None:
+                row = {"values": values, "tags": ()}
+                counts["inserted"] += 1
+            elif row["values"] != values:
+                row["values"] = values
+                counts["updated"] += 1
+            rows[item_id] = row
+        
+        order = list(rows)
+        kept = [item_id for item_id in order if item_id in previous]
+        counts["deleted"] = len(previous) - len(kept)
+        counts["moved"] = len(kept) - len(unmoved_items(
+            [item_id for item_id in self._order if item_id in rows], kept))
+        
+        self._rows = rows
+        self._order = order
+        self._selected &= rows.keys()
+        if self._focus not in rows:
+            self._focus = ""
+        self._schedule_render()
+        return counts
+    
+    def selection(self):
+        """Get the IDs of the selected rows in display order"""
+        if not self._selected:
+            return ()
+        self._compact()
+        return tuple(item for item in self._order if item in self._selected)
+    
+    def selection_set(self, *items):
+        """Select exactly these rows"""
+        self._selected = set(self._flatten(items)) & self._rows.keys()
+        self._render_selection()
+    
+    def selection_add(self, *items):
+        """Add rows to the selection"""
+        self._selected |= set(self._flatten(items)) & self._rows.keys()
+        self._render_selection()
+    
+    def selection_remove(self, *items):
+        """Remove rows from the selection"""
+        self._selected -= set(self._flatten(items))
+        self._render_selection()
+    
+    def selection_toggle(self, *items):
+        """Toggle the selection of rows"""
+        self._selected ^= set(self._flatten(items)) & self._rows.keys()
+        self._render_selection()
+    
+    def focus(self, item=None):
+        """Query or set the focused row, see ttk.Treeview.focus"""
+        if item is None:
+            slot = super().focus()
+            if slot in self._slots:
+                self._focus = self._shown[self._slots.index(slot)]
+            return self._focus
+        self._row(item)
+        self._focus = item
+        self._render_focus()
+        return None
+    
+    def see(self, item):
+        """Scroll a row into view"""
+        index = self.index(item)
+        visible = self._visible_rows()
+        if index < self._first:
+            self._first = index
+        elif index >= self._first + visible:
+            self._first = index - visible + 1
+        self._render()
+    
+    def bbox(self, item, column=None):
+        """Get the bounding box of a shown row or cell, "" if not shown"""
+        self._flush_render()
+        if item not in self._shown:
+            return ""
+        return super().bbox(self._slots[self._shown.index(item)], column)
+    
+    def identify_row(self, y):
+        """Get the ID of the row at a y coordinate, "" if none"""
+        slot = super().identify_row(y)
+        return self._shown[self._slots.index(slot)] if slot in self._slots else ""
+    
+    def yview(self, *args):
+        """Query or change the vertical position, driven by the model
+        
+        Called by the scrollbar with ("moveto", fraction) or
+        ("scroll", number, "units"|"pages").
+        """
+        total = len(self._rows)
+        visible = self._visible_rows()
+        if not args:
+            if not total:
+                return (0.0, 1.0)
+            return (self._first / total, min(1.0, (self._first + visible) / total))
+        
+        if args[0] == "moveto":
+            self._first = round(float(args[1]) * total)
+        elif args[0] == "scroll":
+            number = int(args[1])
+            self._first += number * visible if args[2] == "pages" else number
+        self._render()
+        return None
+    
+    def yview_moveto(self, fraction):
+        """Scroll to a fraction of the rows"""
+        self.yview("moveto", fraction)
+    
+    def yview_scroll(self, number, what):
+        """Scroll by units (rows) or pages"""
+        self.yview("scroll", number, what)
+    
+    def configure(self, cnf=None, **kw):
+        """Configure the treeview; the vertical scrollbar is driven by the model"""
+        if cnf and "yscrollcommand" in cnf:
+            cnf = dict(cnf)
+            kw["yscrollcommand"] = cnf.pop("yscrollcommand")
+        if "yscrollcommand" in kw:
+            self._yscrollcommand = kw.pop("yscrollcommand")
+            self._update_scrollbar()
+            if not cnf and not kw:
+                return None
+        return super().configure(cnf, **kw)
+    
+    config = configure
+    
+    # --- RENDERING ---
+    
+    def _row(self, item):
+        """Get the model entry of a row, raising TclError like Tk if missing"""
+        try:
+            return self._rows[item]
+        except KeyError:
+            raise tk.TclError(f"Item {item} not found") from None
+    
+    @staticmethod
+    def _flatten(items):
+        """Accept items as separate arguments or as one list, like Tk"""
+        if len(items) == 1 and isinstance(items[0], (list, tuple)):
+            return items[0]
+        return items
+    
+    def _compact(self):
+        """Drop deleted rows from the display order"""
+        if self._stale:
+            self._order = [item for item in self._order if item in self._rows]
+            self._stale = False
+    
+    def _visible_rows(self):
+        """Get the number of rows fitting in the viewport"""
+        height = self.winfo_height()
+        if height <= 1:
+            # Not mapped yet: use the requested height in rows
+            return int(self.cget("height") or 10)
+        style = ttk.Style(self)
+        rowheight = int(style.lookup(self.cget("style") or "Treeview", "rowheight") or 20)
+        # The headings take about one row
+        return max(1, height // rowheight - 1)
+    
+    def _schedule_render(self):
+        """Render once the pending model changes are done"""
+        if self._render_job is None:
+            self._render_job = self.after_idle(self._render)
+    
+    def _flush_render(self):
+        """Render now if model changes are pending, e.g. before reading geometry"""
+        if self._render_job is not None:
+            self.after_cancel(self._render_job)
+            self._render()
+    
+    def _render(self):
+        """Show the rows of the current window in the recycled Tk items"""
+        self._render_job = None
+        self._compact()
+        
+        total = len(self._order)
+        visible = self._visible_rows()
+        self._first = max(0, min(self._first, total - visible))
+        shown = self._order[self._first:self._first + visible + BUFFER_ROWS]
+        
+        # Create or drop Tk items so there is one per shown row
+        while len(self._slots) < len(shown):
+            self._slots.append(super().insert("", tk.END))
+            self._rendered.append(None)
+        while len(self._slots) > len(shown):
+            super().delete(self._slots.pop())
+            self._rendered.pop()
+        
+        # Only items showing another row or changed values are updated
+        for position, (slot, item) in enumerate(zip(self._slots, shown)):
+            row = self._rows[item]
+            rendered = (item, row["values"], row["tags"])
+            if self._rendered[position] != rendered:
+                super().item(slot, values=row["values"], tags=row["tags"])
+                self._rendered[position] = rendered
+        self._shown = shown
+        
+        # The recycled items never scroll themselves
+        super().yview_moveto(0)
+        self._render_selection()
+        self._render_focus()
+        self._update_scrollbar()
+    
+    def _render_selection(self):
+        """Select the recycled items showing selected rows"""
+        slots = [slot for slot, item in zip(self._slots, self._shown) if item in self._selected]
+        if tuple(slots) != tuple(super().selection()):
+            super().selection_set(slots)
+        self._rendered_selection = tuple(super().selection())
+    
+    def _render_focus(self):
+        """Focus the recycled item showing the focused row"""
+        if self._focus in self._shown:
+            super().focus(self._slots[self._shown.index(self._focus)])
+    
+    def _update_scrollbar(self):
+        """Tell the scrollbar which part of the rows is shown"""
+        if self._yscrollcommand:
+            first, last = self.yview()
+            self._yscrollcommand(first, last)
+    
+    # --- EVENTS ---
+    
+    def _on_click(self, event):
+        """Remember whether the click extends the selection"""
+        self._extend_selection = bool(event.state & (SHIFT_MASK | CONTROL_MASK))
+    
+    def _on_select(self, event=None):
+        """Take over selection changes made by clicking the recycled items"""
+        current = tuple(super().selection())
+        if current == self._rendered_selection:
+            return
+        self._rendered_selection = current
+        selected = {self._shown[self._slots.index(slot)] for slot in current if slot in self._slots}
+        if self._extend_selection:
+            # Selected rows scrolled out of view stay selected
+            self._selected = (self._selected - set(self._shown)) | selected
+        else:
+            self._selected = selected
+        self._extend_selection = False
+    
+    def _on_wheel(self, event):
+        """Scroll the model by WHEEL_ROWS per wheel step"""
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.yview("scroll", -WHEEL_ROWS, "units")
+        else:
+            self.yview("scroll", WHEEL_ROWS, "units")
+        return "break"
+    
+    def _on_key(self, step):
+        """Move the focus and selection with the cursor keys across the whole model"""
+        if not self._rows:
+            return "break"
+        self._compact()
+        
+        focus = self.focus()
+        index = self._order.index(focus) if focus in self._rows else -1
+        if step == "home":
+            index = 0
+        elif step == "end":
+            index = len(self._order) - 1
+        elif step in ("page", "-page"):
+            index += self._visible_rows() * (1 if step == "page" else -1)
+        else:
+            index += step
+        item = self._order[max(0, min(index, len(self._order) - 1))]
+        
+        self._focus = item
+        self._selected = {item}
+        self.see(item)
+        self.event_generate("<<TreeviewSelect>>")
+        return "break"